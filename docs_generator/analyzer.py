@@ -9,7 +9,11 @@ import fnmatch
 import hashlib
 import json
 import logging
+import mmap
+import os
 import time
+from collections.abc import Iterator
+from contextlib import contextmanager
 from dataclasses import asdict, dataclass, field
 from pathlib import Path
 
@@ -82,6 +86,15 @@ class ProjectStructure:
     dependency_graph: dict[str, list[str]] = field(default_factory=dict)
 
 
+@dataclass(frozen=True, slots=True)
+class FileEntry:
+    """A discovered source file with its path string and stat result."""
+
+    path: Path
+    path_str: str
+    stat: os.stat_result
+
+
 @dataclass
 class CacheEntry:
     """Cache entry for parsed AST data."""
@@ -257,6 +270,28 @@ class PythonProjectAnalyzer:
         except Exception:
             return ""
 
+    @staticmethod
+    @contextmanager
+    def _open_source(file_path: Path) -> Iterator[bytes | mmap.mmap]:
+        """Open a source file as a read-only buffer.
+
+        Files of at least one page are memory-mapped so parsing and hashing read
+        straight from the page cache; smaller (including empty) files are read
+        into bytes.
+
+        Args:
+            file_path: Path to the source file
+
+        Yields:
+            Buffer with the raw file contents
+        """
+        with open(file_path, "rb") as f:
+            if os.fstat(f.fileno()).st_size < mmap.PAGESIZE:
+                yield f.read()
+                return
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                yield mapped
+
     def _is_cache_valid(self, file_path: Path, cache_entry: CacheEntry) -> bool:
         """Check if cache entry is still valid for the given file."""
         if not file_path.exists():
@@ -343,39 +378,69 @@ class PythonProjectAnalyzer:
         Returns:
             List of Python file paths
         """
+        return [entry.path for entry in self._scan_python_files(exclude_patterns)]
+
+    def _scan_python_files(self, exclude_patterns: list[str]) -> list[FileEntry]:
+        """Discover Python files together with their stat results in a single walk.
+
+        Uses ``os.scandir`` so each file's stat result comes from the directory
+        entry, letting callers detect changes without stat-ing files again.
+
+        Args:
+            exclude_patterns: Patterns to exclude
+
+        Returns:
+            List of FileEntry objects sorted by path
+        """
         python_files = []
+        pending_dirs = [self.project_path]
+
+        while pending_dirs:
+            current_dir = pending_dirs.pop()
+            try:
+                with os.scandir(current_dir) as entries:
+                    for entry in entries:
+                        if entry.is_dir(follow_symlinks=False):
+                            pending_dirs.append(Path(entry.path))
+                        elif entry.name.endswith(".py") and entry.is_file():
+                            file_path = Path(entry.path)
+                            if not self._is_excluded(file_path, exclude_patterns):
+                                python_files.append(FileEntry(file_path, entry.path, entry.stat()))
+            except OSError as e:
+                logger.warning(f"Failed to scan directory {current_dir}: {e}")
+
+        python_files.sort(key=lambda file_entry: file_entry.path)
+        return python_files
+
+    def _is_excluded(self, file_path: Path, exclude_patterns: list[str]) -> bool:
+        """Check if a file matches any of the exclusion patterns.
+
+        Args:
+            file_path: Absolute path of the file inside the project
+            exclude_patterns: Patterns to exclude
+
+        Returns:
+            True if the file should be excluded
+        """
+        # Convert to relative path for pattern matching
+        relative_path = file_path.relative_to(self.project_path)
 
-        for file_path in self.project_path.rglob("*.py"):
-            # Convert to relative path for pattern matching
-            relative_path = file_path.relative_to(self.project_path)
-
-            # Check if file should be excluded using glob patterns
-            should_exclude = False
-            for pattern in exclude_patterns:
-                # Check exact file name match
-                if file_path.name == pattern:
-                    should_exclude = True
-                    break
-                # Check glob pattern match on relative path
-                if fnmatch.fnmatch(str(relative_path), pattern):
-                    should_exclude = True
-                    break
-                # Check parent directory matches
-                if fnmatch.fnmatch(str(relative_path.parent), pattern):
-                    should_exclude = True
-                    break
-                # Also check if any parent directory matches pattern
-                for parent in relative_path.parents:
-                    if fnmatch.fnmatch(str(parent), pattern):
-                        should_exclude = True
-                        break
-
-            if should_exclude:
-                continue
-
-            python_files.append(file_path)
-
-        return sorted(python_files)
+        for pattern in exclude_patterns:
+            # Check exact file name match
+            if file_path.name == pattern:
+                return True
+            # Check glob pattern match on relative path
+            if fnmatch.fnmatch(str(relative_path), pattern):
+                return True
+            # Check parent directory matches
+            if fnmatch.fnmatch(str(relative_path.parent), pattern):
+                return True
+            # Also check if any parent directory matches pattern
+            for parent in relative_path.parents:
+                if fnmatch.fnmatch(str(parent), pattern):
+                    return True
+
+        return False
 
     def _analyze_file(self, file_path: Path) -> ModuleInfo:
         """Analyze a single Python file.
@@ -402,17 +467,18 @@ class PythonProjectAnalyzer:
                 logger.debug(f"Cache entry expired for: {file_path}")
                 del self._cache[file_path_str]
 
+        # Parse the raw bytes so ast handles the encoding declaration, and hash the
+        # same buffer for the cache instead of reading the file a second time
         try:
-            with open(file_path, encoding="utf-8") as f:
-                source_code = f.read()
-        except Exception as e:
+            with self._open_source(file_path) as source:
+                try:
+                    tree = ast.parse(source, filename=str(file_path))
+                except SyntaxError as e:
+                    raise ProjectAnalysisError(f"Syntax error in {file_path}: {e}") from e
+                file_hash = hashlib.sha256(source).hexdigest() if self.enable_cache else ""
+        except OSError as e:
             raise ProjectAnalysisError(f"Could not read {file_path}: {e}") from e
 
-        try:
-            tree = ast.parse(source_code, filename=str(file_path))
-        except SyntaxError as e:
-            raise ProjectAnalysisError(f"Syntax error in {file_path}: {e}") from e
-
         # Extract module name and package information
         relative_path = file_path.relative_to(self.project_path)
         is_package = file_path.name == "__init__.py"
@@ -452,7 +518,7 @@ class PythonProjectAnalyzer:
             file_stat = file_path.stat()
             cache_entry = CacheEntry(
                 module_info=module_info,
-                file_hash=self._get_file_hash(file_path),
+                file_hash=file_hash,
                 timestamp=time.time(),
                 file_size=file_stat.st_size,
             )
@@ -52,6 +52,19 @@ class TestPythonProjectAnalyzer:
         assert "main.py" not in file_names
         assert "__init__.py" in file_names
 
+    def test_scan_python_files_returns_stats(
+        self, analyzer_for_project: PythonProjectAnalyzer
+    ) -> None:
+        """Test that the scan walk returns stat results matching the discovered files."""
+        scanned = analyzer_for_project._scan_python_files(["main.py"])
+
+        assert [entry.path for entry in scanned] == analyzer_for_project._discover_python_files(
+            ["main.py"]
+        )
+        for entry in scanned:
+            assert entry.path_str == str(entry.path)
+            assert entry.stat.st_size == entry.path.stat().st_size
+
     def test_analyze_file_valid(self, sample_python_file: Path) -> None:
         """Test analyzing a valid Python file."""
         analyzer = PythonProjectAnalyzer(sample_python_file.parent)
@@ -83,6 +96,20 @@ class TestPythonProjectAnalyzer:
         with pytest.raises(ProjectAnalysisError, match="Syntax error"):
             analyzer._analyze_file(bad_file)
 
+    def test_analyze_file_large_and_encoded(self, temp_dir: Path) -> None:
+        """Test analyzing memory-mapped and non-UTF-8 source files."""
+        large_file = temp_dir / "large.py"
+        large_file.write_text('"""Large module."""\n' + "value = 1\n" * 2000)
+        latin_file = temp_dir / "latin.py"
+        latin_file.write_bytes('# -*- coding: latin-1 -*-\n"""Café."""\n'.encode("latin-1"))
+
+        analyzer = PythonProjectAnalyzer(temp_dir)
+
+        assert analyzer._analyze_file(large_file).docstring == "Large module."
+        assert analyzer._analyze_file(latin_file).docstring == "Café."
+        cache_entry = analyzer._cache[str(large_file)]
+        assert cache_entry.file_hash == analyzer._get_file_hash(large_file)
+
     def test_analyze_project_success(self, analyzer_for_project: PythonProjectAnalyzer) -> None:
         """Test successful project analysis."""
         structure = analyzer_for_project.analyze_project()
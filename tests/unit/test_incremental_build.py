@@ -1,5 +1,6 @@
 """Tests for incremental build functionality."""
 
+import json
 import tempfile
 import time
 from pathlib import Path
@@ -95,6 +96,19 @@ def helper():
         assert len(manager2.build_state.files) == 1
         assert str(python_file) in manager2.build_state.files
 
+    def test_cache_loads_indented_json(self, temp_project):
+        """Test that build caches written as indented JSON still load."""
+        python_file = temp_project / "main.py"
+        IncrementalBuildManager(temp_project).mark_files_built([python_file])
+
+        cache_file = temp_project / ".mcp-docs-build.json"
+        data = json.loads(cache_file.read_bytes())
+        cache_file.write_text(json.dumps(data, indent=2), encoding="utf-8")
+
+        manager = IncrementalBuildManager(temp_project)
+        assert str(python_file) in manager.build_state.files
+        assert manager.is_file_changed(python_file) is False
+
     def test_file_change_detection_new_file(self, temp_project):
         """Test detection of new files."""
         manager = IncrementalBuildManager(temp_project)
@@ -165,6 +179,39 @@ def main():
         assert utils_py in changed
         assert main_py not in changed
 
+    def test_get_changed_files_with_stat_map(self, temp_project):
+        """Test change detection using stat results collected by a directory walk."""
+        manager = IncrementalBuildManager(temp_project)
+
+        main_file = temp_project / "main.py"
+        utils_file = temp_project / "utils.py"
+        manager.mark_files_built([main_file, utils_file])
+
+        stat_map = {main_file: main_file.stat(), utils_file: utils_file.stat()}
+        assert manager.get_changed_files([main_file, utils_file], stat_map) == set()
+
+        # A file missing from the walk is reported as deleted
+        utils_file.unlink()
+        changed = manager.get_changed_files([main_file], {main_file: main_file.stat()})
+        assert changed == {utils_file}
+
+    def test_tree_fingerprint_tracking(self, temp_project):
+        """Test that the tree fingerprint is recorded and persisted with build state."""
+        manager = IncrementalBuildManager(temp_project)
+
+        assert manager.matches_tree_fingerprint("") is False
+        assert manager.matches_tree_fingerprint("abc123") is False
+
+        manager.mark_files_built([temp_project / "main.py"], tree_fingerprint="abc123")
+        assert manager.matches_tree_fingerprint("abc123") is True
+        assert manager.matches_tree_fingerprint("def456") is False
+
+        reloaded = IncrementalBuildManager(temp_project)
+        assert reloaded.matches_tree_fingerprint("abc123") is True
+
+        reloaded.record_tree_fingerprint("def456")
+        assert IncrementalBuildManager(temp_project).matches_tree_fingerprint("def456") is True
+
     def test_dependency_tracking(self, temp_project):
         """Test dependency tracking functionality."""
         manager = IncrementalBuildManager(temp_project)
@@ -185,6 +232,27 @@ def main():
         dependents = manager.get_dependent_files(main_py)
         assert len(dependents) == 0
 
+    def test_dependent_files_for_many_changes(self, temp_project):
+        """Test bulk dependent lookup and that the index survives a reload."""
+        manager = IncrementalBuildManager(temp_project)
+
+        main_py = temp_project / "main.py"
+        utils_py = temp_project / "utils.py"
+        extra_py = temp_project / "extra.py"
+        manager.update_dependencies(
+            {str(main_py): [str(utils_py)], str(extra_py): [str(utils_py), str(main_py)]}
+        )
+
+        assert manager.get_dependent_files_for([utils_py, main_py]) == {main_py, extra_py}
+        assert manager.get_dependent_files_for([extra_py]) == set()
+
+        # Replacing a file's dependencies drops its stale reverse edges
+        manager.update_dependencies({str(extra_py): [str(main_py)]})
+        assert manager.get_dependent_files(utils_py) == {main_py}
+
+        reloaded = IncrementalBuildManager(temp_project)
+        assert reloaded.get_dependent_files(main_py) == {extra_py}
+
     def test_full_build_tracking(self, temp_project):
         """Test full build timestamp tracking."""
         manager = IncrementalBuildManager(temp_project)
@@ -1,17 +1,23 @@
 """Simple tests for incremental documentation generator."""
 
+import asyncio
+import os
 import tempfile
+import threading
 from pathlib import Path
-from unittest.mock import patch
+from unittest.mock import Mock, patch
 
 import pytest
 
 from config.project_config import Config, ObsidianConfig, ProjectConfig
 from docs_generator.analyzer import ProjectStructure
 from utils.incremental_generator import (
+    MAX_INFLIGHT_FILE_OPS,
     IncrementalDocumentationGenerationError,
     IncrementalDocumentationGenerator,
+    _tree_fingerprint,
 )
+from utils.obsidian_utils import ObsidianVaultManager
 
 
 @pytest.fixture
@@ -241,6 +247,85 @@ class TestIncrementalGeneratorBasics:
         assert len(result["files_created"]) == 0
         assert "No vault manager" in result["warnings"][0]
 
+    @pytest.mark.asyncio
+    async def test_save_to_vault_writes_all_files(self, sample_config, temp_project_dir):
+        """Test vault saving writes every file with bounded concurrency."""
+        config = sample_config
+        config.project.source_paths = [str(temp_project_dir / "src")]
+
+        generator = IncrementalDocumentationGenerator(config)
+        vault_path = temp_project_dir / "vault"
+        vault_path.mkdir()
+        generator.vault_manager = ObsidianVaultManager(vault_path)
+
+        obsidian_docs = {"files": {f"pkg{i % 3}/module_{i}.md": f"# Module {i}" for i in range(20)}}
+
+        result = await generator._save_to_vault(obsidian_docs)
+
+        assert len(result["files_created"]) == 20
+        assert result["warnings"] == []
+        docs_folder = vault_path / config.obsidian.docs_folder
+        assert (docs_folder / "pkg1" / "module_4.md").read_text() == "# Module 4"
+        assert generator._get_io_semaphore() is generator._get_io_semaphore()
+        assert 0 < MAX_INFLIGHT_FILE_OPS <= 512
+
+    @pytest.mark.asyncio
+    async def test_save_to_vault_streams_converted_files(self, sample_config, temp_project_dir):
+        """Test vault saving reads converter output files from disk on demand."""
+        config = sample_config
+        config.project.source_paths = [str(temp_project_dir / "src")]
+
+        generator = IncrementalDocumentationGenerator(config)
+        vault_path = temp_project_dir / "vault"
+        vault_path.mkdir()
+        generator.vault_manager = ObsidianVaultManager(vault_path)
+
+        output_dir = temp_project_dir / "obsidian_output"
+        (output_dir / "api").mkdir(parents=True)
+        (output_dir / "index.md").write_text("# Index")
+        (output_dir / "api" / "module.md").write_text("# Module")
+        obsidian_docs = {
+            "converted_files": [
+                {"output": str(output_dir / "index.md")},
+                {"output": str(output_dir / "api" / "module.md")},
+            ],
+            "output_directory": str(output_dir),
+        }
+
+        assert generator._count_obsidian_files(obsidian_docs) == 2
+        result = await generator._save_to_vault(obsidian_docs)
+
+        assert result["warnings"] == []
+        docs_folder = vault_path / config.obsidian.docs_folder
+        assert (docs_folder / "index.md").read_text() == "# Index"
+        assert (docs_folder / "api" / "module.md").read_text() == "# Module"
+
+    @pytest.mark.asyncio
+    async def test_incremental_build_skips_on_unchanged_fingerprint(
+        self, sample_config, temp_project_dir
+    ):
+        """Test that an unchanged source tree short-circuits before change detection."""
+        config = sample_config
+        config.project.source_paths = [str(temp_project_dir / "src")]
+
+        generator = IncrementalDocumentationGenerator(config)
+        fingerprint = _tree_fingerprint(generator._walk_with_stats())
+        generator.build_manager.record_tree_fingerprint(fingerprint)
+
+        with patch.object(generator.build_manager, "get_changed_files") as mock_changed:
+            results = await generator._perform_incremental_build()
+
+        mock_changed.assert_not_called()
+        assert results["statistics"]["tree_fingerprint_match"] is True
+        assert results["statistics"]["files_changed"] == 0
+        assert len(results["files_skipped"]) == 1
+
+        # Touching a file changes the fingerprint
+        sample_file = temp_project_dir / "src" / "sample_module.py"
+        stat_result = sample_file.stat()
+        os.utime(sample_file, ns=(stat_result.st_atime_ns, stat_result.st_mtime_ns + 1_000_000))
+        assert _tree_fingerprint(generator._walk_with_stats()) != fingerprint
+
 
 class TestIncrementalGeneratorErrorHandling:
     """Test error handling in incremental generator."""
@@ -326,6 +411,57 @@ class TestIncrementalGeneratorIntegration:
                     # The actual return structure depends on the implementation
                     # We'll just verify it doesn't crash and returns something
 
+    @pytest.mark.asyncio
+    async def test_build_state_persisted_in_background(self, sample_config, temp_project_dir):
+        """Test that build state is saved once pending persistence is awaited."""
+        config = sample_config
+        config.project.source_paths = [str(temp_project_dir / "src")]
+
+        mock_structure = ProjectStructure(
+            project_name="TestProject",
+            root_path=Path("test"),
+            modules=[],
+        )
+
+        async with IncrementalDocumentationGenerator(config) as generator:
+            with patch.object(generator.analyzer, "analyze_project", return_value=mock_structure):
+                with patch.object(
+                    generator.sphinx_generator, "generate_documentation", return_value={}
+                ):
+                    with patch(
+                        "docs_generator.obsidian_converter.convert_sphinx_to_obsidian",
+                        return_value={"files": {}},
+                    ):
+                        result = await generator.generate_documentation(force_full=True)
+
+            assert result["build_type"] == "full"
+            await generator.wait_for_pending_persist()
+            assert generator.build_manager.build_state.last_full_build > 0
+            assert generator.build_manager.build_cache_file.exists()
+
+    @pytest.mark.asyncio
+    async def test_aclose_finishes_persist_when_cancelled(self, sample_config, temp_project_dir):
+        """Test that cancelling aclose still lets the state file write finish."""
+        config = sample_config
+        config.project.source_paths = [str(temp_project_dir / "src")]
+
+        generator = IncrementalDocumentationGenerator(config)
+        release = threading.Event()
+        generator.build_manager = Mock()
+        generator.build_manager.mark_files_built.side_effect = lambda *_: release.wait(5)
+
+        generator._schedule_persist([], {}, "fingerprint", full_build=True)
+        closing = asyncio.create_task(generator.aclose())
+        await asyncio.sleep(0.01)
+        closing.cancel()
+        asyncio.get_running_loop().call_later(0.05, release.set)
+
+        with pytest.raises(asyncio.CancelledError):
+            await closing
+
+        generator.build_manager.mark_full_build.assert_called_once()
+        assert generator._pending_persist is None
+
     def test_multiple_generator_instances(self, sample_config, temp_project_dir):
         """Test creating multiple generator instances."""
         config = sample_config
@@ -1,16 +1,21 @@
 """Tests for memory optimization functionality."""
 
 import gc
+import re
+import sys
 import tempfile
 import time
 from pathlib import Path
 from unittest.mock import patch
 
+import pytest
+
 from utils.memory_optimizer import (
     MemoryMonitor,
     MemoryOptimizer,
     MemoryProfile,
     MemorySnapshot,
+    get_rss_mb_fast,
     memory_efficient_context,
 )
 
@@ -37,6 +42,17 @@ class TestMemorySnapshot:
         assert snapshot.python_objects == 1000
         assert snapshot.tracemalloc_mb == 50.0
 
+    def test_memory_snapshot_uses_slots(self):
+        """Test snapshots and profiles carry no per-instance __dict__."""
+        snapshot = MemorySnapshot(
+            timestamp=0.0, rss_mb=0.0, vms_mb=0.0, percent=0.0, available_mb=0.0
+        )
+        profile = MemoryProfile("op", snapshot, snapshot)
+
+        assert not hasattr(snapshot, "__dict__")
+        assert not hasattr(profile, "__dict__")
+        assert profile.snapshots == []
+
 
 class TestMemoryProfile:
     """Test MemoryProfile dataclass."""
@@ -85,7 +101,46 @@ class TestMemoryMonitor:
         assert isinstance(snapshot, MemorySnapshot)
         assert snapshot.timestamp > 0
         assert snapshot.rss_mb > 0  # Should have some memory usage
-        assert snapshot.python_objects > 0
+        assert snapshot.python_objects == 0  # Object counting is opt-in
+
+        full_snapshot = monitor.get_memory_snapshot(include_object_count=True)
+        assert full_snapshot.python_objects > 0
+
+    def test_take_snapshot_full_counts_objects(self):
+        """Test only full snapshots count objects unless enabled on the monitor."""
+        monitor = MemoryMonitor(enable_tracemalloc=False)
+
+        with monitor.profile_operation("test_operation") as profile:
+            monitor.take_snapshot()
+            monitor.take_snapshot(full=True)
+
+        assert profile.snapshots[0].python_objects == 0
+        assert profile.snapshots[1].python_objects > 0
+
+        counting_monitor = MemoryMonitor(enable_tracemalloc=False, include_object_count=True)
+        assert counting_monitor.get_memory_snapshot().python_objects > 0
+
+        with counting_monitor.profile_operation("test_operation") as profile:
+            counting_monitor.take_snapshot()
+
+        assert profile.snapshots[0].python_objects > 0
+
+    def test_tracemalloc_sampled_only_at_profile_boundaries(self):
+        """Test traced memory is read at profile start/end, not per snapshot."""
+        monitor = MemoryMonitor()
+
+        with patch(
+            "utils.memory_optimizer.tracemalloc.get_traced_memory", return_value=(2 << 20, 0)
+        ) as mock_traced:
+            assert monitor.get_memory_snapshot().tracemalloc_mb == 0.0
+            with monitor.profile_operation("test_operation") as profile:
+                monitor.take_snapshot()
+
+        assert mock_traced.call_count == 2
+        assert profile.start_snapshot.tracemalloc_mb == 2.0
+        assert profile.snapshots[0].tracemalloc_mb == 0.0
+        assert profile.snapshots[0].rss_mb > 0
+        assert profile.snapshots[0].vms_mb == 0.0  # RSS-only snapshot
 
     def test_profile_operation_context(self):
         """Test operation profiling context manager."""
@@ -109,9 +164,24 @@ class TestMemoryMonitor:
         """Test operation profiling when disabled."""
         monitor = MemoryMonitor(enable_profiling=False)
 
-        with monitor.profile_operation("test_operation") as profile:
-            assert isinstance(profile, MemoryProfile)
-            # Should still work but minimal tracking
+        with patch.object(monitor, "get_memory_snapshot") as mock_snapshot:
+            with monitor.profile_operation("test_operation") as profile:
+                assert isinstance(profile, MemoryProfile)
+                assert profile.operation_name == "test_operation"
+
+        # Disabled profiling takes no measurements
+        mock_snapshot.assert_not_called()
+        assert profile.memory_delta_mb == 0.0
+
+    def test_process_handle_is_cached(self):
+        """Test the psutil process handle is reused across snapshots."""
+        monitor = MemoryMonitor(enable_tracemalloc=False)
+        monitor.get_memory_snapshot()
+        process = monitor._process
+
+        monitor.get_memory_snapshot()
+
+        assert monitor._process is process
 
     def test_memory_recommendations(self):
         """Test memory recommendations generation."""
@@ -132,6 +202,17 @@ class TestMemoryMonitor:
             assert isinstance(snapshot, MemorySnapshot)
             # Without psutil, some fields will be 0 or minimal
 
+    def test_get_rss_mb_fast(self):
+        """Test the fast RSS reading and its getrusage fallback."""
+        rss_mb = get_rss_mb_fast()
+        assert rss_mb > 0
+
+        with patch("builtins.open", side_effect=OSError("no procfs")):
+            peak_rss_mb = get_rss_mb_fast()
+
+        # getrusage reports the peak, which is never below the current RSS
+        assert peak_rss_mb >= rss_mb * 0.9
+
 
 class TestMemoryOptimizer:
     """Test MemoryOptimizer functionality."""
@@ -158,16 +239,50 @@ class TestMemoryOptimizer:
         assert len(processed_batches) == 3
         assert processed_batches == [10, 10, 5]
 
-    def test_optimize_string_operations(self):
-        """Test string optimization."""
-        optimizer = MemoryOptimizer()
+    def test_chunked_streams_any_iterable(self):
+        """Test chunking consumes iterators lazily in fixed-size batches."""
+        source = iter(range(7))
+
+        chunks = MemoryOptimizer.chunked(source, 3)
+
+        assert next(chunks) == [0, 1, 2]
+        assert next(source) == 3  # Only the first batch has been consumed
+        assert list(chunks) == [[4, 5, 6]]
+        assert list(MemoryOptimizer.chunked([], 3)) == []
+
+    def test_batch_processor_budgets_collections(self):
+        """Test aggressive GC collects young objects periodically, fully once."""
+        optimizer = MemoryOptimizer(aggressive_gc=True, gc_every_n_batches=2)
+
+        with patch("utils.memory_optimizer.gc.get_count", return_value=(0, 0, 0)):
+            with patch("utils.memory_optimizer.gc.collect") as mock_collect:
+                with optimizer.batch_processor(list(range(5)), batch_size=1) as batch_iter:
+                    for _ in batch_iter:
+                        pass
+
+        assert [call.args for call in mock_collect.call_args_list] == [(0,), (0,), ()]
+
+    def test_memory_limit_tightens_gc_only_under_pressure(self):
+        """Test GC thresholds change only when aggressive and close to the limit."""
+        original = gc.get_threshold()
+
+        with MemoryOptimizer(aggressive_gc=True).memory_limit(100000.0):
+            assert gc.get_threshold() == original
+
+        with pytest.raises(MemoryError):
+            with MemoryOptimizer(aggressive_gc=True).memory_limit(0.001):
+                assert gc.get_threshold() == (100, 5, 5)
+
+        assert gc.get_threshold() == original
 
-        # Test with repeated strings
-        strings = ["hello", "world", "hello", "foo", "world"]
-        optimized = optimizer.optimize_string_operations(strings)
+    def test_intern_identifiers(self):
+        """Test identifier interning shares storage and keeps other strings."""
+        dotted = "".join(["os.", "path"])
+        names = MemoryOptimizer.intern_identifiers([dotted, "hello", "list[str]"])
 
-        assert len(optimized) == len(strings)
-        # Can't easily test sys.intern behavior, but should not crash
+        assert names == ["os.path", "hello", "list[str]"]
+        assert names[0] is sys.intern("os.path")
+        assert MemoryOptimizer.intern_identifiers([]) == []
 
     def test_memory_limit_context(self):
         """Test memory limit enforcement."""
@@ -192,14 +307,28 @@ class TestMemoryOptimizer:
 
         try:
             # Read file in chunks
-            read_content = ""
-            for chunk in optimizer.memory_efficient_file_reader(temp_path, chunk_size=50):
-                read_content += chunk
+            read_content = "".join(optimizer.memory_efficient_file_reader(temp_path, chunk_size=50))
 
             assert read_content == test_content
         finally:
             temp_path.unlink()
 
+    def test_memory_efficient_file_reader_split_characters(self):
+        """Test chunked reading across multi-byte characters and CRLF newlines."""
+        optimizer = MemoryOptimizer()
+
+        with tempfile.NamedTemporaryFile(mode="wb", delete=False, suffix=".txt") as f:
+            f.write("héllo wörld ✓\r\n".encode() * 50)
+            temp_path = Path(f.name)
+
+        try:
+            chunks = list(optimizer.memory_efficient_file_reader(temp_path, chunk_size=7))
+
+            assert len(chunks) > 1
+            assert "".join(chunks) == "héllo wörld ✓\n" * 50
+        finally:
+            temp_path.unlink()
+
     def test_clear_caches(self):
         """Test cache clearing functionality."""
         optimizer = MemoryOptimizer()
@@ -210,6 +339,17 @@ class TestMemoryOptimizer:
         assert isinstance(cleared, dict)
         assert "gc_collected" in cleared
         assert cleared["gc_collected"] >= 0
+        assert "regex_cache" not in cleared
+
+    def test_clear_caches_keeps_regex_cache(self):
+        """Test compiled regexes survive cache clearing."""
+        optimizer = MemoryOptimizer()
+        assert optimizer.clear_caches_between_batches is False
+
+        pattern = re.compile(r"kept_\d+_pattern")
+        optimizer.clear_caches()
+
+        assert re.compile(r"kept_\d+_pattern") is pattern
 
     def test_get_large_objects_no_tracemalloc(self):
         """Test large object detection when tracemalloc is disabled."""
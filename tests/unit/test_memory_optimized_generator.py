@@ -1,6 +1,11 @@
 """Tests for memory-optimized documentation generator."""
 
+import asyncio
+import logging
+import os
+import sys
 import tempfile
+import threading
 from pathlib import Path
 from unittest.mock import Mock, patch
 
@@ -9,6 +14,7 @@ import pytest
 from config.project_config import Config, ObsidianConfig, ProjectConfig
 from docs_generator.analyzer import ModuleInfo
 from utils.memory_optimized_generator import MemoryOptimizedDocumentationGenerator
+from utils.obsidian_utils import ObsidianVaultManager
 
 
 @pytest.fixture
@@ -155,6 +161,48 @@ class TestMemoryOptimizedGenerator:
         # Should exclude the file containing "sample_module" in the path
         assert len(files) == 0
 
+    @pytest.mark.asyncio
+    async def test_discover_files_patterns_are_literal(self, sample_config, temp_project_dir):
+        """Test exclusion patterns match as literal substrings, not regexes."""
+        src_dir = temp_project_dir / "src"
+        (src_dir / "build").mkdir()
+        (src_dir / "build" / "gen.py").write_text("")
+        (src_dir / "axb.py").write_text("")
+
+        config = sample_config
+        config.project.source_paths = [str(src_dir)]
+        config.project.exclude_patterns = ["build/", "a.b", "*.pyc"]
+
+        generator = MemoryOptimizedDocumentationGenerator(config)
+
+        files = await generator._discover_files_efficiently()
+
+        assert sorted(file.name for file in files) == ["axb.py", "sample_module.py"]
+
+    @pytest.mark.asyncio
+    async def test_discover_files_prunes_excluded_directories(
+        self, sample_config, temp_project_dir
+    ):
+        """Test excluded directories are not descended into."""
+        src_dir = temp_project_dir / "src"
+        (src_dir / "pkg" / "tests").mkdir(parents=True)
+        (src_dir / "pkg" / "core.py").write_text("")
+        (src_dir / "pkg" / "tests" / "test_core.py").write_text("")
+
+        config = sample_config
+        config.project.source_paths = [str(src_dir)]
+
+        generator = MemoryOptimizedDocumentationGenerator(config)
+
+        with patch(
+            "utils.memory_optimized_generator.os.scandir", side_effect=os.scandir
+        ) as mock_scandir:
+            files = await generator._discover_files_efficiently()
+
+        assert sorted(file.name for file in files) == ["core.py", "sample_module.py"]
+        scanned = {Path(call.args[0]).name for call in mock_scandir.call_args_list}
+        assert scanned == {"src", "pkg"}
+
     @pytest.mark.asyncio
     async def test_analyze_files_batch(self, sample_config, temp_project_dir, sample_modules):
         """Test batch file analysis."""
@@ -163,9 +211,7 @@ class TestMemoryOptimizedGenerator:
 
         generator = MemoryOptimizedDocumentationGenerator(config)
 
-        # Mock memory optimizer
         mock_optimizer = Mock()
-        mock_optimizer.memory_efficient_file_reader.return_value = ["file content"]
 
         # Mock analyzer method
         with patch.object(generator.analyzer, "_analyze_file", return_value=sample_modules[0]):
@@ -184,17 +230,72 @@ class TestMemoryOptimizedGenerator:
 
         generator = MemoryOptimizedDocumentationGenerator(config)
 
-        # Mock memory optimizer
         mock_optimizer = Mock()
-        mock_optimizer.memory_efficient_file_reader.side_effect = Exception("File error")
 
         file_paths = [temp_project_dir / "src" / "sample_module.py"]
 
         # Should handle error gracefully and continue
-        modules = await generator._analyze_files_batch(file_paths, mock_optimizer)
+        with patch.object(generator.analyzer, "_analyze_file", side_effect=Exception("File error")):
+            modules = await generator._analyze_files_batch(file_paths, mock_optimizer)
 
         assert len(modules) == 0  # No modules due to error
 
+    @pytest.mark.asyncio
+    async def test_analyze_files_batch_concurrent(self, sample_config, temp_project_dir):
+        """Test batch analysis keeps input order and drops failed files."""
+        config = sample_config
+        config.project.source_paths = [str(temp_project_dir / "src")]
+
+        generator = MemoryOptimizedDocumentationGenerator(config, batch_size=2)
+
+        mock_optimizer = Mock()
+
+        def analyze(file_path):
+            if file_path.stem == "bad":
+                raise ValueError("boom")
+            return ModuleInfo(name=file_path.stem, file_path=file_path)
+
+        file_paths = [Path(f"{name}.py") for name in ("a", "bad", "b", "c")]
+        with patch.object(generator.analyzer, "_analyze_file", side_effect=analyze):
+            modules = await generator._analyze_files_batch(file_paths, mock_optimizer)
+
+        assert [module.name for module in modules] == ["a", "b", "c"]
+        mock_optimizer.memory_efficient_file_reader.assert_not_called()
+
+    def test_analyze_file_interns_repeated_names(self, sample_config, temp_project_dir):
+        """Test analyzed import paths are interned so modules share one copy."""
+        config = sample_config
+        config.project.source_paths = [str(temp_project_dir / "src")]
+
+        generator = MemoryOptimizedDocumentationGenerator(config)
+        sample_file = temp_project_dir / "src" / "sample_module.py"
+        sample_file.write_text("import os.path\nfrom collections import abc\n")
+
+        first = generator._analyze_file_interned(sample_file)
+        name = "".join(["os.", "path"])
+
+        assert first.imports[0] == "os.path"
+        assert first.imports[0] is sys.intern(name)
+        assert next(iter(first.from_imports)) is sys.intern("".join(["collec", "tions"]))
+
+    @pytest.mark.asyncio
+    async def test_analysis_uses_dedicated_pool(self, sample_config, temp_project_dir):
+        """Test analysis runs on its own pool, which aclose shuts down."""
+        config = sample_config
+        config.project.source_paths = [str(temp_project_dir / "src")]
+
+        async with MemoryOptimizedDocumentationGenerator(config) as generator:
+
+            def analyze(file_path):
+                return ModuleInfo(name=threading.current_thread().name, file_path=file_path)
+
+            with patch.object(generator.analyzer, "_analyze_file", side_effect=analyze):
+                modules = await generator._analyze_files_batch([Path("a.py")], Mock())
+
+        assert modules[0].name.startswith("analyze")
+        with pytest.raises(RuntimeError):
+            generator._analysis_pool.submit(print)
+
     def test_create_batch_structure(self, sample_config, temp_project_dir, sample_modules):
         """Test batch structure creation."""
         config = sample_config
@@ -210,7 +311,7 @@ class TestMemoryOptimizedGenerator:
         assert structure.modules[0].name == "sample_module"
 
     @pytest.mark.asyncio
-    async def test_convert_batch_to_obsidian(self, sample_config, temp_project_dir):
+    async def test_convert_batch_to_obsidian(self, sample_config, temp_project_dir, tmp_path):
         """Test batch Obsidian conversion."""
         config = sample_config
         config.project.source_paths = [str(temp_project_dir / "src")]
@@ -230,9 +331,37 @@ class TestMemoryOptimizedGenerator:
             "docs_generator.obsidian_converter.convert_sphinx_to_obsidian",
             return_value=expected_obsidian,
         ):
-            result = await generator._convert_batch_to_obsidian(sphinx_output)
+            result = await generator._convert_batch_to_obsidian(sphinx_output, tmp_path)
             assert result == expected_obsidian
 
+    @pytest.mark.asyncio
+    async def test_batch_conversion_uses_scratch_directory(
+        self, sample_config, temp_project_dir, sample_modules
+    ):
+        """Test each batch converts into its own directory, removed afterwards."""
+        config = sample_config
+        config.project.source_paths = [str(temp_project_dir / "src")]
+
+        generator = MemoryOptimizedDocumentationGenerator(config)
+        output_dirs = []
+
+        async def convert(sphinx_output, output_dir):
+            assert output_dir.is_dir()
+            output_dirs.append(output_dir)
+            return {"files": {}}
+
+        with (
+            patch.object(generator.sphinx_generator, "generate_documentation", return_value={}),
+            patch.object(generator, "_convert_batch_to_obsidian", side_effect=convert),
+        ):
+            await generator._generate_batch_documentation(list(sample_modules), 0)
+            module_batch = list(sample_modules)
+            await generator._generate_batch_documentation(module_batch, 1)
+
+        assert len(set(output_dirs)) == 2
+        assert not any(output_dir.exists() for output_dir in output_dirs)
+        assert module_batch == []  # Released once the batch is done
+
     @pytest.mark.asyncio
     async def test_save_batch_to_vault_no_manager(self, sample_config, temp_project_dir):
         """Test vault saving with no vault manager."""
@@ -273,6 +402,41 @@ class TestMemoryOptimizedGenerator:
         mock_vault_manager.ensure_folder_exists.assert_called_once()
         mock_vault_manager.safe_write_file.assert_called_once()
 
+    @pytest.mark.asyncio
+    async def test_save_batch_to_vault_converted_files(
+        self, sample_config, temp_project_dir, tmp_path
+    ):
+        """Test that files written by the converter land in the vault."""
+        config = sample_config
+        config.project.source_paths = [str(temp_project_dir / "src")]
+
+        generator = MemoryOptimizedDocumentationGenerator(config)
+        vault_dir = tmp_path / "vault"
+        vault_dir.mkdir()
+        generator.vault_manager = ObsidianVaultManager(vault_dir)
+
+        # Shape returned by convert_sphinx_to_obsidian
+        output_dir = tmp_path / "converted"
+        (output_dir / "pkg").mkdir(parents=True)
+        (output_dir / "index.md").write_text("# Index", encoding="utf-8")
+        (output_dir / "pkg" / "module.md").write_text("# Module", encoding="utf-8")
+        obsidian_docs = {
+            "converted_files": [
+                {"source": "index.html", "output": str(output_dir / "index.md")},
+                {"source": "pkg/module.html", "output": str(output_dir / "pkg" / "module.md")},
+            ],
+            "output_directory": str(output_dir),
+        }
+
+        result = await generator._save_batch_to_vault(obsidian_docs)
+
+        docs_dir = vault_dir / config.obsidian.docs_folder
+        assert sorted(result) == sorted(
+            [str(docs_dir / "index.md"), str(docs_dir / "pkg" / "module.md")]
+        )
+        assert (docs_dir / "index.md").read_text(encoding="utf-8") == "# Index"
+        assert (docs_dir / "pkg" / "module.md").read_text(encoding="utf-8") == "# Module"
+
     def test_create_generation_summary(self, sample_config, temp_project_dir):
         """Test generation summary creation."""
         config = sample_config
@@ -297,6 +461,12 @@ class TestMemoryOptimizedGenerator:
         assert "10 files generated" in summary
         assert "128.5MB" in summary
 
+        results["memory_profile"] = {"enabled": False}
+        summary = generator._create_generation_summary(results)
+
+        assert summary.endswith("10 files generated")
+        assert "peak memory" not in summary
+
     @pytest.mark.asyncio
     async def test_estimate_memory_requirements(self, sample_config, temp_project_dir):
         """Test memory requirements estimation."""
@@ -362,7 +532,7 @@ class TestMemoryOptimizedGeneratorFullPipeline:
         # Mock all major dependencies
         with patch.object(generator, "_discover_files_efficiently") as mock_discover:
             with patch.object(generator, "_analyze_files_batch") as mock_analyze:
-                with patch.object(generator, "_generate_documentation_streaming") as mock_generate:
+                with patch.object(generator, "_generate_batch_documentation") as mock_generate:
                     mock_discover.return_value = [Path("test.py")]
                     mock_analyze.return_value = sample_modules
                     mock_generate.return_value = ["output.md"]
@@ -402,87 +572,109 @@ class TestMemoryOptimizedGeneratorFullPipeline:
                         assert len(result["steps_completed"]) > 0
                         assert "memory_profile" in result
                         assert "statistics" in result
+                        assert result["statistics"]["modules_analyzed"] == 1
+                        assert result["files_generated"] == ["output.md"]
+                        mock_generate.assert_called_once_with(sample_modules, 0, None)
 
     @pytest.mark.asyncio
-    async def test_generate_documentation_streaming_empty(self, sample_config, temp_project_dir):
-        """Test streaming generation with empty module list."""
+    async def test_generate_documentation_pipelines_batches(
+        self, sample_config, temp_project_dir, sample_modules
+    ):
+        """Test analysis batches are handed to generation and errors propagate."""
         config = sample_config
         config.project.source_paths = [str(temp_project_dir / "src")]
 
         generator = MemoryOptimizedDocumentationGenerator(config, batch_size=1)
+        files = [Path(f"module_{i}.py") for i in range(4)]
+
+        with (
+            patch.object(generator, "_discover_files_efficiently", return_value=files),
+            patch.object(generator, "_analyze_files_batch", return_value=sample_modules),
+            patch.object(
+                generator, "_generate_batch_documentation", return_value=["out.md"]
+            ) as mock_generate,
+        ):
+            result = await generator.generate_documentation()
 
-        # Mock optimizer for batch processing
-        mock_optimizer = Mock()
-        mock_optimizer.batch_processor.return_value.__enter__ = Mock(return_value=iter([]))
-        mock_optimizer.batch_processor.return_value.__exit__ = Mock(return_value=None)
-
-        result = await generator._generate_documentation_streaming([], mock_optimizer)
+            assert result["statistics"]["modules_analyzed"] == 4
+            assert result["files_generated"] == ["out.md"] * 4
+            assert [call.args[1] for call in mock_generate.call_args_list] == [0, 1, 2, 3]
 
-        assert result == []
+            mock_generate.side_effect = RuntimeError("generation failed")
+            with pytest.raises(RuntimeError, match="generation failed"):
+                await generator.generate_documentation()
 
     @pytest.mark.asyncio
-    async def test_generate_documentation_streaming_with_modules(
-        self, sample_config, temp_project_dir, sample_modules
+    async def test_generate_documentation_bounded_concurrency(
+        self, sample_config, temp_project_dir
     ):
-        """Test streaming generation with modules."""
+        """Test batches generate concurrently up to the limit, keeping output order."""
         config = sample_config
         config.project.source_paths = [str(temp_project_dir / "src")]
 
-        generator = MemoryOptimizedDocumentationGenerator(config, batch_size=1)
+        generator = MemoryOptimizedDocumentationGenerator(
+            config, batch_size=1, generation_concurrency=2
+        )
+        active = 0
+        peak = 0
+
+        async def analyze_batch(batch_files, optimizer):
+            return [ModuleInfo(name=path.stem, file_path=path) for path in batch_files]
+
+        async def generate_batch(module_batch, batch_idx, progress_callback=None):
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.01 * (5 - batch_idx))
+            active -= 1
+            return [f"batch_{batch_idx}.md"]
+
+        files = [Path(f"m{i}.py") for i in range(5)]
+        with (
+            patch.object(generator, "_discover_files_efficiently", return_value=files),
+            patch.object(generator, "_analyze_files_batch", side_effect=analyze_batch),
+            patch.object(generator, "_generate_batch_documentation", side_effect=generate_batch),
+        ):
+            result = await generator.generate_documentation()
 
-        # Mock optimizer for batch processing
-        mock_optimizer = Mock()
-        mock_batch_context = Mock()
-        mock_batch_context.__enter__ = Mock(return_value=iter([sample_modules]))
-        mock_batch_context.__exit__ = Mock(return_value=None)
-        mock_optimizer.batch_processor.return_value = mock_batch_context
+        assert result["files_generated"] == [f"batch_{i}.md" for i in range(5)]
+        assert peak == 2
 
-        # Mock Sphinx generation to succeed
-        with patch.object(generator.sphinx_generator, "generate_documentation") as mock_sphinx:
-            with patch.object(generator, "_convert_batch_to_obsidian") as mock_convert:
-                with patch.object(generator, "_save_batch_to_vault") as mock_save:
-                    mock_sphinx.return_value = {
-                        "build_dir": Path("/tmp/sphinx"),
-                        "files": ["index.html"],
-                        "project_name": "TestProject",
-                    }
-                    mock_convert.return_value = {"files": {"index.md": "Content"}}
-                    mock_save.return_value = ["index.md"]
-
-                    result = await generator._generate_documentation_streaming(
-                        sample_modules, mock_optimizer
-                    )
+    @pytest.mark.asyncio
+    async def test_generate_documentation_skips_monitoring_by_default(
+        self, sample_config, temp_project_dir, caplog
+    ):
+        """Test monitoring only runs with a memory limit or debug logging."""
+        config = sample_config
+        config.project.source_paths = [str(temp_project_dir / "src")]
+        caplog.set_level(logging.INFO, logger="utils.memory_optimized_generator")
 
-                    # Should have processed the batch successfully
-                    assert isinstance(result, list)
-                    # The actual length depends on vault manager being present
-                    # We can't assert exact length without more complex mocking
+        generator = MemoryOptimizedDocumentationGenerator(config)
+        with patch.object(generator, "_discover_files_efficiently", return_value=[]):
+            result = await generator.generate_documentation()
+            assert result["memory_profile"] == {"enabled": False}
+
+            generator.max_memory_mb = 1_000_000
+            result = await generator.generate_documentation()
+            assert result["memory_profile"]["enabled"] is True
+            assert "peak_memory_mb" in result["memory_profile"]
 
     @pytest.mark.asyncio
-    async def test_generate_documentation_streaming_with_error(
+    async def test_generate_batch_documentation_with_error(
         self, sample_config, temp_project_dir, sample_modules
     ):
-        """Test streaming generation with error handling."""
+        """Test a failing batch is logged and yields no files."""
         config = sample_config
         config.project.source_paths = [str(temp_project_dir / "src")]
 
         generator = MemoryOptimizedDocumentationGenerator(config, batch_size=1)
 
-        # Mock optimizer for batch processing
-        mock_optimizer = Mock()
-        mock_optimizer.batch_processor.return_value.__enter__ = Mock(
-            return_value=iter([sample_modules])
-        )
-        mock_optimizer.batch_processor.return_value.__exit__ = Mock(return_value=None)
-
         # Mock Sphinx generation to raise an error
         with patch.object(generator.sphinx_generator, "generate_documentation") as mock_sphinx:
             mock_sphinx.side_effect = Exception("Sphinx error")
 
             # Should handle error gracefully and continue
-            result = await generator._generate_documentation_streaming(
-                sample_modules, mock_optimizer
-            )
+            result = await generator._generate_batch_documentation(list(sample_modules), 0)
 
             assert result == []
 
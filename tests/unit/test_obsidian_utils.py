@@ -1,5 +1,7 @@
 """Tests for obsidian_utils module."""
 
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
 from unittest.mock import patch
 
 import pytest
@@ -8,6 +10,7 @@ from utils.obsidian_utils import (
     ObsidianVaultManager,
     VaultNotFoundError,
     VaultValidationError,
+    VaultWriteBatch,
     create_obsidian_frontmatter,
     discover_vault,
     validate_vault_structure,
@@ -125,6 +128,73 @@ class TestObsidianVaultManager:
         assert backup_path is None
         assert file_path.read_text() == content
 
+    def test_safe_write_file_unchanged_content(self, temp_obsidian_vault):
+        """Test rewriting identical content skips both the write and the backup."""
+        manager = ObsidianVaultManager(temp_obsidian_vault)
+        file_path = temp_obsidian_vault / "same.md"
+        file_path.write_text("# Same Content")
+
+        with patch("utils.obsidian_utils._write_file_bytes") as mock_write:
+            result_path, backup_path = manager.safe_write_file(file_path, "# Same Content")
+
+        assert result_path == file_path
+        assert backup_path is None
+        mock_write.assert_not_called()
+        assert list(temp_obsidian_vault.glob("same.*")) == [file_path]
+
+    def test_safe_write_file_failure_removes_temp_file(self, temp_obsidian_vault):
+        """Test a failed atomic replace leaves no temp file behind."""
+        manager = ObsidianVaultManager(temp_obsidian_vault)
+        file_path = temp_obsidian_vault / "note.md"
+
+        with patch("utils.obsidian_utils.os.replace", side_effect=OSError("boom")):
+            with pytest.raises(OSError, match="boom"):
+                manager.safe_write_file(file_path, "# Ünïcode content")
+
+        assert list(temp_obsidian_vault.glob("note.md*")) == []
+        manager.safe_write_file(file_path, "# Ünïcode content")
+        assert file_path.read_bytes() == "# Ünïcode content".encode()
+
+    def test_write_batch(self, temp_obsidian_vault):
+        """Test batched writes create parents, back up, and keep add order."""
+        manager = ObsidianVaultManager(temp_obsidian_vault)
+        existing = temp_obsidian_vault / "docs" / "index.md"
+        existing.parent.mkdir()
+        existing.write_text("original content")
+
+        batch = VaultWriteBatch(manager)
+        paths = [
+            existing,
+            temp_obsidian_vault / "docs" / "index.txt",
+            temp_obsidian_vault / "docs" / "nested" / "module.md",
+        ]
+        for path in paths:
+            batch.add(path, f"content of {path.name}")
+        assert len(batch) == 3
+
+        assert batch.flush() == paths
+        assert len(batch) == 0
+        for path in paths:
+            assert path.read_text() == f"content of {path.name}"
+        backups = list(existing.parent.glob("index.backup_*"))
+        assert [backup.read_text() for backup in backups] == ["original content"]
+        assert not list(temp_obsidian_vault.rglob("*.tmp_*"))
+
+    def test_write_batch_shared_executor(self, temp_obsidian_vault):
+        """Test batches submit writes to a caller-provided executor."""
+        manager = ObsidianVaultManager(temp_obsidian_vault)
+        paths = [temp_obsidian_vault / "shared" / f"note{i}.md" for i in range(3)]
+
+        with ThreadPoolExecutor(thread_name_prefix="vault-write") as pool:
+            batch = VaultWriteBatch(manager, executor=pool)
+            for path in paths:
+                batch.add(path, path.stem)
+            with patch("utils.obsidian_utils.ThreadPoolExecutor") as mock_pool:
+                assert batch.flush() == paths
+            mock_pool.assert_not_called()
+
+        assert [path.read_text() for path in paths] == ["note0", "note1", "note2"]
+
     def test_generate_index_file(self, temp_obsidian_vault):
         """Test generating an index file."""
         manager = ObsidianVaultManager(temp_obsidian_vault)
@@ -150,6 +220,29 @@ class TestObsidianVaultManager:
         assert "[config.yaml]" in content
         assert "## Other Files" in content
 
+    def test_generate_index_file_outside_vault(self, temp_obsidian_vault, tmp_path):
+        """Test index generation rejects files outside the vault."""
+        manager = ObsidianVaultManager(temp_obsidian_vault)
+
+        with pytest.raises(ValueError, match="not inside the vault"):
+            manager.generate_index_file(temp_obsidian_vault, "Index", [tmp_path / "x.md"])
+
+    def test_generate_index_file_relative_vault_path(self, temp_obsidian_vault, monkeypatch):
+        """Test index generation when the vault is given as a relative path."""
+        monkeypatch.chdir(temp_obsidian_vault)
+        manager = ObsidianVaultManager(Path("."))
+        files = [Path("docs/b.md"), Path("notes.txt"), Path("docs-old/a.md"), Path("docs/a.md")]
+
+        content = manager.generate_index_file(Path("."), "Index", files)
+
+        links = [line for line in content.splitlines() if line.startswith("- ")]
+        assert links == [
+            "- [[docs/a.md|A]]",
+            "- [[docs/b.md|B]]",
+            "- [[docs-old/a.md|A]]",
+            "- [notes.txt](notes.txt)",
+        ]
+
     def test_get_existing_files(self, temp_obsidian_vault):
         """Test getting existing files in a folder."""
         manager = ObsidianVaultManager(temp_obsidian_vault)
@@ -165,6 +258,9 @@ class TestObsidianVaultManager:
         subfolder = test_folder / "subfolder"
         subfolder.mkdir()
         (subfolder / "file3.md").write_text("content")
+        hidden_folder = test_folder / ".trash"
+        hidden_folder.mkdir()
+        (hidden_folder / "deleted.md").write_text("content")  # Should be ignored
 
         files = manager.get_existing_files("test_folder")
 
@@ -199,6 +295,34 @@ class TestObsidianVaultManager:
         assert results["existing_file"] is True
         assert results["nonexistent_file"] is False
         assert results["another_file"] is True
+        assert list(results) == ["existing_file", "nonexistent_file", "another_file"]
+
+    def test_validate_wikilinks_index_refreshes_after_write(self, temp_obsidian_vault):
+        """Test the cached vault index picks up files written through the manager."""
+        manager = ObsidianVaultManager(temp_obsidian_vault)
+        (temp_obsidian_vault / "Notes").mkdir()
+
+        assert manager.validate_wikilinks("[[Notes/new_note]] [[Notes]]") == {
+            "Notes/new_note": False,
+            "Notes": True,
+        }
+
+        manager.safe_write_file(temp_obsidian_vault / "Notes" / "new_note.md", "content")
+
+        assert manager.validate_wikilinks("[[Notes/new_note]]") == {"Notes/new_note": True}
+
+    def test_validate_wikilinks_relative_vault_path(self, temp_obsidian_vault, monkeypatch):
+        """Test wikilink validation when the vault is given as a relative path."""
+        (temp_obsidian_vault / "docs").mkdir()
+        (temp_obsidian_vault / "docs" / "a.md").write_text("content")
+        monkeypatch.chdir(temp_obsidian_vault)
+        manager = ObsidianVaultManager(Path("."))
+
+        assert manager.validate_wikilinks("[[docs/a]] [[docs]] [[cs/a]]") == {
+            "docs/a": True,
+            "docs": True,
+            "cs/a": False,
+        }
 
     def test_create_template_file(self, temp_obsidian_vault):
         """Test creating a template file."""
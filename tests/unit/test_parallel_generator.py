@@ -1,6 +1,8 @@
 """Tests for parallel documentation generator."""
 
+import pickle
 import tempfile
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from unittest.mock import Mock, patch
 
@@ -151,6 +153,18 @@ class TestParallelDocumentationGenerator:
         # vault_manager might still be None if ObsidianVaultManager fails
         assert hasattr(generator, "vault_manager")
 
+    def test_generator_pickles_without_thread_pools(self, sample_config, temp_project_dir):
+        """Test process workers can receive the generator despite its local pools."""
+        config = sample_config
+        config.project.source_paths = [str(temp_project_dir / "src")]
+
+        generator = ParallelDocumentationGenerator(config, use_threads=False)
+        restored = pickle.loads(pickle.dumps(generator._process_single_module)).__self__
+
+        assert restored._coordinator is None
+        assert restored._write_pool is None
+        assert restored.project_path == generator.project_path
+
     def test_setup_parallel_tasks(self, sample_config, temp_project_dir, sample_modules):
         """Test parallel task setup."""
         config = sample_config
@@ -171,6 +185,29 @@ class TestParallelDocumentationGenerator:
             # Verify tasks were added to parallel processor
             assert len(generator.parallel_processor.dependency_resolver.tasks) == 2
 
+    def test_setup_parallel_tasks_groups_packages(self, sample_config, temp_project_dir):
+        """Test sibling modules share one task and package cycles are broken."""
+        config = sample_config
+        config.project.source_paths = [str(temp_project_dir / "src")]
+
+        generator = ParallelDocumentationGenerator(config)
+
+        names = ["pkg", "pkg.a", "pkg.b", "pkg.sub.c", "other.d"]
+        modules = [ModuleInfo(name=name, file_path=Path(f"{name}.py")) for name in names]
+        # pkg.a -> other.d and other.d -> pkg.b form a cycle between the groups
+        dependencies = {"pkg.a": {"other.d"}, "other.d": {"pkg.b"}, "pkg.sub.c": {"pkg.a"}}
+
+        generator._setup_parallel_tasks(modules, dependencies)
+
+        tasks = generator.parallel_processor.dependency_resolver.tasks
+        assert {name: [m.name for m in task.input_data] for name, task in tasks.items()} == {
+            "pkg": ["pkg", "pkg.a", "pkg.b"],
+            "pkg.sub": ["pkg.sub.c"],
+            "other": ["other.d"],
+        }
+        assert tasks["pkg.sub"].dependencies == {"pkg"}
+        assert len(generator.parallel_processor.dependency_resolver.resolve_dependencies()) == 3
+
     def test_process_single_module(self, sample_config, temp_project_dir, sample_modules):
         """Test single module processing."""
         config = sample_config
@@ -233,7 +270,7 @@ class TestParallelDocumentationGenerator:
 
         # Mock the standalone function
         with patch(
-            "docs_generator.obsidian_converter.convert_sphinx_to_obsidian",
+            "utils.parallel_generator.convert_sphinx_to_obsidian",
             return_value=expected_obsidian,
         ):
             result = generator._convert_module_to_obsidian(sphinx_output)
@@ -277,8 +314,41 @@ class TestParallelDocumentationGenerator:
         mock_vault_manager.ensure_folder_exists.assert_called_once()
         mock_vault_manager.safe_write_file.assert_called_once()
 
-    @pytest.mark.asyncio
-    async def test_collect_parallel_results(self, sample_config, temp_project_dir):
+    def test_process_module_group_hands_writes_to_pool(
+        self, sample_config, temp_project_dir, sample_modules
+    ):
+        """Test workers hand vault writes to the write pool and results resolve later."""
+        config = sample_config
+        config.project.source_paths = [str(temp_project_dir / "src")]
+
+        generator = ParallelDocumentationGenerator(config)
+        vault_dir = temp_project_dir / "vault" / "docs"
+        vault_dir.mkdir(parents=True)
+        generator.vault_manager = Mock()
+        generator.vault_manager.ensure_folder_exists.return_value = vault_dir
+
+        with patch.object(generator.sphinx_generator, "generate_documentation") as mock_sphinx:
+            with patch.object(generator, "_convert_module_to_obsidian") as mock_convert:
+                mock_sphinx.return_value = {"files": ["index.html"]}
+                mock_convert.return_value = {"files": {"a.md": "A", "b.md": "B"}}
+
+                with ThreadPoolExecutor() as pool:
+                    generator._write_pool = pool
+                    module_result = generator._process_module_group("pkg", sample_modules)
+                    assert module_result["vault_files"] == []
+                    assert len(module_result["pending_vault_writes"]) == 2
+
+                    task_result = Mock(success=True, result=module_result)
+                    generator._finish_vault_writes({"pkg": task_result})
+
+        assert "pending_vault_writes" not in module_result
+        assert module_result["vault_files"] == [
+            str(vault_dir / "pkg" / "a.md"),
+            str(vault_dir / "pkg" / "b.md"),
+        ]
+        assert generator.vault_manager.safe_write_file.call_count == 2
+
+    def test_collect_parallel_results(self, sample_config, temp_project_dir):
         """Test parallel results collection."""
         config = sample_config
         config.project.source_paths = [str(temp_project_dir / "src")]
@@ -299,7 +369,7 @@ class TestParallelDocumentationGenerator:
             "task2": mock_result2,
         }
 
-        result = await generator._collect_parallel_results(processing_results)
+        result = list(generator._collect_parallel_results(processing_results))
 
         assert len(result) == 2
         assert "file1.md" in result
@@ -319,6 +389,23 @@ class TestParallelDocumentationGenerator:
             result = await generator._analyze_project()
             assert result == sample_project_structure
 
+    @pytest.mark.asyncio
+    async def test_aclose_shuts_down_coordinator(
+        self, sample_config, temp_project_dir, sample_project_structure
+    ):
+        """Test the coordinator pool is shut down when the generator is closed."""
+        config = sample_config
+        config.project.source_paths = [str(temp_project_dir / "src")]
+
+        async with ParallelDocumentationGenerator(config) as generator:
+            with patch.object(
+                generator.analyzer, "analyze_project", return_value=sample_project_structure
+            ):
+                assert await generator._analyze_project() == sample_project_structure
+
+        with pytest.raises(RuntimeError):
+            generator._coordinator.submit(print)
+
     def test_create_generation_summary(self, sample_config, temp_project_dir):
         """Test generation summary creation."""
         config = sample_config
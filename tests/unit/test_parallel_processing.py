@@ -1,11 +1,15 @@
 """Tests for parallel processing functionality."""
 
+import asyncio
+import concurrent.futures
+import threading
 import time
 from unittest.mock import MagicMock
 
 import pytest
 
 from utils.parallel_processor import (
+    AsyncParallelProcessor,
     DependencyResolver,
     ModuleDependencyAnalyzer,
     ParallelProcessor,
@@ -46,7 +50,10 @@ class TestProcessingResult:
     def test_processing_result_creation(self):
         """Test ProcessingResult creation and properties."""
         result = ProcessingResult(
-            task_id="test_task", result="success", start_time=100.0, end_time=105.0
+            task_id="test_task",
+            result="success",
+            start_time=100_000_000_000,
+            end_time=105_000_000_000,
         )
 
         assert result.task_id == "test_task"
@@ -62,6 +69,12 @@ class TestProcessingResult:
         assert result.success is False
         assert result.error == error
 
+    def test_processing_result_has_no_instance_dict(self):
+        """Test that results use slots rather than a per-instance dict."""
+        result = ProcessingResult(task_id="test_task")
+
+        assert not hasattr(result, "__dict__")
+
 
 class TestDependencyResolver:
     """Test DependencyResolver functionality."""
@@ -107,6 +120,17 @@ class TestDependencyResolver:
         # Second level: task2 (depends on task1)
         assert execution_levels[1] == ["task2"]
 
+    def test_dependency_resolver_diamond(self):
+        """Test that a task waits for its deepest dependency."""
+        resolver = DependencyResolver()
+
+        resolver.add_task(ProcessingTask("base", None, lambda x: x))
+        resolver.add_task(ProcessingTask("left", None, lambda x: x, dependencies={"base"}))
+        resolver.add_task(ProcessingTask("deep", None, lambda x: x, dependencies={"left"}))
+        resolver.add_task(ProcessingTask("top", None, lambda x: x, dependencies={"base", "deep"}))
+
+        assert resolver.resolve_dependencies() == [["base"], ["left"], ["deep"], ["top"]]
+
     def test_dependency_resolver_priority_ordering(self):
         """Test that higher priority tasks are ordered first within a level."""
         resolver = DependencyResolver()
@@ -125,6 +149,38 @@ class TestDependencyResolver:
         assert len(execution_levels) == 1
         assert execution_levels[0] == ["task2", "task3", "task1"]
 
+    def test_dependency_resolver_critical_path_ordering(self):
+        """Test that tasks heading long chains are ordered before higher priorities."""
+        resolver = DependencyResolver()
+
+        resolver.add_task(ProcessingTask("leaf", None, lambda x: x, priority=10))
+        resolver.add_task(ProcessingTask("chain_start", None, lambda x: x))
+        resolver.add_task(
+            ProcessingTask(
+                "chain_end",
+                None,
+                lambda x: x,
+                dependencies={"chain_start"},
+                estimated_duration=5.0,
+            )
+        )
+
+        execution_levels = resolver.resolve_dependencies()
+
+        assert execution_levels[0] == ["chain_start", "leaf"]
+        assert resolver.critical_paths == {"leaf": 1.0, "chain_start": 6.0, "chain_end": 5.0}
+
+    def test_dependency_resolver_caches_until_task_added(self):
+        """Test that the resolved schedule is reused until the graph changes."""
+        resolver = DependencyResolver()
+        resolver.add_task(ProcessingTask("task1", "data1", lambda x: x))
+
+        first = resolver.resolve_dependencies()
+        assert resolver.resolve_dependencies() is first
+
+        resolver.add_task(ProcessingTask("task2", "data2", lambda x: x, dependencies={"task1"}))
+        assert resolver.resolve_dependencies() == [["task1"], ["task2"]]
+
     def test_dependency_resolver_circular_dependency(self):
         """Test detection of circular dependencies."""
         resolver = DependencyResolver()
@@ -226,6 +282,72 @@ class TestParallelProcessor:
         # task1 should complete before task2
         assert results["task1"].end_time <= results["task2"].start_time
 
+    def test_dependent_starts_before_unrelated_slow_task_finishes(self):
+        """Test that tasks are scheduled per dependency rather than per level."""
+        processor = ParallelProcessor(max_workers=2, use_threads=True)
+
+        def slow(x):
+            time.sleep(0.3)
+            return x
+
+        processor.add_task("slow", 1, slow)
+        processor.add_task("fast", 2, lambda x: x)
+        processor.add_task("after_fast", 3, lambda x: x, dependencies={"fast"})
+
+        results = processor.process_all()
+
+        assert all(result.success for result in results.values())
+        assert results["fast"].end_time <= results["after_fast"].start_time
+        assert results["after_fast"].end_time < results["slow"].end_time
+
+    def test_process_in_batches(self):
+        """Test that surplus ready tasks are batched onto the available workers."""
+        processor = ParallelProcessor(max_workers=2, use_threads=True, batch_size=4)
+
+        for i in range(8):
+            processor.add_task(f"task{i}", i, lambda x: x * 2)
+        processor.add_task("after", 1, lambda x: x, dependencies={"task0", "task7"})
+
+        results = processor.process_all()
+
+        assert {tid: r.result for tid, r in results.items() if tid != "after"} == {
+            f"task{i}": i * 2 for i in range(8)
+        }
+        assert results["after"].success is True
+        # The two critical-path tasks are popped first and share the first batch
+        assert results["task0"].worker_id == results["task7"].worker_id
+
+    @pytest.mark.parametrize("use_threads", [True, False])
+    def test_process_with_shared_state(self, use_threads):
+        """Test that task inputs are looked up in the shared state by key."""
+        processor = ParallelProcessor(
+            max_workers=2,
+            use_threads=use_threads,
+            shared_state={"small": [1], "large": list(range(1000))},
+        )
+
+        processor.add_task("task1", "small", len)
+        processor.add_task("task2", "large", len, dependencies={"task1"})
+
+        results = processor.process_all()
+
+        assert results["task1"].result == 1
+        assert results["task2"].result == 1000
+
+    def test_single_worker_runs_in_calling_thread(self):
+        """Test that a single worker runs tasks inline in dependency order."""
+        processor = ParallelProcessor(max_workers=1, use_threads=True)
+        progress = []
+
+        processor.add_task("task2", 2, lambda x: x, dependencies={"task1"})
+        processor.add_task("task1", 1, lambda x: x)
+
+        results = processor.process_all(lambda message, value: progress.append(value))
+
+        assert results["task1"].end_time <= results["task2"].start_time
+        assert {r.worker_id for r in results.values()} == {threading.current_thread().name}
+        assert progress == [0.5, 1.0, 1.0]
+
     def test_process_with_error(self):
         """Test processing tasks that raise errors."""
         processor = ParallelProcessor(max_workers=1, use_threads=True)
@@ -247,6 +369,62 @@ class TestParallelProcessor:
         assert results["success_task"].success is True
         assert results["success_task"].result == 6
 
+    @pytest.mark.parametrize("max_workers", [1, 2])
+    def test_dependents_of_failed_task_are_cancelled(self, max_workers):
+        """Test that tasks downstream of a failure are skipped, not run."""
+        processor = ParallelProcessor(max_workers=max_workers, use_threads=True)
+        ran = []
+
+        def failing_processor(x):
+            raise ValueError("Test error")
+
+        processor.add_task("failing", 1, failing_processor)
+        processor.add_task("child", 2, ran.append, dependencies={"failing"})
+        processor.add_task("grandchild", 3, ran.append, dependencies={"child"})
+        processor.add_task("independent", 4, ran.append)
+
+        results = processor.process_all()
+
+        assert ran == [4]
+        assert isinstance(results["child"].error, concurrent.futures.CancelledError)
+        assert "failing" in str(results["child"].error)
+        assert "child" in str(results["grandchild"].error)
+        assert results["independent"].success is True
+
+    def test_dependents_run_when_cancellation_disabled(self):
+        """Test that dependents still run after a failure if requested."""
+        processor = ParallelProcessor(max_workers=2, use_threads=True, cancel_dependents=False)
+
+        def failing_processor(x):
+            raise ValueError("Test error")
+
+        processor.add_task("failing", 1, failing_processor)
+        processor.add_task("child", 2, lambda x: x, dependencies={"failing"})
+
+        results = processor.process_all()
+
+        assert results["child"].result == 2
+
+    def test_fail_fast_stops_remaining_tasks(self):
+        """Test that fail_fast cancels tasks that had not started yet."""
+        processor = ParallelProcessor(max_workers=2, use_threads=True, fail_fast=True)
+
+        def failing_processor(x):
+            raise ValueError("Test error")
+
+        processor.add_task("failing", 1, failing_processor, estimated_duration=10.0)
+        for i in range(6):
+            processor.add_task(f"task{i}", i, lambda x: time.sleep(0.05))
+
+        results = processor.process_all()
+
+        assert len(results) == 7
+        cancelled = [
+            r for r in results.values() if isinstance(r.error, concurrent.futures.CancelledError)
+        ]
+        assert cancelled
+        assert all("failing" in str(r.error) for r in cancelled)
+
     def test_processing_statistics(self):
         """Test processing statistics generation."""
         processor = ParallelProcessor(max_workers=2, use_threads=True)
@@ -268,6 +446,28 @@ class TestParallelProcessor:
         assert stats["total_processing_time"] >= 0  # Allow zero for very fast operations
         assert stats["average_task_time"] >= 0  # Allow zero for very fast operations
         assert len(stats["failed_task_ids"]) == 0
+        assert stats["critical_path_length"] == 1.0
+        assert stats["critical_paths"] == {"task1": 1.0, "task2": 1.0}
+        assert 0 <= stats["queue_wait_time"]["min"] <= stats["queue_wait_time"]["max"]
+
+    def test_queue_wait_recorded_for_waiting_tasks(self):
+        """Test that a task waiting for a free worker reports its queue wait."""
+        processor = ParallelProcessor(max_workers=2, use_threads=True)
+
+        def slow_processor(x):
+            time.sleep(0.05)
+            return x
+
+        for i in range(3):
+            processor.add_task(f"task{i}", i, slow_processor)
+
+        results = processor.process_all()
+
+        assert all(r.submit_time and r.queue_wait >= 0 for r in results.values())
+        # Two tasks start right away, the third is submitted once one of them ends
+        started_last = max(results.values(), key=lambda r: r.start_time)
+        first_end = min(r.end_time for r in results.values())
+        assert started_last.submit_time >= first_end
 
     def test_empty_processing(self):
         """Test processing when no tasks are added."""
@@ -280,6 +480,63 @@ class TestParallelProcessor:
         assert stats["message"] == "No processing results available"
 
 
+class TestAsyncParallelProcessor:
+    """Test AsyncParallelProcessor functionality."""
+
+    @pytest.mark.asyncio
+    async def test_process_sync_and_async_tasks(self):
+        """Test that coroutine and plain processor functions both run in order."""
+        processor = AsyncParallelProcessor(max_workers=2)
+
+        async def async_double(x):
+            await asyncio.sleep(0.01)
+            return x * 2
+
+        processor.add_task("task1", 5, async_double)
+        processor.add_task("task2", 3, lambda x: x + 1, dependencies={"task1"})
+
+        results = await processor.aprocess_all()
+
+        assert results["task1"].result == 10
+        assert results["task2"].result == 4
+        assert results["task1"].end_time <= results["task2"].start_time
+
+    @pytest.mark.asyncio
+    async def test_process_timeout_and_error(self):
+        """Test that timeouts and exceptions are recorded as failed results."""
+        processor = AsyncParallelProcessor(max_workers=2, timeout_per_task=0.05)
+
+        async def hang(x):
+            await asyncio.sleep(10)
+
+        def fail(x):
+            raise ValueError("Test error")
+
+        processor.add_task("slow", 1, hang)
+        processor.add_task("bad", 2, fail)
+
+        results = await processor.aprocess_all()
+
+        assert isinstance(results["slow"].error, TimeoutError)
+        assert isinstance(results["bad"].error, ValueError)
+        assert processor.get_processing_statistics()["failed_tasks"] == 2
+
+    @pytest.mark.asyncio
+    async def test_dependents_of_failed_task_are_cancelled(self):
+        """Test that the async processor skips tasks downstream of a failure."""
+        processor = AsyncParallelProcessor(max_workers=2)
+
+        def fail(x):
+            raise ValueError("Test error")
+
+        processor.add_task("bad", 1, fail)
+        processor.add_task("child", 2, lambda x: x, dependencies={"bad"})
+
+        results = await processor.aprocess_all()
+
+        assert isinstance(results["child"].error, concurrent.futures.CancelledError)
+
+
 class TestModuleDependencyAnalyzer:
     """Test ModuleDependencyAnalyzer functionality."""
 
@@ -400,3 +657,46 @@ class TestModuleDependencyAnalyzer:
         assert dependencies["A"] == {"B"}  # C should be removed as transitive
         assert dependencies["B"] == {"C"}
         assert dependencies["C"] == set()
+
+    @staticmethod
+    def _modules(imports: dict[str, list[str]]) -> list[MagicMock]:
+        modules = []
+        for name, module_imports in imports.items():
+            module = MagicMock()
+            module.name = name
+            module.imports = module_imports
+            modules.append(module)
+        return modules
+
+    def test_transitive_reduction_multiple_hops(self):
+        """Test that dependencies implied through longer chains are removed."""
+        analyzer = ModuleDependencyAnalyzer()
+        modules = self._modules({"A": ["B", "D"], "B": ["C"], "C": ["D"], "D": []})
+
+        dependencies = analyzer.analyze_module_dependencies(modules)
+
+        assert dependencies == {"A": {"B"}, "B": {"C"}, "C": {"D"}, "D": set()}
+
+    def test_transitive_reduction_keeps_cycle_reachability(self):
+        """Test that edges into an import cycle are not all removed."""
+        analyzer = ModuleDependencyAnalyzer()
+        modules = self._modules({"A": ["B", "C"], "B": ["C"], "C": ["B"]})
+
+        dependencies = analyzer.analyze_module_dependencies(modules)
+
+        assert dependencies == {"A": {"B", "C"}, "B": {"C"}, "C": {"B"}}
+
+    def test_imports_resolve_to_longest_module_prefix(self):
+        """Test that dotted imports match the most specific known module."""
+        analyzer = ModuleDependencyAnalyzer()
+        modules = self._modules(
+            {
+                "pkg": [],
+                "pkg.sub": [],
+                "app": ["pkg.sub.helper", "pkg.other", "external.lib"],
+            }
+        )
+
+        dependencies = analyzer.analyze_module_dependencies(modules)
+
+        assert dependencies["app"] == {"pkg.sub", "pkg"}
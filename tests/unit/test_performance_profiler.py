@@ -2,6 +2,8 @@
 
 import json
 import tempfile
+import threading
+import time
 from pathlib import Path
 from unittest.mock import Mock, patch
 
@@ -11,6 +13,9 @@ from utils.performance_profiler import (
     PerformanceMetrics,
     PerformanceProfiler,
     PerformanceReport,
+    _iter_python_file_sizes,
+    _ResourceSampler,
+    _SectionSamples,
     analyze_project_performance,
     get_global_profiler,
     profile_context,
@@ -55,6 +60,11 @@ class TestPerformanceMetrics:
         assert result["has_profile_stats"] is False
         assert result["has_memory_trace"] is False
 
+    def test_uses_slots(self):
+        """Test that metrics and reports carry no per-instance dict."""
+        assert not hasattr(PerformanceMetrics(name="test", duration=1.0), "__dict__")
+        assert not hasattr(PerformanceReport(total_duration=1.0, peak_memory=0), "__dict__")
+
 
 class TestPerformanceReport:
     """Test cases for PerformanceReport."""
@@ -143,6 +153,23 @@ class TestPerformanceReport:
         assert len(report.recommendations) >= 1
         assert any("call counts" in rec.lower() for rec in report.recommendations)
 
+    def test_finalize(self):
+        """Test that finalize derives totals, bottlenecks and recommendations."""
+        report = PerformanceReport(total_duration=0.0, peak_memory=0)
+        report.add_metric(PerformanceMetrics(name="busy", duration=8.0, cpu_percent=90.0))
+        report.add_metric(
+            PerformanceMetrics(name="chatty", duration=2.0, memory_peak=512, calls_count=20000)
+        )
+
+        report.finalize()
+
+        assert report.total_duration == 10.0
+        assert report.peak_memory == 512
+        assert len(report.bottlenecks) == 1
+        assert "busy" in report.bottlenecks[0]
+        assert any("CPU-intensive operations detected: busy." in r for r in report.recommendations)
+        assert any("call counts detected: chatty." in r for r in report.recommendations)
+
     def test_to_dict(self):
         """Test conversion to dictionary."""
         report = PerformanceReport(total_duration=5.0, peak_memory=4096)
@@ -178,20 +205,32 @@ class TestPerformanceProfiler:
         with patch("utils.performance_profiler.tracemalloc") as mock_tracemalloc:
             mock_tracemalloc.is_tracing.return_value = False
 
+            mock_tracemalloc.get_traced_memory.return_value = (1024, 2048)
+
             profiler = PerformanceProfiler(enable_memory_tracing=True)
 
             assert profiler.enable_memory_tracing is True
+            mock_tracemalloc.start.assert_not_called()
+
+            # Tracing only runs while the outermost section is active
+            with profiler.profile_section("outer"):
+                mock_tracemalloc.is_tracing.return_value = True
+                with profiler.profile_section("inner"):
+                    pass
+                mock_tracemalloc.stop.assert_not_called()
+
             mock_tracemalloc.start.assert_called_once()
+            mock_tracemalloc.stop.assert_called_once()
 
     def test_start_profiling(self):
         """Test starting profiling."""
         profiler = PerformanceProfiler(enable_memory_tracing=False)
 
-        with patch("time.time", return_value=1000.0):
+        with patch("time.perf_counter_ns", return_value=1_000_000_000_000):
             profiler.start_profiling("test_operation")
 
         assert "test_operation" in profiler._profiler_stack
-        assert profiler._start_times["test_operation"] == 1000.0
+        assert profiler._start_times["test_operation"] == 1_000_000_000_000
 
     def test_start_profiling_with_memory(self):
         """Test starting profiling with memory tracing."""
@@ -212,17 +251,54 @@ class TestPerformanceProfiler:
         profiler._start_cpu_monitoring = Mock()
         profiler._stop_cpu_monitoring = Mock(return_value=50.0)
 
-        with patch("time.time", side_effect=[1000.0, 1002.5]):
+        with patch("time.perf_counter_ns", side_effect=[1_000_000_000_000, 1_002_500_000_000]):
             profiler.start_profiling("test_operation")
             metrics = profiler.stop_profiling("test_operation")
 
         assert metrics.name == "test_operation"
         assert metrics.duration == 2.5
+        assert metrics.duration_ns == 2_500_000_000
         assert metrics.cpu_percent == 50.0
         assert len(profiler.metrics) == 1
         assert "test_operation" not in profiler._profiler_stack
         assert "test_operation" not in profiler._start_times
 
+    def test_stop_profiling_out_of_order(self):
+        """Test that sections stopped out of order leave the stack consistent."""
+        profiler = PerformanceProfiler(enable_memory_tracing=False)
+
+        for name in ("outer", "middle", "inner"):
+            profiler.start_profiling(name)
+
+        profiler.stop_profiling("middle")
+        assert profiler._profiler_stack == ["outer", "inner"]
+        profiler.stop_profiling("inner")
+        profiler.stop_profiling("outer")
+        assert profiler._profiler_stack == []
+
+    def test_sections_are_tracked_per_thread(self):
+        """Test that threads sharing a profiler keep separate section stacks."""
+        profiler = PerformanceProfiler(enable_memory_tracing=False)
+        barrier = threading.Barrier(4)
+        stacks = {}
+
+        def work(index):
+            name = f"section_{index}"
+            with profiler.profile_section(name):
+                barrier.wait(timeout=5)
+                stacks[index] = list(profiler._profiler_stack)
+                barrier.wait(timeout=5)
+
+        threads = [threading.Thread(target=work, args=(i,)) for i in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert stacks == {i: [f"section_{i}"] for i in range(4)}
+        assert sorted(m.name for m in profiler.metrics) == [f"section_{i}" for i in range(4)]
+        assert profiler._profiler_stack == []
+
     def test_stop_profiling_not_started(self):
         """Test stopping profiling that wasn't started."""
         profiler = PerformanceProfiler(enable_memory_tracing=False)
@@ -245,12 +321,33 @@ class TestPerformanceProfiler:
             profiler._start_cpu_monitoring = Mock()
             profiler._stop_cpu_monitoring = Mock(return_value=25.0)
 
-            with patch("time.time", side_effect=[1000.0, 1001.0]):
+            with patch("time.perf_counter_ns", side_effect=[1_000_000_000_000, 1_001_000_000_000]):
                 profiler.start_profiling("test_operation")
                 metrics = profiler.stop_profiling("test_operation")
 
             assert metrics.memory_current == 2048
-            assert metrics.memory_peak == 1024  # 2048 - 1024 from start
+            assert metrics.memory_peak == 3072  # 4096 peak - 1024 from start
+            mock_tracemalloc.reset_peak.assert_called_once()
+
+    def test_nested_sections_keep_traced_peak(self):
+        """Test that an inner section's peak reset does not hide the outer peak."""
+        with patch("utils.performance_profiler.tracemalloc") as mock_tracemalloc:
+            mock_tracemalloc.is_tracing.return_value = True
+            mock_tracemalloc.get_traced_memory.side_effect = [
+                (1000, 1000),  # outer starts
+                (1500, 9000),  # inner starts after outer peaked at 9000
+                (1600, 2000),  # inner stops
+                (1200, 2000),  # outer stops
+            ]
+
+            profiler = PerformanceProfiler(enable_memory_tracing=True)
+            profiler.start_profiling("outer")
+            profiler.start_profiling("inner")
+            inner = profiler.stop_profiling("inner")
+            outer = profiler.stop_profiling("outer")
+
+        assert inner.memory_peak == 500
+        assert outer.memory_peak == 8000
 
     def test_profile_section_context_manager(self):
         """Test profile_section context manager."""
@@ -258,7 +355,7 @@ class TestPerformanceProfiler:
         profiler._start_cpu_monitoring = Mock()
         profiler._stop_cpu_monitoring = Mock(return_value=30.0)
 
-        with patch("time.time", side_effect=[1000.0, 1001.5]):
+        with patch("time.perf_counter_ns", side_effect=[1_000_000_000_000, 1_001_500_000_000]):
             with profiler.profile_section("test_context"):
                 # Simulate some work
                 pass
@@ -273,7 +370,7 @@ class TestPerformanceProfiler:
         profiler._start_cpu_monitoring = Mock()
         profiler._stop_cpu_monitoring = Mock(return_value=30.0)
 
-        with patch("time.time", side_effect=[1000.0, 1001.0]):
+        with patch("time.perf_counter_ns", side_effect=[1_000_000_000_000, 1_001_000_000_000]):
             with pytest.raises(ValueError):
                 with profiler.profile_section("test_exception"):
                     raise ValueError("Test exception")
@@ -282,6 +379,21 @@ class TestPerformanceProfiler:
         assert len(profiler.metrics) == 1
         assert profiler.metrics[0].name == "test_exception"
 
+    def test_profile_function_calls(self):
+        """Test that cProfile statistics are attached to the section metrics."""
+        profiler = PerformanceProfiler(enable_memory_tracing=False)
+
+        def work(n, offset=0):
+            return sum(abs(i) for i in range(n)) + offset
+
+        stats = profiler.profile_function_calls("work", work, 100, offset=1)
+
+        assert len(profiler.metrics) == 1
+        metric = profiler.metrics[0]
+        assert metric.name == "work"
+        assert metric.profile_stats is stats
+        assert metric.calls_count == stats.total_calls > 100
+
     def test_get_memory_trace_disabled(self):
         """Test getting memory trace when disabled."""
         profiler = PerformanceProfiler(enable_memory_tracing=False)
@@ -301,15 +413,42 @@ class TestPerformanceProfiler:
             mock_stat.traceback.format.return_value = ["file.py:10: function()"]
 
             mock_snapshot = Mock()
+            mock_snapshot.filter_traces.return_value = mock_snapshot
             mock_snapshot.statistics.return_value = [mock_stat]
             mock_tracemalloc.take_snapshot.return_value = mock_snapshot
 
             profiler = PerformanceProfiler(enable_memory_tracing=True)
+            profiler._traced_sections = 1
             result = profiler.get_memory_trace(limit=5)
 
             assert result is not None
             assert len(result) == 1
             assert "1.0 MB" in result[0]
+            mock_snapshot.filter_traces.assert_called_once()
+
+    def test_get_memory_trace_outside_traced_section(self):
+        """Test that external tracing alone does not produce a memory trace."""
+        with patch("utils.performance_profiler.tracemalloc") as mock_tracemalloc:
+            mock_tracemalloc.is_tracing.return_value = True
+            profiler = PerformanceProfiler(enable_memory_tracing=True)
+
+            assert profiler.get_memory_trace() is None
+
+        mock_tracemalloc.take_snapshot.assert_not_called()
+        mock_tracemalloc.is_tracing.assert_not_called()
+
+    def test_get_memory_trace_excludes_import_machinery(self):
+        """Test that memory traces skip import machinery frames."""
+        profiler = PerformanceProfiler(memory_mode="tracemalloc")
+
+        with profiler.profile_section("traced"):
+            data = [str(i) * 10 for i in range(1000)]
+            trace = profiler.get_memory_trace(limit=50)
+
+        assert data
+        assert trace
+        assert len(trace) <= 50
+        assert not any("importlib._bootstrap" in line for line in trace)
 
     def test_generate_report(self):
         """Test generating performance report."""
@@ -325,6 +464,19 @@ class TestPerformanceProfiler:
         assert report.total_duration == 3.0
         assert report.peak_memory == 2048
         assert len(report.metrics) == 2
+        assert profiler.metrics == []
+
+    def test_generate_report_keep_metrics(self):
+        """Test generating a report while keeping the recorded metrics."""
+        profiler = PerformanceProfiler(enable_memory_tracing=False)
+        metrics = [PerformanceMetrics(name="op1", duration=1.0)]
+        profiler.metrics = metrics
+
+        report = profiler.generate_report(keep=True)
+
+        assert report.metrics == metrics
+        assert report.metrics is not profiler.metrics
+        assert profiler.metrics is metrics
 
     def test_generate_report_empty_metrics(self):
         """Test generating report with no metrics."""
@@ -342,10 +494,10 @@ class TestPerformanceProfiler:
 
         # Add some test data
         profiler.metrics = [PerformanceMetrics(name="test", duration=1.0)]
-        profiler._profiler_stack = ["test"]
-        profiler._start_times = {"test": 1000.0}
-        profiler._memory_start = {"test": 1024}
-        profiler._cpu_usage = {"test": [50.0]}
+        profiler._profiler_stack.append("test")
+        profiler._start_times["test"] = 1000
+        profiler._memory_start["test"] = 1024
+        profiler._samples["test"] = _SectionSamples(cpu_total=50.0, cpu_count=1)
 
         profiler.clear_metrics()
 
@@ -353,7 +505,41 @@ class TestPerformanceProfiler:
         assert profiler._profiler_stack == []
         assert profiler._start_times == {}
         assert profiler._memory_start == {}
-        assert profiler._cpu_usage == {}
+        assert profiler._samples == {}
+
+    def test_clear_metrics_keeps_other_threads_tracing(self):
+        """Test clearing releases only the calling thread's traced sections."""
+        profiler = PerformanceProfiler(enable_memory_tracing=True)
+        started = threading.Event()
+        cleared = threading.Event()
+
+        def other_thread():
+            profiler.start_profiling("other")
+            started.set()
+            cleared.wait(timeout=5)
+            profiler.stop_profiling("other")
+
+        with patch("utils.performance_profiler.tracemalloc") as mock_tracemalloc:
+            mock_tracemalloc.is_tracing.return_value = False
+            mock_tracemalloc.get_traced_memory.return_value = (1024, 2048)
+
+            worker = threading.Thread(target=other_thread)
+            worker.start()
+            assert started.wait(timeout=5)
+            profiler.start_profiling("outer")
+            profiler.start_profiling("inner")
+
+            profiler.clear_metrics()
+
+            assert profiler._traced_sections == 1
+            assert list(profiler._traced_peaks) == ["other"]
+            mock_tracemalloc.stop.assert_not_called()
+
+            cleared.set()
+            worker.join()
+
+            assert profiler._traced_sections == 0
+            mock_tracemalloc.stop.assert_called_once()
 
     def test_save_report(self):
         """Test saving performance report."""
@@ -381,10 +567,24 @@ class TestPerformanceProfiler:
             assert saved_data["peak_memory"] == 4096
             assert saved_data["timestamp"] == 1234567890.0
             assert "profiler_config" in saved_data
+            assert saved_data["profiler_config"]["metrics_count"] == 1
 
         finally:
             temp_path.unlink(missing_ok=True)
 
+    def test_save_generated_report_counts_metrics(self, tmp_path):
+        """Test that a report moved out of the profiler still records its metric count."""
+        profiler = PerformanceProfiler(enable_memory_tracing=False)
+        profiler.metrics.extend(
+            [PerformanceMetrics(name="a", duration=1.0), PerformanceMetrics(name="b", duration=2.0)]
+        )
+
+        report = profiler.generate_report()
+        profiler.save_report(report, tmp_path / "report.json")
+
+        saved_data = json.loads((tmp_path / "report.json").read_text())
+        assert saved_data["profiler_config"]["metrics_count"] == 2
+
 
 class TestDecoratorsAndHelpers:
     """Test cases for decorators and helper functions."""
@@ -399,7 +599,7 @@ class TestDecoratorsAndHelpers:
         def test_function(x, y):
             return x + y
 
-        with patch("time.time", side_effect=[1000.0, 1001.0]):
+        with patch("time.perf_counter_ns", side_effect=[1_000_000_000_000, 1_001_000_000_000]):
             result = test_function(2, 3)
 
         assert result == 5
@@ -413,16 +613,30 @@ class TestDecoratorsAndHelpers:
         def test_function(x):
             return x * 2
 
-        with patch("utils.performance_profiler.PerformanceProfiler") as mock_profiler_class:
+        with patch("utils.performance_profiler.get_global_profiler") as mock_get_global:
             mock_profiler = Mock()
-            mock_profiler.profile_section.return_value.__enter__ = Mock()
-            mock_profiler.profile_section.return_value.__exit__ = Mock()
-            mock_profiler_class.return_value = mock_profiler
+            mock_get_global.return_value = mock_profiler
 
             result = test_function(5)
 
         assert result == 10
-        mock_profiler_class.assert_called_once()
+        mock_get_global.assert_called_once()
+        mock_profiler.start_profiling.assert_called_once_with("test_func:test_function")
+        mock_profiler.stop_profiling.assert_called_once_with("test_func:test_function")
+
+    def test_profile_performance_decorator_stops_on_error(self):
+        """Test that the decorator closes its section when the function raises."""
+        profiler = PerformanceProfiler(enable_memory_tracing=False)
+
+        @profile_performance("test_func", profiler)
+        def failing_function():
+            raise ValueError("boom")
+
+        with pytest.raises(ValueError, match="boom"):
+            failing_function()
+
+        assert [m.name for m in profiler.metrics] == ["test_func:failing_function"]
+        assert profiler._profiler_stack == []
 
     def test_get_global_profiler(self):
         """Test getting global profiler instance."""
@@ -441,8 +655,6 @@ class TestDecoratorsAndHelpers:
         """Test profile_critical_path decorator."""
         with patch("utils.performance_profiler.get_global_profiler") as mock_get_global:
             mock_profiler = Mock()
-            mock_profiler.profile_section.return_value.__enter__ = Mock()
-            mock_profiler.profile_section.return_value.__exit__ = Mock()
             mock_get_global.return_value = mock_profiler
 
             @profile_critical_path("critical_section")
@@ -453,6 +665,8 @@ class TestDecoratorsAndHelpers:
 
         assert result == "critical_result"
         mock_get_global.assert_called_once()
+        mock_profiler.start_profiling.assert_called_once_with("critical_section:critical_function")
+        mock_profiler.stop_profiling.assert_called_once_with("critical_section:critical_function")
 
     def test_profile_context_manager(self):
         """Test profile_context context manager."""
@@ -490,6 +704,20 @@ class TestDecoratorsAndHelpers:
             mock_profiler.profile_section.assert_called_once_with("project_analysis")
             mock_profiler.generate_report.assert_called_once()
 
+    def test_iter_python_file_sizes(self):
+        """Test the scandir walk over nested Python files."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            project_path = Path(temp_dir)
+            (project_path / "pkg" / "sub").mkdir(parents=True)
+            (project_path / "top.py").write_text("a" * 3)
+            (project_path / "pkg" / "inner.py").write_text("b" * 5)
+            (project_path / "pkg" / "sub" / "deep.py").write_text("c" * 7)
+            (project_path / "pkg" / "notes.txt").write_text("ignored")
+
+            sizes = _iter_python_file_sizes(str(project_path))
+
+            assert sorted(sizes) == [3, 5, 7]
+
 
 class TestCPUMonitoring:
     """Test cases for CPU monitoring functionality."""
@@ -497,33 +725,99 @@ class TestCPUMonitoring:
     def test_start_stop_cpu_monitoring(self):
         """Test CPU monitoring start and stop."""
         profiler = PerformanceProfiler(enable_memory_tracing=False)
+        sampler = Mock()
 
-        with (
-            patch("utils.performance_profiler.psutil.Process") as mock_process_class,
-            patch("threading.Thread") as mock_thread_class,
-        ):
-            mock_process = Mock()
-            mock_process.cpu_percent.return_value = 75.0
-            mock_process_class.return_value = mock_process
-
-            mock_thread = Mock()
-            mock_thread_class.return_value = mock_thread
-
+        with patch("utils.performance_profiler._sampler", sampler):
             # Start monitoring
             profiler._start_cpu_monitoring("test_op")
 
-            assert "test_op" in profiler._cpu_usage
-            mock_thread_class.assert_called_once()
-            mock_thread.start.assert_called_once()
+            samples = profiler._samples["test_op"]
+            sampler.add.assert_called_once_with(samples)
 
             # Simulate some CPU readings
-            profiler._cpu_usage["test_op"] = [70.0, 75.0, 80.0]
+            samples.cpu_total = 70.0 + 75.0 + 80.0
+            samples.cpu_count = 3
 
             # Stop monitoring
             avg_cpu = profiler._stop_cpu_monitoring("test_op")
 
-            assert avg_cpu == 75.0  # (70 + 75 + 80) / 3
-            assert "test_op" not in profiler._cpu_usage
+        assert avg_cpu == 75.0  # (70 + 75 + 80) / 3
+        assert "test_op" not in profiler._samples
+        sampler.discard.assert_called_once_with(samples)
+
+    def test_nested_sections_share_one_sampler_thread(self):
+        """Test that nested sections are sampled by a single sampler thread."""
+        sampler = _ResourceSampler(interval=0.01)
+        profiler = PerformanceProfiler(enable_memory_tracing=False)
+
+        with (
+            patch("utils.performance_profiler._sampler", sampler),
+            patch("utils.performance_profiler.psutil.Process") as mock_process_class,
+        ):
+            mock_process_class.return_value.cpu_percent.return_value = 40.0
+
+            with profiler.profile_section("outer"):
+                thread = sampler._thread
+                with profiler.profile_section("inner"):
+                    deadline = time.monotonic() + 5
+                    inner = profiler._samples["inner"]
+                    while not inner.cpu_count and time.monotonic() < deadline:
+                        time.sleep(0.01)
+                    assert sampler._thread is thread
+
+            sampler.stop()
+
+        assert {m.name: m.cpu_percent for m in profiler.metrics} == {
+            "inner": 40.0,
+            "outer": 40.0,
+        }
+        assert sampler._active == {}
+
+    def test_sampler_idles_without_sections(self):
+        """Test that the sampler stops reading CPU usage once no section is active."""
+        sampler = _ResourceSampler(interval=0.01)
+        samples = _SectionSamples()
+
+        with patch("utils.performance_profiler.psutil.Process") as mock_process_class:
+            cpu_percent = mock_process_class.return_value.cpu_percent
+            cpu_percent.return_value = 10.0
+
+            sampler.add(samples)
+            deadline = time.monotonic() + 5
+            while not samples.cpu_count and time.monotonic() < deadline:
+                time.sleep(0.01)
+            sampler.discard(samples)
+
+            time.sleep(0.05)
+            idle_calls = cpu_percent.call_count
+            time.sleep(0.1)
+            assert cpu_percent.call_count == idle_calls
+            assert sampler._thread.is_alive()
+
+            sampler.stop()
+
+        assert not sampler._thread.is_alive()
+
+    def test_rss_mode_reports_sampled_peak(self):
+        """Test that RSS mode measures memory without starting tracemalloc."""
+        sampler = Mock()
+        sampler.process.memory_info.side_effect = [Mock(rss=1000), Mock(rss=1500)]
+
+        with (
+            patch("utils.performance_profiler._sampler", sampler),
+            patch("utils.performance_profiler.tracemalloc") as mock_tracemalloc,
+        ):
+            mock_tracemalloc.is_tracing.return_value = False
+            profiler = PerformanceProfiler()
+
+            profiler.start_profiling("test_op")
+            profiler._samples["test_op"].peak_rss = 4000
+            metrics = profiler.stop_profiling("test_op")
+
+        mock_tracemalloc.start.assert_not_called()
+        assert profiler.memory_mode == "rss"
+        assert metrics.memory_current == 1500
+        assert metrics.memory_peak == 3000
 
     def test_stop_cpu_monitoring_no_readings(self):
         """Test stopping CPU monitoring with no readings."""
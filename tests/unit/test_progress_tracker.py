@@ -1,6 +1,11 @@
 """Tests for progress tracking functionality."""
 
 # Remove unused import time
+import gc
+import inspect
+import sys
+import threading
+import weakref
 from unittest.mock import Mock, patch
 
 import pytest
@@ -10,6 +15,9 @@ from utils.progress_tracker import (
     ProgressInfo,
     ProgressStatus,
     ProgressTracker,
+    _ReadWriteLock,
+    _render_bar,
+    batched_increments,
     get_global_tracker,
     track_operation,
     track_progress,
@@ -113,6 +121,14 @@ class TestProgressInfo:
         assert result["is_complete"] is False
         assert result["is_running"] is True
 
+    def test_uses_slots(self):
+        """Test that progress info does not carry a per-instance __dict__."""
+        progress = ProgressInfo(name="test")
+
+        assert not hasattr(progress, "__dict__")
+        with pytest.raises(AttributeError):
+            progress.unknown_field = 1
+
 
 class TestProgressTracker:
     """Test cases for ProgressTracker."""
@@ -122,7 +138,7 @@ class TestProgressTracker:
         tracker = ProgressTracker()
 
         assert tracker._operations == {}
-        assert tracker._update_callbacks == []
+        assert tracker._update_callbacks == ()
 
     def test_start_operation(self):
         """Test starting an operation."""
@@ -147,6 +163,19 @@ class TestProgressTracker:
         assert "test_op" in tracker._operations
         assert tracker._operations["test_op"] is progress
 
+    def test_start_operation_interns_names(self):
+        """Test that operation and parent names are interned when stored."""
+        tracker = ProgressTracker()
+        parent_name = "".join(["par", "ent"])
+        child_name = "".join(["chi", "ld"])
+
+        tracker.start_operation(parent_name)
+        child = tracker.start_operation(child_name, parent="".join(["par", "ent"]))
+
+        assert child.name is sys.intern(child_name)
+        assert child.parent is sys.intern(parent_name)
+        assert tracker._operations["parent"].children[0] is sys.intern(child_name)
+
     def test_start_operation_duplicate_name(self):
         """Test starting operation with duplicate name."""
         tracker = ProgressTracker()
@@ -170,7 +199,7 @@ class TestProgressTracker:
         """Test updating progress with current value."""
         tracker = ProgressTracker()
 
-        with patch("time.time", side_effect=[1000.0, 1005.0]):
+        with patch("time.monotonic", side_effect=[1000.0, 1005.0]):
             tracker.start_operation("test_op", total=100)
             progress = tracker.update_progress("test_op", current=25, message="25% done")
 
@@ -178,6 +207,23 @@ class TestProgressTracker:
         assert progress.message == "25% done"
         assert progress.elapsed_time == 5.0
 
+    def test_elapsed_time_ignores_wall_clock_jumps(self):
+        """Test that elapsed time is measured on the monotonic clock."""
+        tracker = ProgressTracker()
+
+        with (
+            patch("time.time", side_effect=[1000.0, 900.0]),
+            patch("time.monotonic", side_effect=[50.0, 52.0, 53.0]),
+        ):
+            tracker.start_operation("test_op", total=10)
+            progress = tracker.update_progress("test_op", increment=1)
+            assert progress.elapsed_time == 2.0
+            progress = tracker.complete_operation("test_op")
+
+        assert progress.start_time == 1000.0
+        assert progress.end_time == 900.0
+        assert progress.elapsed_time == 3.0
+
     def test_update_progress_increment(self):
         """Test updating progress with increment."""
         tracker = ProgressTracker()
@@ -188,6 +234,82 @@ class TestProgressTracker:
 
         assert progress.current == 25
 
+    def test_concurrent_increments(self):
+        """Test that increments from many threads are all counted."""
+        tracker = ProgressTracker()
+        tracker.start_operation("test_op", total=4000)
+
+        def work():
+            for _ in range(1000):
+                tracker.update_progress("test_op", increment=1)
+
+        threads = [threading.Thread(target=work) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert tracker.get_operation("test_op").current == 4000
+
+    def test_single_writer_skips_locks(self):
+        """Test that the owner of a single-writer operation updates without locking."""
+        tracker = ProgressTracker()
+        progress = tracker.start_operation("test_op", total=10, single_writer=True)
+        progress._lock = Mock(side_effect=AssertionError("lock used"))
+        tracker._lock = Mock(side_effect=AssertionError("lock used"))
+
+        tracker.update_progress("test_op", increment=3, message="Working")
+
+        assert progress.current == 3
+        assert progress.message == "Working"
+
+    def test_single_writer_other_thread_uses_locks(self):
+        """Test that updates from other threads still take the locking path."""
+        tracker = ProgressTracker()
+        tracker.start_operation("test_op", total=10, single_writer=True)
+
+        worker = threading.Thread(
+            target=tracker.update_progress, args=("test_op",), kwargs={"increment": 4}
+        )
+        worker.start()
+        worker.join()
+        tracker.update_progress("test_op", increment=1)
+
+        assert tracker.get_operation("test_op").current == 5
+
+    def test_increment_nonexistent(self):
+        """Test incrementing a nonexistent operation."""
+        tracker = ProgressTracker()
+
+        with pytest.raises(KeyError, match="Operation 'nonexistent' not found"):
+            tracker.update_progress("nonexistent", increment=1)
+
+    def test_update_batch(self):
+        """Test incrementing several operations in one batch."""
+        tracker = ProgressTracker()
+        tracker.start_operation("op1", total=10)
+        tracker.start_operation("op2", total=10)
+        callback = Mock()
+        tracker.add_update_callback(callback)
+
+        updated = tracker.update_batch({"op1": 3, "op2": 5}, message="batched")
+
+        assert updated["op1"].current == 3
+        assert updated["op2"].current == 5
+        assert updated["op2"].message == "batched"
+        assert callback.call_count == 2
+        assert tracker.get_summary()["completed_items"] == 8
+
+    def test_update_batch_nonexistent(self):
+        """Test that a batch naming a missing operation updates nothing."""
+        tracker = ProgressTracker()
+        tracker.start_operation("op1", total=10)
+
+        with pytest.raises(KeyError, match="Operation 'missing' not found"):
+            tracker.update_batch({"op1": 3, "missing": 1})
+
+        assert tracker.get_operation("op1").current == 0
+
     def test_update_progress_with_metadata(self):
         """Test updating progress with metadata."""
         tracker = ProgressTracker()
@@ -209,7 +331,7 @@ class TestProgressTracker:
         """Test time estimation during progress update."""
         tracker = ProgressTracker()
 
-        with patch("time.time", side_effect=[1000.0, 1010.0]):
+        with patch("time.monotonic", side_effect=[1000.0, 1010.0]):
             tracker.start_operation("test_op", total=100)
             progress = tracker.update_progress("test_op", current=20)
 
@@ -221,7 +343,10 @@ class TestProgressTracker:
         """Test completing an operation."""
         tracker = ProgressTracker()
 
-        with patch("time.time", side_effect=[1000.0, 1015.0]):
+        with (
+            patch("time.time", side_effect=[1000.0, 1015.0]),
+            patch("time.monotonic", side_effect=[50.0, 65.0]),
+        ):
             tracker.start_operation("test_op", total=100)
             progress = tracker.complete_operation("test_op", ProgressStatus.COMPLETED, "Finished!")
 
@@ -283,6 +408,21 @@ class TestProgressTracker:
         assert "op1" in all_ops
         assert "op2" in all_ops
 
+    def test_get_all_percentages(self):
+        """Test bulk percentages match each operation's progress_percentage."""
+        tracker = ProgressTracker()
+        tracker.start_operation("half", total=10)
+        tracker.start_operation("over", total=4)
+        tracker.start_operation("indeterminate")
+        tracker.update_progress("half", current=5)
+        tracker.update_progress("over", current=9)
+
+        percentages = tracker.get_all_percentages()
+
+        assert percentages == {"half": 50.0, "over": 100.0, "indeterminate": 0.0}
+        for name, progress in tracker.get_all_operations().items():
+            assert percentages[name] == progress.progress_percentage
+
     def test_get_active_operations(self):
         """Test getting only active operations."""
         tracker = ProgressTracker()
@@ -325,6 +465,21 @@ class TestProgressTracker:
         assert "child1" in tree["children"]
         assert "child2" in tree["children"]
 
+    def test_get_operation_tree_deep(self):
+        """Test building a tree deeper than the recursion limit."""
+        tracker = ProgressTracker()
+        depth = sys.getrecursionlimit() + 100
+        tracker.start_operation("op0")
+        for i in range(1, depth):
+            tracker.start_operation(f"op{i}", parent=f"op{i - 1}")
+
+        node = tracker.get_operation_tree("op0")
+
+        for i in range(1, depth):
+            node = node["children"][f"op{i}"]
+        assert node["name"] == f"op{depth - 1}"
+        assert node["children"] == {}
+
     def test_get_operation_tree_nonexistent(self):
         """Test getting tree for nonexistent operation."""
         tracker = ProgressTracker()
@@ -356,6 +511,141 @@ class TestProgressTracker:
         callback1.assert_not_called()
         callback2.assert_called_once()
 
+    def test_callbacks_run_outside_lock(self):
+        """Test that a blocked callback does not hold up other threads' tracker calls."""
+        tracker = ProgressTracker()
+        tracker.start_operation("other", total=10)
+        release = threading.Event()
+        entered = threading.Event()
+
+        def slow_callback(name, _):
+            if name == "slow_op":
+                entered.set()
+                release.wait(timeout=5)
+
+        tracker.add_update_callback(slow_callback)
+        thread = threading.Thread(target=tracker.start_operation, args=("slow_op",))
+        thread.start()
+        try:
+            assert entered.wait(timeout=5)
+            tracker.update_progress("other", current=5, message="still responsive")
+            assert tracker.get_summary()["total_operations"] == 2
+        finally:
+            release.set()
+            thread.join()
+
+    def test_background_callbacks(self):
+        """Test that background mode runs callbacks on the callback thread."""
+        tracker = ProgressTracker(background_callbacks=True)
+        calls = []
+        tracker.add_update_callback(
+            lambda name, progress: calls.append(
+                (name, progress.current, threading.current_thread().name)
+            )
+        )
+
+        tracker.start_operation("test_op", total=10)
+        tracker.update_progress("test_op", increment=1)
+        tracker.close()
+
+        assert calls
+        assert calls[-1] == ("test_op", 1, "progress-callbacks")
+        assert all(thread_name == "progress-callbacks" for _, _, thread_name in calls)
+
+    def test_background_callbacks_coalesce(self):
+        """Test that updates to a pending operation merge instead of queueing."""
+        tracker = ProgressTracker(background_callbacks=True)
+        entered = threading.Event()
+        release = threading.Event()
+        seen = []
+
+        def callback(name, progress):
+            if name == "blocker":
+                entered.set()
+                release.wait(timeout=5)
+            seen.append((name, progress.current))
+
+        tracker.add_update_callback(callback)
+        tracker.start_operation("blocker")
+        assert entered.wait(timeout=5)
+
+        # The callback thread is busy, so these must neither block nor pile up
+        tracker.start_operation("op", total=100)
+        for _ in range(100):
+            tracker.update_progress("op", increment=1)
+        assert list(tracker._pending) == ["op"]
+
+        release.set()
+        tracker.close()
+
+        assert seen == [("blocker", 0), ("op", 100)]
+
+    def test_close_during_updates(self):
+        """Test that closing while other threads update loses no final state."""
+        tracker = ProgressTracker(background_callbacks=True)
+        seen = []
+        tracker.add_update_callback(lambda name, progress: seen.append(progress.current))
+        tracker.start_operation("op", total=800)
+
+        def work():
+            for _ in range(200):
+                tracker.update_progress("op", increment=1)
+
+        workers = [threading.Thread(target=work) for _ in range(4)]
+        for worker in workers:
+            worker.start()
+        tracker.close()
+        for worker in workers:
+            worker.join()
+        tracker.close()
+
+        assert tracker._pending == {}
+        assert max(seen) == 800
+
+        tracker.update_progress("op", increment=1)
+        assert seen[-1] == 801
+
+    def test_weak_callback(self):
+        """Test that a weakly held bound method does not keep its object alive."""
+
+        class Observer:
+            def __init__(self):
+                self.names = []
+
+            def on_update(self, name, _):
+                self.names.append(name)
+
+        tracker = ProgressTracker()
+        observer = Observer()
+        tracker.add_update_callback(observer.on_update, weak=True)
+
+        tracker.start_operation("op1")
+        assert observer.names == ["op1"]
+
+        observer_ref = weakref.ref(observer)
+        del observer
+        gc.collect()
+        assert observer_ref() is None
+
+        tracker.start_operation("op2")
+        tracker.add_update_callback(Mock())
+        assert len(tracker._update_callbacks) == 1
+
+    def test_remove_weak_callback(self):
+        """Test removing a weakly held bound method."""
+
+        class Observer:
+            def on_update(self, name, _):
+                pass
+
+        tracker = ProgressTracker()
+        observer = Observer()
+        tracker.add_update_callback(observer.on_update, weak=True)
+
+        tracker.remove_update_callback(observer.on_update)
+
+        assert tracker._update_callbacks == ()
+
     def test_callback_error_handling(self):
         """Test handling of callback errors."""
         tracker = ProgressTracker()
@@ -401,6 +691,20 @@ class TestProgressTracker:
         parent = remaining_ops["parent_op"]
         assert "child_op" not in parent.children
 
+    def test_clear_completed_many_siblings(self):
+        """Test clearing completed children keeps the running siblings in order."""
+        tracker = ProgressTracker()
+        tracker.start_operation("parent")
+        for i in range(10):
+            tracker.start_operation(f"child{i}", parent="parent")
+            if i % 2:
+                tracker.complete_operation(f"child{i}")
+
+        removed = tracker.clear_completed()
+
+        assert removed == 5
+        assert tracker.get_operation("parent").children == [f"child{i}" for i in range(0, 10, 2)]
+
     def test_cancel_operation(self):
         """Test cancelling an operation."""
         tracker = ProgressTracker()
@@ -494,6 +798,21 @@ class TestContextManagerAndDecorators:
         assert progress.status == ProgressStatus.FAILED
         assert "Test error" in progress.message
 
+    def test_batched_increments(self):
+        """Test that batched increments reach the tracker in coalesced updates."""
+        tracker = ProgressTracker()
+        tracker.start_operation("files", total=250)
+        callback = Mock()
+        tracker.add_update_callback(callback)
+
+        with batched_increments(tracker, "files", flush_every=100) as advance:
+            for _ in range(250):
+                advance()
+            assert tracker.get_operation("files").current == 200
+
+        assert tracker.get_operation("files").current == 250
+        assert callback.call_count == 3
+
     def test_track_operation_decorator(self):
         """Test track_operation decorator."""
         tracker = ProgressTracker()
@@ -509,6 +828,39 @@ class TestContextManagerAndDecorators:
         assert progress is not None
         assert progress.status == ProgressStatus.COMPLETED
 
+    @pytest.mark.asyncio
+    async def test_track_operation_decorator_async(self):
+        """Test track_operation decorator on a coroutine function."""
+        tracker = ProgressTracker()
+
+        @track_operation("async_function", total=3, tracker=tracker)
+        async def async_function(x):
+            progress = tracker.get_operation("async_function")
+            assert progress is not None and progress.is_running
+            return x * 2
+
+        assert inspect.iscoroutinefunction(async_function)
+        assert async_function.__name__ == "async_function"
+
+        result = await async_function(4)
+
+        assert result == 8
+        assert tracker.get_operation("async_function").status == ProgressStatus.COMPLETED
+
+    @pytest.mark.asyncio
+    async def test_track_operation_decorator_async_failure(self):
+        """Test that a failing coroutine marks its operation as failed."""
+        tracker = ProgressTracker()
+
+        @track_operation("async_failure", tracker=tracker)
+        async def async_failure():
+            raise ValueError("Async error")
+
+        with pytest.raises(ValueError, match="Async error"):
+            await async_failure()
+
+        assert tracker.get_operation("async_failure").status == ProgressStatus.FAILED
+
     def test_track_operation_decorator_global_tracker(self):
         """Test track_operation decorator with global tracker."""
         # Clear global tracker
@@ -544,6 +896,73 @@ class TestContextManagerAndDecorators:
         assert isinstance(tracker1, ProgressTracker)
 
 
+class TestReadWriteLock:
+    """Test cases for the tracker's reader-writer lock."""
+
+    def test_readers_do_not_block_each_other(self):
+        """Test that a second reader enters while the first holds the lock."""
+        lock = _ReadWriteLock()
+        entered = threading.Event()
+
+        def reader():
+            with lock.read():
+                entered.set()
+
+        with lock.read():
+            thread = threading.Thread(target=reader)
+            thread.start()
+            assert entered.wait(timeout=5)
+        thread.join()
+
+    def test_writer_waits_for_readers(self):
+        """Test that a writer only enters once the readers have left."""
+        lock = _ReadWriteLock()
+        written = threading.Event()
+
+        def writer():
+            with lock.write():
+                written.set()
+
+        with lock.read():
+            thread = threading.Thread(target=writer)
+            thread.start()
+            assert not written.wait(timeout=0.05)
+        assert written.wait(timeout=5)
+        thread.join()
+
+    def test_writer_can_reenter_and_read(self):
+        """Test that the writing thread can take the lock again for either side."""
+        lock = _ReadWriteLock()
+
+        with lock.write():
+            with lock.write():
+                with lock.read():
+                    pass
+
+        with lock.read():
+            with lock.read():
+                pass
+
+    def test_upgrade_raises(self):
+        """Test that upgrading a read lock to a write lock is refused."""
+        lock = _ReadWriteLock()
+
+        with lock.read():
+            with pytest.raises(RuntimeError, match="Cannot upgrade"):
+                with lock.write():
+                    pass
+
+    def test_callback_can_query_tracker(self):
+        """Test that callbacks run under the write lock can read tracker state."""
+        tracker = ProgressTracker()
+        seen = []
+        tracker.add_update_callback(lambda name, _: seen.append(tracker.get_summary()))
+
+        tracker.start_operation("test_op", total=10)
+
+        assert seen[0]["running_operations"] == 1
+
+
 class TestProgressFormatter:
     """Test cases for ProgressFormatter."""
 
@@ -577,6 +996,14 @@ class TestProgressFormatter:
         assert "#" * 5 in bar
         assert "-" * 5 in bar
 
+    def test_format_progress_bar_reuses_rendered_bar(self):
+        """Test that bars at the same fill level share one rendered string."""
+        first = ProgressFormatter.format_progress_bar(ProgressInfo(name="a", total=100, current=50))
+        second = ProgressFormatter.format_progress_bar(ProgressInfo(name="b", total=10, current=5))
+
+        assert first == second
+        assert _render_bar(20, 40, "█", "░") is _render_bar(20, 40, "█", "░")
+
     def test_format_time_estimate_with_remaining(self):
         """Test formatting time estimate with remaining time."""
         progress = ProgressInfo(name="test", elapsed_time=10.5, estimated_remaining=5.2)
@@ -7,14 +7,39 @@ documentation builds, improving performance for large projects.
 import hashlib
 import json
 import logging
+import os
 import time
+from collections import defaultdict
+from collections.abc import Iterable
 from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any
 
+try:
+    import orjson
+
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
 
+def _dumps_state(data: dict[str, Any]) -> bytes:
+    """Serialize build state to JSON bytes, using orjson when available."""
+    if HAS_ORJSON:
+        return orjson.dumps(data)
+    return json.dumps(data, separators=(",", ":")).encode("utf-8")
+
+
+def _loads_state(raw: bytes) -> dict[str, Any]:
+    """Deserialize build state from JSON bytes, using orjson when available."""
+    if HAS_ORJSON:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
 @dataclass
 class FileState:
     """Represents the state of a file for change detection."""
@@ -36,6 +61,7 @@ class BuildState:
     dependencies: dict[str, list[str]] = field(default_factory=dict)
     outputs: dict[str, list[str]] = field(default_factory=dict)  # source -> generated files
     build_version: str = "1.0"
+    tree_fingerprint: str = ""  # hash of (path, mtime, size) for all sources at last build
 
 
 class IncrementalBuildManager:
@@ -51,7 +77,9 @@ class IncrementalBuildManager:
         self.project_path = Path(project_path)
         self.build_cache_file = self.project_path / build_cache_file
         self.build_state = BuildState(project_path=str(project_path))
+        self._reverse_dependencies: dict[str, set[str]] = {}
         self._load_build_state()
+        self._rebuild_reverse_dependencies()
 
         logger.info(f"Initialized incremental build manager for: {project_path}")
 
@@ -62,8 +90,7 @@ class IncrementalBuildManager:
             return
 
         try:
-            with open(self.build_cache_file, encoding="utf-8") as f:
-                data = json.load(f)
+            data = _loads_state(self.build_cache_file.read_bytes())
 
             self.build_state = BuildState(
                 project_path=data["project_path"],
@@ -75,6 +102,7 @@ class IncrementalBuildManager:
                 },
                 dependencies=data.get("dependencies", {}),
                 outputs=data.get("outputs", {}),
+                tree_fingerprint=data.get("tree_fingerprint", ""),
             )
 
             logger.info(f"Loaded build state with {len(self.build_state.files)} tracked files")
@@ -83,6 +111,14 @@ class IncrementalBuildManager:
             logger.warning(f"Failed to load build state: {e}")
             self.build_state = BuildState(project_path=str(self.project_path))
 
+    def _rebuild_reverse_dependencies(self) -> None:
+        """Rebuild the dependency -> dependents index from the forward dependencies."""
+        reverse_dependencies: defaultdict[str, set[str]] = defaultdict(set)
+        for file_path, deps in self.build_state.dependencies.items():
+            for dep in deps:
+                reverse_dependencies[dep].add(file_path)
+        self._reverse_dependencies = dict(reverse_dependencies)
+
     def _save_build_state(self) -> None:
         """Save build state to cache file."""
         try:
@@ -102,10 +138,10 @@ class IncrementalBuildManager:
                 },
                 "dependencies": self.build_state.dependencies,
                 "outputs": self.build_state.outputs,
+                "tree_fingerprint": self.build_state.tree_fingerprint,
             }
 
-            with open(self.build_cache_file, "w", encoding="utf-8") as f:
-                json.dump(data, f, indent=2)
+            self.build_cache_file.write_bytes(_dumps_state(data))
 
             logger.debug(f"Saved build state with {len(self.build_state.files)} files")
 
@@ -120,13 +156,18 @@ class IncrementalBuildManager:
         except Exception:
             return ""
 
-    def _get_current_file_state(self, file_path: Path) -> FileState | None:
-        """Get current state of a file."""
-        if not file_path.exists():
-            return None
+    def _get_current_file_state(
+        self, file_path: Path, stat: os.stat_result | None = None
+    ) -> FileState | None:
+        """Get current state of a file.
 
+        Args:
+            file_path: Path to the file
+            stat: Stat result already obtained for the file, if available
+        """
         try:
-            stat = file_path.stat()
+            if stat is None:
+                stat = file_path.stat()
             return FileState(
                 path=str(file_path),
                 size=stat.st_size,
@@ -136,17 +177,18 @@ class IncrementalBuildManager:
         except Exception:
             return None
 
-    def is_file_changed(self, file_path: Path) -> bool:
+    def is_file_changed(self, file_path: Path, stat: os.stat_result | None = None) -> bool:
         """Check if a file has changed since last build.
 
         Args:
             file_path: Path to the file to check
+            stat: Stat result already obtained for the file, if available
 
         Returns:
             True if file has changed or is new, False otherwise
         """
         file_key = str(file_path)
-        current_state = self._get_current_file_state(file_path)
+        current_state = self._get_current_file_state(file_path, stat)
 
         if not current_state:
             # File doesn't exist now, but might have been tracked before
@@ -165,25 +207,33 @@ class IncrementalBuildManager:
             or current_state.hash != previous_state.hash
         )
 
-    def get_changed_files(self, file_paths: list[Path]) -> set[Path]:
+    def get_changed_files(
+        self,
+        file_paths: list[Path],
+        stat_map: dict[Path, os.stat_result] | None = None,
+    ) -> set[Path]:
         """Get list of files that have changed since last build.
 
         Args:
             file_paths: List of files to check
+            stat_map: Stat results already collected for the files, used to avoid
+                stat-ing them again
 
         Returns:
             Set of changed file paths
         """
         changed_files = set()
+        stat_map = stat_map or {}
 
         for file_path in file_paths:
-            if self.is_file_changed(file_path):
+            if self.is_file_changed(file_path, stat_map.get(file_path)):
                 changed_files.add(file_path)
 
         # Also check for deleted files
         for tracked_path in self.build_state.files:
-            if not Path(tracked_path).exists():
-                changed_files.add(Path(tracked_path))
+            path = Path(tracked_path)
+            if path not in stat_map and not path.exists():
+                changed_files.add(path)
 
         logger.info(f"Found {len(changed_files)} changed files out of {len(file_paths)} total")
         return changed_files
@@ -197,26 +247,36 @@ class IncrementalBuildManager:
         Returns:
             Set of files that depend on the changed file
         """
-        dependent_files = set()
-        changed_key = str(changed_file)
+        dependents = self._reverse_dependencies.get(str(changed_file), ())
+        return {Path(file_path) for file_path in dependents}
 
-        # Find files that import or depend on the changed file
-        for file_path, deps in self.build_state.dependencies.items():
-            if changed_key in deps:
-                dependent_files.add(Path(file_path))
+    def get_dependent_files_for(self, changed_files: Iterable[Path]) -> set[Path]:
+        """Get files that depend on any of the changed files.
+
+        Args:
+            changed_files: Paths of the files that changed
 
-        return dependent_files
+        Returns:
+            Set of files that depend on at least one of the changed files
+        """
+        reverse_dependencies = self._reverse_dependencies
+        dependents: set[str] = set()
+        for changed_file in changed_files:
+            dependents.update(reverse_dependencies.get(str(changed_file), ()))
+        return {Path(file_path) for file_path in dependents}
 
     def mark_files_built(
         self,
         file_paths: list[Path],
         generated_files: dict[str, list[str]] | None = None,
+        tree_fingerprint: str | None = None,
     ) -> None:
         """Mark files as built and update their state.
 
         Args:
             file_paths: List of files that were built
             generated_files: Dictionary mapping source files to generated output files
+            tree_fingerprint: Fingerprint of the source tree the build was made from
         """
         current_time = time.time()
         generated_files = generated_files or {}
@@ -238,6 +298,29 @@ class IncrementalBuildManager:
         for source_file, outputs in generated_files.items():
             self.build_state.outputs[source_file] = outputs
 
+        if tree_fingerprint is not None:
+            self.build_state.tree_fingerprint = tree_fingerprint
+
+        self._save_build_state()
+
+    def matches_tree_fingerprint(self, tree_fingerprint: str) -> bool:
+        """Check if the source tree is unchanged since the last recorded build.
+
+        Args:
+            tree_fingerprint: Fingerprint of the current source tree
+
+        Returns:
+            True if the fingerprint equals the one recorded at the last build
+        """
+        return bool(tree_fingerprint) and tree_fingerprint == self.build_state.tree_fingerprint
+
+    def record_tree_fingerprint(self, tree_fingerprint: str) -> None:
+        """Record the source tree fingerprint without marking any files as built.
+
+        Args:
+            tree_fingerprint: Fingerprint of the current source tree
+        """
+        self.build_state.tree_fingerprint = tree_fingerprint
         self._save_build_state()
 
     def mark_full_build(self) -> None:
@@ -253,6 +336,7 @@ class IncrementalBuildManager:
             dependencies: Dictionary mapping files to their dependencies
         """
         self.build_state.dependencies.update(dependencies)
+        self._rebuild_reverse_dependencies()
         self._save_build_state()
 
     def should_force_full_build(self, force_after_hours: float = 24.0) -> bool:
@@ -342,6 +426,7 @@ class IncrementalBuildManager:
     def clear_build_cache(self) -> None:
         """Clear the build cache and start fresh."""
         self.build_state = BuildState(project_path=str(self.project_path))
+        self._reverse_dependencies = {}
         if self.build_cache_file.exists():
             self.build_cache_file.unlink()
         logger.info("Build cache cleared")
@@ -5,13 +5,16 @@ support for improved performance on large projects.
 """
 
 import asyncio
+import hashlib
 import logging
-from collections.abc import Callable
+import os
+import time
+from collections.abc import Callable, Iterator
 from pathlib import Path
 from typing import Any
 
 from config.project_config import Config
-from docs_generator.analyzer import PythonProjectAnalyzer
+from docs_generator.analyzer import FileEntry, PythonProjectAnalyzer
 from docs_generator.obsidian_converter import ObsidianConverter
 from docs_generator.sphinx_integration import SphinxDocumentationGenerator
 from utils.incremental_build import IncrementalBuildManager
@@ -19,6 +22,27 @@ from utils.obsidian_utils import ObsidianVaultManager
 
 logger = logging.getLogger(__name__)
 
+# Upper bound on concurrent per-file executor jobs, keeping disk queue depth useful
+# without running into the process file-descriptor limit on large projects
+MAX_INFLIGHT_FILE_OPS = min(512, (os.cpu_count() or 4) * 16)
+
+
+def _tree_fingerprint(entries: list[FileEntry]) -> str:
+    """Compute a fingerprint of the source tree from file paths, mtimes and sizes.
+
+    Args:
+        entries: Discovered source files, in a stable order
+
+    Returns:
+        Hex digest identifying the current state of the tree
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    for entry in entries:
+        digest.update(entry.path_str.encode())
+        digest.update(entry.stat.st_mtime_ns.to_bytes(8, "little", signed=True))
+        digest.update(entry.stat.st_size.to_bytes(8, "little"))
+    return digest.hexdigest()
+
 
 class IncrementalDocumentationGenerationError(Exception):
     """Exception raised during incremental documentation generation."""
@@ -46,6 +70,13 @@ class IncrementalDocumentationGenerator:
         self.obsidian_converter = ObsidianConverter(config)
         self.vault_manager: ObsidianVaultManager | None = None
 
+        # Created lazily so the semaphore binds to the loop that runs the build
+        self._io_semaphore: asyncio.Semaphore | None = None
+        self._io_semaphore_loop: asyncio.AbstractEventLoop | None = None
+
+        # Build state persistence runs in the background after a build returns
+        self._pending_persist: asyncio.Task[None] | None = None
+
         # Initialize incremental build manager
         self.build_manager: IncrementalBuildManager | None = None
         if self.enable_incremental:
@@ -56,10 +87,11 @@ class IncrementalDocumentationGenerator:
             try:
                 self.vault_manager = ObsidianVaultManager(Path(config.obsidian.vault_path))
             except Exception as e:
-                logger.warning(f"Failed to initialize vault manager: {e}")
+                logger.warning("Failed to initialize vault manager: %s", e)
 
         logger.info(
-            f"Initialized incremental documentation generator (incremental: {enable_incremental})"
+            "Initialized incremental documentation generator (incremental: %s)",
+            enable_incremental,
         )
 
     async def generate_documentation(
@@ -80,31 +112,19 @@ class IncrementalDocumentationGenerator:
             IncrementalDocumentationGenerationError: If generation fails
         """
         try:
-            # start_time = asyncio.get_event_loop().time()  # Not used
-
-            results = {
-                "status": "success",
-                "build_type": "full" if force_full else "incremental",
-                "steps_completed": [],
-                "files_generated": [],
-                "files_skipped": [],
-                "warnings": [],
-                "statistics": {},
-                "performance": {},
-            }
+            # Make sure the previous build's state is on disk before diffing against it
+            await self.wait_for_pending_persist()
 
             # Determine build strategy
             should_full_build = await self._should_perform_full_build(force_full)
             if should_full_build:
-                results["build_type"] = "full"
                 return await self._perform_full_build(progress_callback)
 
             # Incremental build path
-            results["build_type"] = "incremental"
             return await self._perform_incremental_build(progress_callback)
 
         except Exception as e:
-            logger.error(f"Documentation generation failed: {e}")
+            logger.error("Documentation generation failed: %s", e)
             raise IncrementalDocumentationGenerationError(
                 f"Failed to generate documentation: {e}"
             ) from e
@@ -144,18 +164,11 @@ class IncrementalDocumentationGenerator:
         """
         logger.info("Starting full documentation build")
 
-        results = {
-            "status": "success",
-            "build_type": "full",
-            "steps_completed": [],
-            "files_generated": [],
-            "files_skipped": [],
-            "warnings": [],
-            "statistics": {},
-            "performance": {},
-        }
+        results = self._new_results("full")
+        start_ns = time.perf_counter_ns()
 
-        start_time = asyncio.get_event_loop().time()
+        # Fingerprint the tree before building so later edits are never masked
+        tree_fingerprint = _tree_fingerprint(self._walk_with_stats()) if self.build_manager else ""
 
         # Step 1: Analyze entire project
         if progress_callback:
@@ -182,7 +195,7 @@ class IncrementalDocumentationGenerator:
         logger.info("Converting all documentation to Obsidian format")
         obsidian_docs = await self._convert_to_obsidian(sphinx_output)
         results["steps_completed"].append("obsidian_conversion")
-        results["statistics"]["obsidian_files"] = len(obsidian_docs.get("files", {}))
+        results["statistics"]["obsidian_files"] = self._count_obsidian_files(obsidian_docs)
 
         # Step 4: Save to vault
         if self.vault_manager:
@@ -199,22 +212,15 @@ class IncrementalDocumentationGenerator:
         if self.build_manager:
             python_files = [mod.file_path for mod in project_structure.modules]
             generated_files = {str(f): results["files_generated"] for f in python_files}
-            self.build_manager.mark_files_built(python_files, generated_files)
-            self.build_manager.mark_full_build()
+            self._schedule_persist(python_files, generated_files, tree_fingerprint, full_build=True)
 
         # Performance metrics
-        end_time = asyncio.get_event_loop().time()
-        results["performance"] = {
-            "total_time_seconds": round(end_time - start_time, 2),
-            "modules_per_second": round(len(project_structure.modules) / (end_time - start_time), 2)
-            if end_time > start_time
-            else 0,
-        }
+        results["performance"] = self._performance_metrics(start_ns, len(project_structure.modules))
 
         results["statistics"]["total_files_generated"] = len(results["files_generated"])
         results["generation_summary"] = self._create_generation_summary(results)
 
-        logger.info(f"Full build completed in {results['performance']['total_time_seconds']}s")
+        logger.info("Full build completed in %.2fs", results["performance"]["total_time_seconds"])
         return results
 
     async def _perform_incremental_build(
@@ -230,25 +236,14 @@ class IncrementalDocumentationGenerator:
         """
         logger.info("Starting incremental documentation build")
 
-        results = {
-            "status": "success",
-            "build_type": "incremental",
-            "steps_completed": [],
-            "files_generated": [],
-            "files_skipped": [],
-            "warnings": [],
-            "statistics": {},
-            "performance": {},
-        }
-
-        start_time = asyncio.get_event_loop().time()
+        results = self._new_results("incremental")
+        start_ns = time.perf_counter_ns()
 
         # Step 1: Discover all Python files
         if progress_callback:
             progress_callback("Discovering project files...")
 
-        exclude_patterns = self.config.project.exclude_patterns
-        all_python_files = self.analyzer._discover_python_files(exclude_patterns)
+        file_entries = self._walk_with_stats()
 
         # Step 2: Determine changed files
         if progress_callback:
@@ -258,28 +253,40 @@ class IncrementalDocumentationGenerator:
             # Fallback to full build if no build manager
             return await self._perform_full_build(progress_callback)
 
-        changed_files = self.build_manager.get_changed_files(all_python_files)
+        # An unchanged tree fingerprint means no file was added, removed or touched,
+        # so the per-file content hashing below can be skipped entirely
+        tree_fingerprint = _tree_fingerprint(file_entries)
+        if self.build_manager.matches_tree_fingerprint(tree_fingerprint):
+            logger.info("Source tree fingerprint unchanged, skipping build")
+            results["statistics"]["files_checked"] = len(file_entries)
+            results["statistics"]["files_changed"] = 0
+            results["statistics"]["tree_fingerprint_match"] = True
+            results["files_skipped"] = [entry.path_str for entry in file_entries]
+            return results
+
+        entries_by_path = {entry.path: entry for entry in file_entries}
+        stat_map = {entry.path: entry.stat for entry in file_entries}
+        changed_files = self.build_manager.get_changed_files(list(stat_map), stat_map)
         if not changed_files:
             logger.info("No changes detected, skipping build")
-            results["statistics"]["files_checked"] = len(all_python_files)
+            self.build_manager.record_tree_fingerprint(tree_fingerprint)
+            results["statistics"]["files_checked"] = len(file_entries)
             results["statistics"]["files_changed"] = 0
-            results["files_skipped"] = [str(f) for f in all_python_files]
+            results["files_skipped"] = [entry.path_str for entry in file_entries]
             return results
 
-        logger.info(f"Found {len(changed_files)} changed files")
-        results["statistics"]["files_checked"] = len(all_python_files)
+        logger.info("Found %d changed files", len(changed_files))
+        results["statistics"]["files_checked"] = len(file_entries)
         results["statistics"]["files_changed"] = len(changed_files)
 
         # Step 3: Get dependent files that need rebuilding
-        dependent_files = set()
-        for changed_file in changed_files:
-            if self.build_manager:
-                dependent_files.update(self.build_manager.get_dependent_files(changed_file))
+        dependent_files = self.build_manager.get_dependent_files_for(changed_files)
 
         files_to_rebuild = changed_files | dependent_files
         logger.info(
-            f"Total files to rebuild: {len(files_to_rebuild)} "
-            f"(including {len(dependent_files)} dependents)"
+            "Total files to rebuild: %d (including %d dependents)",
+            len(files_to_rebuild),
+            len(dependent_files),
         )
         results["statistics"]["files_to_rebuild"] = len(files_to_rebuild)
 
@@ -287,17 +294,22 @@ class IncrementalDocumentationGenerator:
         if progress_callback:
             progress_callback(f"Analyzing {len(files_to_rebuild)} changed files...")
 
+        # Files seen during the walk are known to exist; deleted ones are skipped
+        existing_entries = [
+            entries_by_path[file_path] for file_path in files_to_rebuild if file_path in stat_map
+        ]
+        analysis_results = await asyncio.gather(
+            *(self._analyze_one(entry.path) for entry in existing_entries),
+            return_exceptions=True,
+        )
+
         modules_to_rebuild = []
-        for file_path in files_to_rebuild:
-            if file_path.exists():
-                try:
-                    module_info = await asyncio.get_event_loop().run_in_executor(
-                        None, self.analyzer._analyze_file, file_path
-                    )
-                    modules_to_rebuild.append(module_info)
-                except Exception as e:
-                    logger.warning(f"Failed to analyze {file_path}: {e}")
-                    results["warnings"].append(f"Failed to analyze {file_path}: {e}")
+        for entry, outcome in zip(existing_entries, analysis_results, strict=True):
+            if isinstance(outcome, Exception):
+                logger.warning("Failed to analyze %s: %s", entry.path_str, outcome)
+                results["warnings"].append(f"Failed to analyze {entry.path_str}: {outcome}")
+            else:
+                modules_to_rebuild.append(outcome)
 
         results["steps_completed"].append("incremental_analysis")
         results["statistics"]["modules_analyzed"] = len(modules_to_rebuild)
@@ -322,7 +334,7 @@ class IncrementalDocumentationGenerator:
 
         obsidian_docs = await self._convert_to_obsidian(sphinx_output)
         results["steps_completed"].append("incremental_obsidian_conversion")
-        results["statistics"]["obsidian_files"] = len(obsidian_docs.get("files", {}))
+        results["statistics"]["obsidian_files"] = self._count_obsidian_files(obsidian_docs)
 
         # Step 7: Clean up outdated outputs
         if self.build_manager:
@@ -342,28 +354,198 @@ class IncrementalDocumentationGenerator:
 
         # Step 9: Update build state
         if self.build_manager:
-            generated_files = {str(f): results["files_generated"] for f in files_to_rebuild}
-            self.build_manager.mark_files_built(list(files_to_rebuild), generated_files)
+            rebuilt_paths = [
+                entries_by_path[f].path_str if f in entries_by_path else str(f)
+                for f in files_to_rebuild
+            ]
+            generated_files = dict.fromkeys(rebuilt_paths, results["files_generated"])
+            self._schedule_persist(list(files_to_rebuild), generated_files, tree_fingerprint)
 
         # Performance metrics
-        end_time = asyncio.get_event_loop().time()
-        results["performance"] = {
-            "total_time_seconds": round(end_time - start_time, 2),
-            "modules_per_second": round(len(modules_to_rebuild) / (end_time - start_time), 2)
-            if end_time > start_time
-            else 0,
-            "time_saved_vs_full": "estimated 60-80% time saving",
-        }
+        results["performance"] = self._performance_metrics(start_ns, len(modules_to_rebuild))
+        results["performance"]["time_saved_vs_full"] = "estimated 60-80% time saving"
 
         results["statistics"]["total_files_generated"] = len(results["files_generated"])
-        results["files_skipped"] = [str(f) for f in all_python_files if f not in files_to_rebuild]
+        results["files_skipped"] = [
+            entry.path_str for entry in file_entries if entry.path not in files_to_rebuild
+        ]
         results["generation_summary"] = self._create_generation_summary(results)
 
         logger.info(
-            f"Incremental build completed in {results['performance']['total_time_seconds']}s"
+            "Incremental build completed in %.2fs", results["performance"]["total_time_seconds"]
         )
         return results
 
+    def _walk_with_stats(self) -> list[FileEntry]:
+        """Discover project Python files along with their stat results.
+
+        Returns:
+            List of FileEntry objects sorted by path
+        """
+        return self.analyzer._scan_python_files(self.config.project.exclude_patterns)
+
+    def _schedule_persist(
+        self,
+        file_paths: list[Path],
+        generated_files: dict[str, list[str]],
+        tree_fingerprint: str,
+        full_build: bool = False,
+    ) -> None:
+        """Persist build state in the background so the build result returns immediately.
+
+        Args:
+            file_paths: Source files that were built
+            generated_files: Mapping of source files to generated output files
+            tree_fingerprint: Fingerprint of the source tree the build was made from
+            full_build: Whether to also record a full build
+        """
+        self._pending_persist = asyncio.create_task(
+            self._persist_build_state(file_paths, generated_files, tree_fingerprint, full_build)
+        )
+
+    async def _persist_build_state(
+        self,
+        file_paths: list[Path],
+        generated_files: dict[str, list[str]],
+        tree_fingerprint: str,
+        full_build: bool,
+    ) -> None:
+        """Update and save build state in the executor."""
+        if not self.build_manager:
+            return
+
+        build_manager = self.build_manager
+
+        def update_build_state() -> None:
+            build_manager.mark_files_built(file_paths, generated_files, tree_fingerprint)
+            if full_build:
+                build_manager.mark_full_build()
+
+        try:
+            await asyncio.get_running_loop().run_in_executor(None, update_build_state)
+        except Exception as e:
+            logger.warning("Failed to persist build state: %s", e)
+
+    async def wait_for_pending_persist(self) -> None:
+        """Wait until any background build state persistence has finished.
+
+        The write is shielded, so cancelling the wait leaves it running.
+        """
+        pending = self._pending_persist
+        if pending is None:
+            return
+        await asyncio.shield(pending)
+        if self._pending_persist is pending:
+            self._pending_persist = None
+
+    async def aclose(self) -> None:
+        """Flush pending background work before the generator is discarded."""
+        try:
+            await self.wait_for_pending_persist()
+        finally:
+            # A cancelled wait leaves the write running; finish it before the cancel
+            # propagates, so the state file is always written
+            await self.wait_for_pending_persist()
+
+    async def __aenter__(self) -> "IncrementalDocumentationGenerator":
+        """Async context manager entry."""
+        return self
+
+    async def __aexit__(self, exc_type: Any, exc_val: Any, exc_tb: Any) -> None:
+        """Async context manager exit, flushing pending build state."""
+        # Unused parameters are required by context manager protocol
+        _ = exc_type, exc_val, exc_tb
+        await self.aclose()
+
+    def _get_io_semaphore(self) -> asyncio.Semaphore:
+        """Get the semaphore bounding concurrent per-file operations.
+
+        Returns:
+            Semaphore bound to the currently running event loop
+        """
+        loop = asyncio.get_running_loop()
+        if self._io_semaphore is None or self._io_semaphore_loop is not loop:
+            self._io_semaphore = asyncio.Semaphore(MAX_INFLIGHT_FILE_OPS)
+            self._io_semaphore_loop = loop
+        return self._io_semaphore
+
+    async def _analyze_one(self, file_path: Path) -> Any:
+        """Analyze a single file in the executor, bounded by the I/O semaphore.
+
+        Args:
+            file_path: Python file to analyze
+
+        Returns:
+            ModuleInfo for the analyzed file
+        """
+        async with self._get_io_semaphore():
+            return await asyncio.get_running_loop().run_in_executor(
+                None, self.analyzer._analyze_file, file_path
+            )
+
+    async def _write_one(self, output_path: Path, source: str | Path) -> Path:
+        """Write a single file to the vault, bounded by the I/O semaphore.
+
+        Args:
+            output_path: Destination path inside the vault
+            source: File content, or path of a converted file whose content is read
+                in the executor just before writing
+
+        Returns:
+            Path of the written file
+        """
+        vault_manager = self.vault_manager
+        if not vault_manager:
+            raise IncrementalDocumentationGenerationError("No vault manager configured")
+
+        def write() -> Path:
+            content = source.read_text(encoding="utf-8") if isinstance(source, Path) else source
+            written_path, _ = vault_manager.safe_write_file(
+                output_path, content, create_backup=True, create_parents=False
+            )
+            return written_path
+
+        async with self._get_io_semaphore():
+            return await asyncio.get_running_loop().run_in_executor(None, write)
+
+    def _performance_metrics(self, start_ns: int, modules_processed: int) -> dict[str, Any]:
+        """Compute build performance metrics from integer nanosecond timings.
+
+        Args:
+            start_ns: ``time.perf_counter_ns()`` value taken when the build started
+            modules_processed: Number of modules processed by the build
+
+        Returns:
+            Dictionary with total time and throughput
+        """
+        elapsed_ns = time.perf_counter_ns() - start_ns
+        return {
+            "total_time_seconds": elapsed_ns / 1_000_000_000,
+            "modules_per_second": (
+                modules_processed * 1_000_000_000 // elapsed_ns if elapsed_ns else 0
+            ),
+        }
+
+    def _new_results(self, build_type: str) -> dict[str, Any]:
+        """Create an empty results dictionary for a build.
+
+        Args:
+            build_type: Type of build being performed
+
+        Returns:
+            Results dictionary with all expected keys initialized
+        """
+        return {
+            "status": "success",
+            "build_type": build_type,
+            "steps_completed": [],
+            "files_generated": [],
+            "files_skipped": [],
+            "warnings": [],
+            "statistics": {},
+            "performance": {},
+        }
+
     def _create_partial_project_structure(self, modules: list[Any]) -> Any:
         """Create a partial project structure for incremental builds.
 
@@ -389,13 +571,13 @@ class IncrementalDocumentationGenerator:
 
     async def _analyze_project(self):
         """Analyze the complete Python project structure."""
-        return await asyncio.get_event_loop().run_in_executor(
+        return await asyncio.get_running_loop().run_in_executor(
             None, self.analyzer.analyze_project, self.config.project.exclude_patterns
         )
 
     async def _generate_sphinx_docs(self, project_structure):
         """Generate Sphinx documentation."""
-        return await asyncio.get_event_loop().run_in_executor(
+        return await asyncio.get_running_loop().run_in_executor(
             None, self.sphinx_generator.generate_documentation, project_structure
         )
 
@@ -407,7 +589,7 @@ class IncrementalDocumentationGenerator:
         sphinx_html_dir = sphinx_output.get("build_dir", Path("."))
         output_dir = Path("./obsidian_output")
 
-        return await asyncio.get_event_loop().run_in_executor(
+        return await asyncio.get_running_loop().run_in_executor(
             None, convert_sphinx_to_obsidian, sphinx_html_dir, output_dir, self.config
         )
 
@@ -425,15 +607,28 @@ class IncrementalDocumentationGenerator:
                 self.config.obsidian.docs_folder
             )
 
-            for file_path, content in obsidian_docs.get("files", {}).items():
-                output_path = docs_folder_path / file_path
-                output_path.parent.mkdir(parents=True, exist_ok=True)
-
-                # Use vault manager's safe write method
-                written_path, backup_path = self.vault_manager.safe_write_file(
-                    output_path, content, create_backup=True
-                )
-                files_created.append(str(output_path))
+            sources = list(self._iter_obsidian_files(obsidian_docs))
+            output_paths = [docs_folder_path / file_path for file_path, _ in sources]
+
+            # Create each distinct parent directory once, shallowest first, instead of
+            # issuing a mkdir per file
+            parent_dirs = {output_path.parent for output_path in output_paths}
+            for parent_dir in sorted(parent_dirs, key=lambda p: len(p.parts)):
+                parent_dir.mkdir(parents=True, exist_ok=True)
+
+            # Use vault manager's safe write method, with bounded concurrency
+            write_results = await asyncio.gather(
+                *(
+                    self._write_one(output_path, source)
+                    for output_path, (_, source) in zip(output_paths, sources, strict=True)
+                ),
+                return_exceptions=True,
+            )
+            for output_path, outcome in zip(output_paths, write_results, strict=True):
+                if isinstance(outcome, Exception):
+                    warnings.append(f"Failed to write {output_path}: {outcome}")
+                else:
+                    files_created.append(str(output_path))
 
             return {"files_created": files_created, "warnings": warnings}
 
@@ -441,6 +636,35 @@ class IncrementalDocumentationGenerator:
             warnings.append(f"Failed to save to vault: {e}")
             return {"files_created": files_created, "warnings": warnings}
 
+    def _iter_obsidian_files(
+        self, obsidian_docs: dict[str, Any]
+    ) -> Iterator[tuple[str, str | Path]]:
+        """Iterate over converted documents without loading them all into memory.
+
+        In-memory ``files`` mappings are yielded as-is. Conversion results that
+        were written to disk (``converted_files``) yield the output path instead,
+        so each document is only read when it is written to the vault.
+
+        Args:
+            obsidian_docs: Result of the Obsidian conversion step
+
+        Yields:
+            Tuples of (path relative to the docs folder, content or source path)
+        """
+        files = obsidian_docs.get("files")
+        if files:
+            yield from files.items()
+            return
+
+        output_dir = Path(obsidian_docs.get("output_directory", "."))
+        for converted in obsidian_docs.get("converted_files", []):
+            output_path = Path(converted["output"])
+            yield output_path.relative_to(output_dir).as_posix(), output_path
+
+    def _count_obsidian_files(self, obsidian_docs: dict[str, Any]) -> int:
+        """Count converted documents in either conversion result shape."""
+        return len(obsidian_docs.get("files") or obsidian_docs.get("converted_files", []))
+
     def _create_generation_summary(self, results: dict[str, Any]) -> str:
         """Create a human-readable generation summary."""
         build_type = results.get("build_type", "unknown")
@@ -452,13 +676,13 @@ class IncrementalDocumentationGenerator:
                 f"Incremental build completed: {stats.get('files_changed', 0)} "
                 f"changed files, {stats.get('modules_analyzed', 0)} modules rebuilt, "
                 f"{stats.get('total_files_generated', 0)} files generated in "
-                f"{perf.get('total_time_seconds', 0)}s"
+                f"{perf.get('total_time_seconds', 0):.2f}s"
             )
         else:
             return (
                 f"Full build completed: {stats.get('modules_analyzed', 0)} "
                 f"modules analyzed, {stats.get('total_files_generated', 0)} "
-                f"files generated in {perf.get('total_time_seconds', 0)}s"
+                f"files generated in {perf.get('total_time_seconds', 0):.2f}s"
             )
 
     def get_build_status(self) -> dict[str, Any]:
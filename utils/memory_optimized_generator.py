@@ -6,7 +6,10 @@ for large projects and resource-constrained environments.
 
 import asyncio
 import logging
+import os
+import re
 from collections.abc import Callable, Iterator
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Any
 
@@ -14,6 +17,7 @@ from config.project_config import Config
 from docs_generator.analyzer import ModuleInfo, PythonProjectAnalyzer
 from docs_generator.obsidian_converter import ObsidianConverter
 from docs_generator.sphinx_integration import SphinxDocumentationGenerator
+from utils.file_utils import temporary_directory
 from utils.memory_optimizer import (
     MemoryMonitor,
     MemoryOptimizer,
@@ -33,6 +37,7 @@ class MemoryOptimizedDocumentationGenerator:
         max_memory_mb: float | None = None,
         batch_size: int = 10,
         aggressive_gc: bool = True,
+        generation_concurrency: int | None = None,
     ):
         """Initialize the memory-optimized documentation generator.
 
@@ -41,11 +46,14 @@ class MemoryOptimizedDocumentationGenerator:
             max_memory_mb: Maximum memory limit in MB (None for no limit)
             batch_size: Number of modules to process in each batch
             aggressive_gc: Enable aggressive garbage collection
+            generation_concurrency: Maximum batches generating documentation at
+                once (defaults to half the CPU count); peak memory grows with it
         """
         self.config = config
         self.max_memory_mb = max_memory_mb
         self.batch_size = batch_size
         self.aggressive_gc = aggressive_gc
+        self.generation_concurrency = max(1, generation_concurrency or (os.cpu_count() or 2) // 2)
 
         # Initialize core components with memory optimization
         self.project_path = Path(config.project.source_paths[0])
@@ -54,6 +62,26 @@ class MemoryOptimizedDocumentationGenerator:
         self.obsidian_converter = ObsidianConverter(config)
         self.vault_manager: ObsidianVaultManager | None = None
 
+        # Exclude patterns match as substrings of the relative path; one compiled
+        # alternation checks them all in a single pass
+        exclude_patterns = config.project.exclude_patterns
+        self._exclude_re: re.Pattern[str] | None = (
+            re.compile("|".join(map(re.escape, exclude_patterns))) if exclude_patterns else None
+        )
+
+        # Bounds concurrent per-file analysis; created lazily per event loop
+        self._analysis_semaphore: asyncio.Semaphore | None = None
+        self._analysis_semaphore_loop: asyncio.AbstractEventLoop | None = None
+
+        # Dedicated pools keep file analysis from queueing behind Sphinx builds
+        # (and vice versa) in the loop's shared default executor
+        self._analysis_pool = ThreadPoolExecutor(
+            max_workers=os.cpu_count(), thread_name_prefix="analyze"
+        )
+        self._docgen_pool = ThreadPoolExecutor(
+            max_workers=self.generation_concurrency, thread_name_prefix="docgen"
+        )
+
         # Initialize vault manager if configured
         if config.obsidian.vault_path:
             try:
@@ -66,6 +94,22 @@ class MemoryOptimizedDocumentationGenerator:
             f"(max_memory: {max_memory_mb}MB, batch_size: {batch_size})"
         )
 
+    async def aclose(self) -> None:
+        """Shut down the worker pools; the generator cannot be used afterwards."""
+        loop = asyncio.get_running_loop()
+        for pool in (self._analysis_pool, self._docgen_pool):
+            await loop.run_in_executor(None, pool.shutdown)
+
+    async def __aenter__(self) -> "MemoryOptimizedDocumentationGenerator":
+        """Async context manager entry."""
+        return self
+
+    async def __aexit__(self, exc_type: Any, exc_val: Any, exc_tb: Any) -> None:
+        """Async context manager exit, shutting down the worker pools."""
+        # Unused parameters are required by context manager protocol
+        _ = exc_type, exc_val, exc_tb
+        await self.aclose()
+
     async def generate_documentation(
         self, progress_callback: Callable[[str], None] | None = None
     ) -> dict[str, Any]:
@@ -77,10 +121,13 @@ class MemoryOptimizedDocumentationGenerator:
         Returns:
             Generation results and statistics
         """
+        # Profiling only pays off when enforcing a memory limit or debugging
+        do_monitor = self.max_memory_mb is not None or logger.isEnabledFor(logging.DEBUG)
+
         with memory_efficient_context(
             max_memory_mb=self.max_memory_mb,
             aggressive_gc=self.aggressive_gc,
-            monitor_operations=True,
+            monitor_operations=do_monitor,
         ) as (monitor, optimizer):
             with monitor.profile_operation("memory_optimized_documentation_generation"):
                 return await self._generate_with_optimization(monitor, optimizer, progress_callback)
@@ -111,55 +158,92 @@ class MemoryOptimizedDocumentationGenerator:
             results["statistics"]["total_files"] = len(python_files)
             monitor.take_snapshot()
 
-        # Step 2: Process files in memory-efficient batches
+        # Steps 2-3: Analyze batches and hand each one straight to documentation
+        # generation, so only a couple of batches of modules are alive at a time
         if progress_callback:
             progress_callback(
                 f"Processing {len(python_files)} files in batches of {self.batch_size}..."
             )
 
-        all_modules = []
-        with optimizer.batch_processor(python_files, self.batch_size) as batches:
-            for batch_idx, batch_files in enumerate(batches):
-                batch_name = f"file_analysis_batch_{batch_idx + 1}"
+        queue: asyncio.Queue[list[ModuleInfo] | None] = asyncio.Queue(maxsize=2)
+        generation_slots = asyncio.Semaphore(self.generation_concurrency)
+        files_by_batch: dict[int, list[str]] = {}
+        modules_analyzed = 0
 
-                with monitor.profile_operation(batch_name):
-                    if progress_callback:
-                        progress_callback(
-                            f"Analyzing batch {batch_idx + 1} ({len(batch_files)} files)..."
-                        )
+        async def produce() -> None:
+            with optimizer.batch_processor(python_files, self.batch_size) as batches:
+                for batch_idx, batch_files in enumerate(batches):
+                    batch_name = f"file_analysis_batch_{batch_idx + 1}"
 
-                    batch_modules = await self._analyze_files_batch(batch_files, optimizer)
-                    all_modules.extend(batch_modules)
+                    with monitor.profile_operation(batch_name):
+                        if progress_callback:
+                            progress_callback(
+                                f"Analyzing batch {batch_idx + 1} ({len(batch_files)} files)..."
+                            )
 
-                    # Take snapshot after each batch
-                    monitor.take_snapshot()
+                        batch_modules = await self._analyze_files_batch(batch_files, optimizer)
 
-                    # Force cleanup between batches
-                    optimizer.clear_caches()
+                        # Take snapshot after each batch
+                        monitor.take_snapshot()
 
-        results["steps_completed"].append("batch_analysis")
-        results["statistics"]["modules_analyzed"] = len(all_modules)
+                        # Cleanup between batches, if requested
+                        if optimizer.clear_caches_between_batches:
+                            optimizer.clear_caches()
 
-        # Step 3: Generate documentation in streaming fashion
-        if progress_callback:
-            progress_callback("Generating documentation in memory-efficient mode...")
+                    await queue.put(batch_modules)
+                    # Don't pin the batch here while the next one is analyzed
+                    del batch_modules
+            await queue.put(None)
 
-        with monitor.profile_operation("streaming_documentation_generation"):
-            generated_files = await self._generate_documentation_streaming(
-                all_modules, optimizer, progress_callback
-            )
-            results["files_generated"].extend(generated_files)
-            monitor.take_snapshot()
+        async def generate(batch_modules: list[ModuleInfo], batch_idx: int) -> None:
+            try:
+                files_by_batch[batch_idx] = await self._generate_batch_documentation(
+                    batch_modules, batch_idx, progress_callback
+                )
+                monitor.take_snapshot()
+            finally:
+                generation_slots.release()
+
+        async def consume(task_group: asyncio.TaskGroup) -> None:
+            nonlocal modules_analyzed
+            batch_idx = 0
+            while True:
+                # Wait for a free slot before taking the next batch, so a slow
+                # generation phase back-pressures analysis through the queue
+                await generation_slots.acquire()
+                batch_modules = await queue.get()
+                if batch_modules is None:
+                    generation_slots.release()
+                    return
+                modules_analyzed += len(batch_modules)
+                task_group.create_task(generate(batch_modules, batch_idx))
+                batch_idx += 1
 
-        results["steps_completed"].append("streaming_generation")
+        try:
+            async with asyncio.TaskGroup() as task_group:
+                task_group.create_task(produce())
+                task_group.create_task(consume(task_group))
+        except ExceptionGroup as e:
+            # Surface the original error rather than the task group wrapper
+            raise e.exceptions[0] from None
+
+        for batch_idx in sorted(files_by_batch):
+            results["files_generated"].extend(files_by_batch[batch_idx])
+
+        results["steps_completed"].extend(["batch_analysis", "streaming_generation"])
+        results["statistics"]["modules_analyzed"] = modules_analyzed
 
         # Step 4: Memory profile summary
-        final_snapshot = monitor.get_memory_snapshot()
-        results["memory_profile"] = {
-            "peak_memory_mb": final_snapshot.rss_mb,
-            "python_objects": final_snapshot.python_objects,
-            "memory_recommendations": monitor.get_memory_recommendations(),
-        }
+        if monitor.enable_profiling:
+            final_snapshot = monitor.get_memory_snapshot(include_object_count=True)
+            results["memory_profile"] = {
+                "enabled": True,
+                "peak_memory_mb": final_snapshot.rss_mb,
+                "python_objects": final_snapshot.python_objects,
+                "memory_recommendations": monitor.get_memory_recommendations(),
+            }
+        else:
+            results["memory_profile"] = {"enabled": False}
 
         results["statistics"]["total_files_generated"] = len(results["files_generated"])
         results["generation_summary"] = self._create_generation_summary(results)
@@ -168,24 +252,42 @@ class MemoryOptimizedDocumentationGenerator:
         return results
 
     async def _discover_files_efficiently(self) -> list[Path]:
-        """Discover Python files with minimal memory footprint."""
-        exclude_patterns = self.config.project.exclude_patterns
+        """Discover Python files with minimal memory footprint.
+
+        Walks the tree with ``os.scandir`` and prunes excluded directories before
+        descending, so vendored or generated trees are never enumerated.
+        """
+        exclude_re = self._exclude_re
+        root = os.fspath(self.project_path)
+        prefix_len = len(os.path.join(root, ""))
+
+        def is_excluded(entry_path: str, suffix: str = "") -> bool:
+            if exclude_re is None:
+                return False
+            relative_path = entry_path[prefix_len:]
+            if os.sep != "/":
+                relative_path = relative_path.replace(os.sep, "/")
+            return exclude_re.search(relative_path + suffix) is not None
 
         # Use generator to minimize memory usage during discovery
         def file_generator() -> Iterator[Path]:
-            for file_path in self.project_path.rglob("*.py"):
-                # Quick exclusion check to avoid loading everything into memory
-                relative_path = file_path.relative_to(self.project_path)
-
-                # Simple exclusion check
-                excluded = False
-                for pattern in exclude_patterns:
-                    if pattern in str(relative_path):
-                        excluded = True
-                        break
-
-                if not excluded:
-                    yield file_path
+            stack = [root]
+            while stack:
+                try:
+                    with os.scandir(stack.pop()) as entries:
+                        for entry in entries:
+                            if entry.is_dir(follow_symlinks=False):
+                                # Every file below matches if "dir/" matches, so prune
+                                if not is_excluded(entry.path, "/"):
+                                    stack.append(entry.path)
+                            elif (
+                                entry.name.endswith(".py")
+                                and entry.is_file()
+                                and not is_excluded(entry.path)
+                            ):
+                                yield Path(entry.path)
+                except OSError as e:
+                    logger.warning(f"Failed to scan directory: {e}")
 
         # Convert generator to list in one go to minimize allocations
         return list(file_generator())
@@ -193,73 +295,125 @@ class MemoryOptimizedDocumentationGenerator:
     async def _analyze_files_batch(
         self, file_paths: list[Path], optimizer: MemoryOptimizer
     ) -> list[ModuleInfo]:
-        """Analyze a batch of files with memory optimization."""
-        modules = []
+        """Analyze a batch of files concurrently with memory optimization.
 
-        for file_path in file_paths:
-            try:
-                # Use memory-efficient file reading
-                file_content = ""
-                for chunk in optimizer.memory_efficient_file_reader(file_path):
-                    file_content += chunk
-
-                # Analyze file (this already uses caching from PythonProjectAnalyzer)
-                module_info = await asyncio.get_event_loop().run_in_executor(
-                    None, self.analyzer._analyze_file, file_path
-                )
-                modules.append(module_info)
+        Files are dispatched to the executor together, bounded by a semaphore of
+        ``batch_size`` so parsing overlaps across worker threads.
+        """
+        results = await asyncio.gather(*(self._analyze_one(file_path) for file_path in file_paths))
+        return [module_info for module_info in results if module_info is not None]
+
+    def _get_analysis_semaphore(self) -> asyncio.Semaphore:
+        """Get the semaphore bounding concurrent file analysis.
+
+        Returns:
+            Semaphore bound to the running event loop
+        """
+        loop = asyncio.get_running_loop()
+        if self._analysis_semaphore is None or self._analysis_semaphore_loop is not loop:
+            self._analysis_semaphore = asyncio.Semaphore(self.batch_size)
+            self._analysis_semaphore_loop = loop
+        return self._analysis_semaphore
 
-                # Clear file content from memory immediately
-                del file_content
+    async def _analyze_one(self, file_path: Path) -> ModuleInfo | None:
+        """Analyze a single file in the executor, bounded by the analysis semaphore.
 
+        Args:
+            file_path: Python file to analyze
+
+        Returns:
+            Module information, or None if the file could not be analyzed
+        """
+        async with self._get_analysis_semaphore():
+            try:
+                # The analyzer reads the file itself (and uses its cache when valid)
+                return await asyncio.get_running_loop().run_in_executor(
+                    self._analysis_pool, self._analyze_file_interned, file_path
+                )
             except Exception as e:
                 logger.warning(f"Failed to analyze {file_path}: {e}")
-                continue
+                return None
+
+    def _analyze_file_interned(self, file_path: Path) -> ModuleInfo:
+        """Analyze a file and intern the names its modules repeat across the project.
+
+        AST identifiers are already interned by the parser; dotted import paths,
+        base classes and decorators are built strings repeated in many modules.
+
+        Args:
+            file_path: Python file to analyze
+
+        Returns:
+            Module information with repeated names interned in place
+        """
+        module_info = self.analyzer._analyze_file(file_path)
+        intern = MemoryOptimizer.intern_identifiers
+
+        module_info.imports = intern(module_info.imports)
+        module_info.from_imports = dict(
+            zip(
+                intern(module_info.from_imports),
+                map(intern, module_info.from_imports.values()),
+                strict=True,
+            )
+        )
+        for class_info in module_info.classes:
+            class_info.base_classes = intern(class_info.base_classes)
+            class_info.decorators = intern(class_info.decorators)
+        for function_info in module_info.functions:
+            function_info.decorators = intern(function_info.decorators)
 
-        return modules
+        return module_info
 
-    async def _generate_documentation_streaming(
+    async def _generate_batch_documentation(
         self,
-        modules: list[ModuleInfo],
-        optimizer: MemoryOptimizer,
+        module_batch: list[ModuleInfo],
+        batch_idx: int,
         progress_callback: Callable[[str], None] | None = None,
     ) -> list[str]:
-        """Generate documentation using streaming/batch processing."""
-        generated_files = []
+        """Generate, convert and save documentation for one batch of modules.
 
-        # Process modules in batches to control memory usage
-        with optimizer.batch_processor(modules, self.batch_size) as batches:
-            for batch_idx, module_batch in enumerate(batches):
-                if progress_callback:
-                    progress_callback(f"Generating docs for batch {batch_idx + 1}...")
+        Args:
+            module_batch: Modules in the batch; cleared once the batch is done so
+                its modules can be reclaimed promptly
+            batch_idx: Zero-based batch index, used for progress and logging
+            progress_callback: Optional callback for progress updates
+
+        Returns:
+            Paths of files saved to the vault
+        """
+        if progress_callback:
+            progress_callback(f"Generating docs for batch {batch_idx + 1}...")
 
-                # Create partial project structure for this batch
-                batch_structure = self._create_batch_structure(module_batch)
+        # Create partial project structure for this batch
+        batch_structure = self._create_batch_structure(module_batch)
 
+        try:
+            # Converted output lives in a scratch directory removed once saved
+            with temporary_directory(prefix=f"obsidian_batch_{batch_idx}_") as output_dir:
                 try:
                     # Generate Sphinx docs for this batch
-                    sphinx_output = await asyncio.get_event_loop().run_in_executor(
-                        None,
+                    sphinx_output = await asyncio.get_running_loop().run_in_executor(
+                        self._docgen_pool,
                         self.sphinx_generator.generate_documentation,
                         batch_structure,
                     )
 
                     # Convert to Obsidian format
-                    obsidian_docs = await self._convert_batch_to_obsidian(sphinx_output)
+                    obsidian_docs = await self._convert_batch_to_obsidian(sphinx_output, output_dir)
 
                     # Save to vault immediately to free memory
                     if self.vault_manager:
-                        batch_files = await self._save_batch_to_vault(obsidian_docs)
-                        generated_files.extend(batch_files)
-
-                    # Clear batch data from memory
-                    del sphinx_output, obsidian_docs
+                        return await self._save_batch_to_vault(obsidian_docs)
 
                 except Exception as e:
                     logger.error(f"Failed to generate docs for batch {batch_idx + 1}: {e}")
-                    continue
 
-        return generated_files
+            return []
+        finally:
+            # The batch structure shares this list, so clearing it releases the
+            # modules even if generation results are still referenced elsewhere
+            module_batch.clear()
 
     def _create_batch_structure(self, modules: list[ModuleInfo]) -> Any:
         """Create a partial project structure for a batch of modules."""
@@ -277,16 +431,25 @@ class MemoryOptimizedDocumentationGenerator:
 
         return structure
 
-    async def _convert_batch_to_obsidian(self, sphinx_output: dict[str, Any]) -> dict[str, Any]:
-        """Convert a batch of Sphinx output to Obsidian format."""
+    async def _convert_batch_to_obsidian(
+        self, sphinx_output: dict[str, Any], output_dir: Path
+    ) -> dict[str, Any]:
+        """Convert a batch of Sphinx output to Obsidian format.
+
+        Args:
+            sphinx_output: Sphinx generation results for the batch
+            output_dir: Directory for the converted files, owned by the caller
+
+        Returns:
+            Obsidian conversion results
+        """
         from docs_generator.obsidian_converter import convert_sphinx_to_obsidian
 
         # Extract paths and convert
         sphinx_html_dir = sphinx_output.get("build_dir", Path("."))
-        output_dir = Path("./obsidian_output_batch")
 
-        return await asyncio.get_event_loop().run_in_executor(
-            None, convert_sphinx_to_obsidian, sphinx_html_dir, output_dir, self.config
+        return await asyncio.get_running_loop().run_in_executor(
+            self._docgen_pool, convert_sphinx_to_obsidian, sphinx_html_dir, output_dir, self.config
         )
 
     async def _save_batch_to_vault(self, obsidian_docs: dict[str, Any]) -> list[str]:
@@ -301,12 +464,21 @@ class MemoryOptimizedDocumentationGenerator:
                 self.config.obsidian.docs_folder
             )
 
-            for file_path, content in obsidian_docs.get("files", {}).items():
-                output_path = docs_folder_path / file_path
-                output_path.parent.mkdir(parents=True, exist_ok=True)
+            outputs = [
+                (docs_folder_path / file_path, source)
+                for file_path, source in self._iter_obsidian_files(obsidian_docs)
+            ]
 
+            # Files share few directories, so create each one once up front
+            for parent in {output_path.parent for output_path, _ in outputs}:
+                parent.mkdir(parents=True, exist_ok=True)
+
+            for output_path, source in outputs:
+                content = source.read_text(encoding="utf-8") if isinstance(source, Path) else source
                 # Use vault manager's safe write method
-                self.vault_manager.safe_write_file(output_path, content, create_backup=True)
+                self.vault_manager.safe_write_file(
+                    output_path, content, create_backup=True, create_parents=False
+                )
                 saved_files.append(str(output_path))
 
         except Exception as e:
@@ -314,17 +486,45 @@ class MemoryOptimizedDocumentationGenerator:
 
         return saved_files
 
+    def _iter_obsidian_files(
+        self, obsidian_docs: dict[str, Any]
+    ) -> Iterator[tuple[str, str | Path]]:
+        """Iterate over converted documents without loading them all into memory.
+
+        In-memory ``files`` mappings are yielded as-is. Conversion results that
+        were written to disk (``converted_files``) yield the output path instead,
+        so each document is only read when it is written to the vault.
+
+        Args:
+            obsidian_docs: Result of the Obsidian conversion step
+
+        Yields:
+            Tuples of (path relative to the docs folder, content or source path)
+        """
+        files = obsidian_docs.get("files")
+        if files:
+            yield from files.items()
+            return
+
+        output_dir = Path(obsidian_docs.get("output_directory", "."))
+        for converted in obsidian_docs.get("converted_files", []):
+            output_path = Path(converted["output"])
+            yield output_path.relative_to(output_dir).as_posix(), output_path
+
     def _create_generation_summary(self, results: dict[str, Any]) -> str:
         """Create a human-readable generation summary."""
         stats = results.get("statistics", {})
         memory = results.get("memory_profile", {})
 
-        return (
+        summary = (
             f"Memory-optimized generation completed: "
             f"{stats.get('modules_analyzed', 0)} modules, "
-            f"{stats.get('total_files_generated', 0)} files generated, "
-            f"peak memory: {memory.get('peak_memory_mb', 0):.1f}MB"
+            f"{stats.get('total_files_generated', 0)} files generated"
         )
+        # Without profiling there is no peak to report
+        if "peak_memory_mb" in memory:
+            summary += f", peak memory: {memory['peak_memory_mb']:.1f}MB"
+        return summary
 
     async def estimate_memory_requirements(self) -> dict[str, Any]:
         """Estimate memory requirements for the project."""
@@ -4,13 +4,18 @@ This module provides tools and strategies to minimize memory usage during
 large-scale documentation generation processes.
 """
 
+import codecs
 import gc
+import io
 import logging
+import os
 import sys
+import time
 import tracemalloc
-from collections.abc import Generator, Iterator
+from collections.abc import Generator, Iterable, Iterator, Sized
 from contextlib import contextmanager
 from dataclasses import dataclass, field
+from itertools import islice
 from pathlib import Path
 from typing import Any
 
@@ -22,10 +27,27 @@ except ImportError:
     HAS_PSUTIL = False
     psutil = None
 
+try:
+    import resource
+
+    HAS_RESOURCE = True
+except ImportError:
+    # Not available on Windows
+    HAS_RESOURCE = False
+    resource = None
+
 logger = logging.getLogger(__name__)
 
+# Chunk size for streamed file reads; large enough to amortize syscall overhead
+DEFAULT_READ_CHUNK_SIZE = 1 << 20
 
-@dataclass
+# Fraction of a memory limit above which aggressive GC tightens collector thresholds
+GC_PRESSURE_RATIO = 0.8
+
+_PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+
+@dataclass(slots=True)
 class MemorySnapshot:
     """Represents a memory usage snapshot."""
 
@@ -38,7 +60,7 @@ class MemorySnapshot:
     tracemalloc_mb: float = 0.0  # Tracemalloc current memory in MB
 
 
-@dataclass
+@dataclass(slots=True)
 class MemoryProfile:
     """Memory profiling results for an operation."""
 
@@ -61,31 +83,95 @@ class MemoryProfile:
         return max(self.start_snapshot.rss_mb, self.end_snapshot.rss_mb)
 
 
+def get_rss_mb_fast() -> float:
+    """Get the resident set size with a single cheap system call.
+
+    Reads ``/proc/self/statm`` where available. Elsewhere falls back to
+    ``resource.getrusage``, whose ``ru_maxrss`` is the peak rather than the
+    current RSS. Use ``MemoryMonitor.get_memory_snapshot`` for detailed figures.
+
+    Returns:
+        RSS in MB, or 0.0 if it cannot be determined
+    """
+    try:
+        with open("/proc/self/statm", "rb") as f:
+            return int(f.read().split()[1]) * _PAGE_SIZE / 1024 / 1024
+    except (OSError, ValueError, IndexError):
+        pass
+
+    if HAS_RESOURCE and resource:
+        # ru_maxrss is in KB on Linux, bytes on macOS
+        max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return max_rss / 1024 / 1024 if sys.platform == "darwin" else max_rss / 1024
+
+    return 0.0
+
+
+# Placeholder start/end snapshot for profiles taken while profiling is disabled
+_NULL_SNAPSHOT = MemorySnapshot(
+    timestamp=0.0, rss_mb=0.0, vms_mb=0.0, percent=0.0, available_mb=0.0
+)
+
+
 class MemoryMonitor:
     """Monitors and profiles memory usage during operations."""
 
-    def __init__(self, enable_tracemalloc: bool = True, enable_profiling: bool = True):
+    def __init__(
+        self,
+        enable_tracemalloc: bool = True,
+        enable_profiling: bool = True,
+        include_object_count: bool = False,
+        force_collect: bool = False,
+        sample_tracemalloc: bool = False,
+    ):
         """Initialize memory monitor.
 
         Args:
             enable_tracemalloc: Enable detailed Python memory tracking
             enable_profiling: Enable memory profiling
+            include_object_count: Count tracked Python objects in every snapshot.
+                Counting walks the whole heap, so by default only explicit full
+                snapshots include it
+            force_collect: Run a full garbage collection before and after each
+                profiled operation for more stable deltas, at the cost of CPU
+            sample_tracemalloc: Read traced memory in every snapshot; otherwise it
+                is only sampled at the start and end of profiled operations
         """
         self.enable_tracemalloc = enable_tracemalloc
         self.enable_profiling = enable_profiling
+        self.include_object_count = include_object_count
+        self.force_collect = force_collect
+        self.sample_tracemalloc = sample_tracemalloc
         self.current_profile: MemoryProfile | None = None
+        self._process: Any = None
 
         if self.enable_tracemalloc and not tracemalloc.is_tracing():
             tracemalloc.start()
 
         logger.info(f"Memory monitor initialized (tracemalloc: {enable_tracemalloc})")
 
-    def get_memory_snapshot(self) -> MemorySnapshot:
-        """Get current memory usage snapshot."""
-        import time
+    def get_memory_snapshot(
+        self,
+        include_object_count: bool | None = None,
+        include_tracemalloc: bool | None = None,
+    ) -> MemorySnapshot:
+        """Get current memory usage snapshot.
+
+        Args:
+            include_object_count: Count tracked Python objects (O(heap)); defaults
+                to the monitor's ``include_object_count`` setting
+            include_tracemalloc: Read tracemalloc's traced memory; defaults to the
+                monitor's ``sample_tracemalloc`` setting
+
+        Returns:
+            Snapshot of current memory usage
+        """
+        if include_object_count is None:
+            include_object_count = self.include_object_count
+        python_objects = len(gc.get_objects()) if include_object_count else 0
 
         if HAS_PSUTIL and psutil:
-            process = psutil.Process()
+            process = self._get_process()
             memory_info = process.memory_info()
             memory_percent = process.memory_percent()
             system_memory = psutil.virtual_memory()
@@ -96,39 +182,55 @@ class MemoryMonitor:
                 vms_mb=memory_info.vms / 1024 / 1024,
                 percent=memory_percent,
                 available_mb=system_memory.available / 1024 / 1024,
-                python_objects=len(gc.get_objects()),
+                python_objects=python_objects,
             )
         else:
             # Fallback when psutil is not available
-            try:
-                import resource
-
-                rusage = resource.getrusage(resource.RUSAGE_SELF)
-                # Note: rusage.ru_maxrss is in KB on Linux, bytes on macOS
-                rss_mb = (
-                    rusage.ru_maxrss / 1024
-                    if sys.platform != "darwin"
-                    else rusage.ru_maxrss / 1024 / 1024
-                )
-            except (ImportError, AttributeError):
-                # resource module not available on Windows or limited functionality
-                rss_mb = 0.0
-
             snapshot = MemorySnapshot(
                 timestamp=time.time(),
-                rss_mb=rss_mb,
+                rss_mb=get_rss_mb_fast(),
                 vms_mb=0.0,  # Not available without psutil
                 percent=0.0,  # Not available without psutil
                 available_mb=0.0,  # Not available without psutil
-                python_objects=len(gc.get_objects()),
+                python_objects=python_objects,
             )
 
-        if self.enable_tracemalloc and tracemalloc.is_tracing():
+        if include_tracemalloc is None:
+            include_tracemalloc = self.sample_tracemalloc
+        if include_tracemalloc and self.enable_tracemalloc and tracemalloc.is_tracing():
             current, _ = tracemalloc.get_traced_memory()
             snapshot.tracemalloc_mb = current / 1024 / 1024
 
         return snapshot
 
+    def cheap_snapshot(self) -> MemorySnapshot:
+        """Get a snapshot holding only the RSS, read with a single system call.
+
+        The Python object count is still taken when ``include_object_count`` is
+        enabled on the monitor.
+
+        Returns:
+            Snapshot with ``rss_mb`` set and all other measurements zero
+        """
+        return MemorySnapshot(
+            timestamp=time.time(),
+            rss_mb=get_rss_mb_fast(),
+            vms_mb=0.0,
+            percent=0.0,
+            available_mb=0.0,
+            python_objects=len(gc.get_objects()) if self.include_object_count else 0,
+        )
+
+    def _get_process(self) -> Any:
+        """Get the cached psutil handle for this process.
+
+        Returns:
+            psutil.Process for the current PID, recreated after a fork
+        """
+        if self._process is None or self._process.pid != os.getpid():
+            self._process = psutil.Process()
+        return self._process
+
     @contextmanager
     def profile_operation(self, operation_name: str) -> Generator[MemoryProfile, None, None]:
         """Context manager for profiling memory usage of an operation.
@@ -140,26 +242,26 @@ class MemoryMonitor:
             MemoryProfile object that gets populated during execution
         """
         if not self.enable_profiling:
-            # Create dummy profile if profiling disabled
-            dummy_snapshot = self.get_memory_snapshot()
-            profile = MemoryProfile(operation_name, dummy_snapshot, dummy_snapshot)
-            yield profile
+            # Hand out an empty profile without taking any measurements
+            yield MemoryProfile(operation_name, _NULL_SNAPSHOT, _NULL_SNAPSHOT)
             return
 
         logger.debug(f"Starting memory profiling for: {operation_name}")
 
-        # Force garbage collection before starting
-        gc.collect()
+        # Full collections are O(live objects), so only force them when asked
+        if self.force_collect:
+            gc.collect()
 
-        start_snapshot = self.get_memory_snapshot()
+        start_snapshot = self.get_memory_snapshot(include_tracemalloc=True)
         profile = MemoryProfile(operation_name, start_snapshot, start_snapshot)
         self.current_profile = profile
 
         try:
             yield profile
         finally:
-            gc.collect()  # Force GC before final measurement
-            end_snapshot = self.get_memory_snapshot()
+            if self.force_collect:
+                gc.collect()
+            end_snapshot = self.get_memory_snapshot(include_tracemalloc=True)
             profile.end_snapshot = end_snapshot
 
             # Find peak memory usage from snapshots
@@ -177,16 +279,25 @@ class MemoryMonitor:
 
             self.current_profile = None
 
-    def take_snapshot(self) -> None:
-        """Take a memory snapshot during profiling."""
+    def take_snapshot(self, full: bool = False) -> None:
+        """Take a memory snapshot during profiling.
+
+        Args:
+            full: Take a complete snapshot, including the Python object count
+                (which walks the whole heap), instead of recording only the RSS
+                (plus the object count if ``include_object_count`` is set)
+        """
         if self.current_profile:
-            snapshot = self.get_memory_snapshot()
+            if full:
+                snapshot = self.get_memory_snapshot(include_object_count=True)
+            else:
+                snapshot = self.cheap_snapshot()
             self.current_profile.snapshots.append(snapshot)
 
     def get_memory_recommendations(self) -> list[str]:
         """Get memory optimization recommendations based on current state."""
         recommendations = []
-        snapshot = self.get_memory_snapshot()
+        snapshot = self.get_memory_snapshot(include_object_count=True)
 
         # Memory pressure recommendations
         if snapshot.percent > 80:
@@ -214,21 +325,34 @@ class MemoryMonitor:
 class MemoryOptimizer:
     """Provides memory optimization strategies and utilities."""
 
-    def __init__(self, aggressive_gc: bool = False, object_limit: int = 1000000):
+    def __init__(
+        self,
+        aggressive_gc: bool = False,
+        object_limit: int = 1000000,
+        gc_every_n_batches: int = 8,
+        clear_caches_between_batches: bool = False,
+    ):
         """Initialize memory optimizer.
 
         Args:
-            aggressive_gc: Enable aggressive garbage collection
-            object_limit: Trigger GC when object count exceeds this limit
+            aggressive_gc: Enable aggressive garbage collection: young-generation
+                collections between batches, and tighter GC thresholds while a
+                memory limit is close to being reached
+            object_limit: Object count considered high; kept for compatibility, as
+                batches now check the collector's O(1) generation counters instead
+                of counting objects
+            gc_every_n_batches: With aggressive GC, collect the youngest generation
+                once every this many batches
+            clear_caches_between_batches: Whether batch loops should call
+                ``clear_caches`` after every batch
         """
         self.aggressive_gc = aggressive_gc
         self.object_limit = object_limit
+        self.gc_every_n_batches = max(1, gc_every_n_batches)
+        self._batches_since_gc = 0
+        self.clear_caches_between_batches = clear_caches_between_batches
         self._gc_threshold_original = gc.get_threshold()
 
-        if aggressive_gc:
-            # Set more aggressive GC thresholds
-            gc.set_threshold(100, 5, 5)
-
         logger.info(f"Memory optimizer initialized (aggressive_gc: {aggressive_gc})")
 
     def __del__(self):
@@ -236,11 +360,32 @@ class MemoryOptimizer:
         if hasattr(self, "_gc_threshold_original"):
             gc.set_threshold(*self._gc_threshold_original)
 
+    @staticmethod
+    def chunked(items: Iterable[Any], batch_size: int) -> Iterator[list[Any]]:
+        """Split any iterable into lists of up to ``batch_size`` items.
+
+        Consumes the input lazily, so streaming producers never need to be
+        materialized as a list.
+
+        Args:
+            items: Items to split
+            batch_size: Maximum size of each batch
+
+        Yields:
+            Successive batches of items
+        """
+        iterator = iter(items)
+        while batch := list(islice(iterator, batch_size)):
+            yield batch
+
     @contextmanager
     def batch_processor(
-        self, items: list[Any], batch_size: int = 100
+        self, items: Iterable[Any], batch_size: int = 100
     ) -> Generator[Iterator[list[Any]], None, None]:
-        """Process items in memory-efficient batches.
+        """Process items in memory-efficient batches, applying the GC policy.
+
+        Use ``chunked`` directly when no garbage collection between batches is
+        wanted.
 
         Args:
             items: Items to process
@@ -249,22 +394,25 @@ class MemoryOptimizer:
         Yields:
             Iterator that yields batches of items for processing
         """
-        total_batches = (len(items) + batch_size - 1) // batch_size
+        total_batches = (
+            (len(items) + batch_size - 1) // batch_size if isinstance(items, Sized) else "?"
+        )
 
         def batch_iterator():
-            for i in range(0, len(items), batch_size):
-                batch_num = (i // batch_size) + 1
-                batch = items[i : i + batch_size]
-
+            for batch_num, batch in enumerate(self.chunked(items, batch_size), 1):
                 logger.debug(f"Processing batch {batch_num}/{total_batches} ({len(batch)} items)")
 
-                # Force garbage collection after each batch if aggressive
+                # Periodic young-generation collection if aggressive
                 if self.aggressive_gc:
-                    gc.collect()
-
-                # Check object count
-                if len(gc.get_objects()) > self.object_limit:
-                    logger.warning(f"Object count exceeded {self.object_limit}, forcing GC")
+                    self._batches_since_gc += 1
+                    if self._batches_since_gc >= self.gc_every_n_batches:
+                        gc.collect(0)
+                        self._batches_since_gc = 0
+
+                # Collect when a full collection is due, using the O(1) generation
+                # counters rather than counting every object on the heap
+                if gc.get_count()[2] >= gc.get_threshold()[2]:
+                    logger.debug("Full collection due, forcing GC")
                     gc.collect()
 
                 yield batch
@@ -272,33 +420,27 @@ class MemoryOptimizer:
         try:
             yield batch_iterator()
         finally:
-            # Final cleanup
+            # One full collection per phase
             if self.aggressive_gc:
                 gc.collect()
 
-    def optimize_string_operations(self, strings: list[str]) -> list[str]:
-        """Optimize memory usage for string operations.
+    @staticmethod
+    def intern_identifiers(names: Iterable[str]) -> list[str]:
+        """Intern identifier-like strings so repeated names share one object.
+
+        ``sys.intern`` deduplicates globally, so no auxiliary set is needed.
+        Dotted names (``os.path``) are interned too; other strings are returned
+        unchanged.
 
         Args:
-            strings: List of strings to optimize
+            names: Names to intern
 
         Returns:
-            Memory-optimized list of strings
+            Names in their original order, interned where identifier-like
         """
-        # Use sys.intern for frequently used strings
-        optimized = []
-        seen = set()
-
-        for s in strings:
-            if len(s) < 100 and s in seen:
-                # Intern short, repeated strings
-                optimized.append(sys.intern(s))
-            else:
-                optimized.append(s)
-                if len(s) < 100:
-                    seen.add(s)
-
-        return optimized
+        return [
+            sys.intern(name) if name.replace(".", "_").isidentifier() else name for name in names
+        ]
 
     @contextmanager
     def memory_limit(self, max_memory_mb: float) -> Generator[None, None, None]:
@@ -310,16 +452,24 @@ class MemoryOptimizer:
         Raises:
             MemoryError: If memory limit is exceeded
         """
-        monitor = MemoryMonitor(enable_profiling=False)
+        # Tighten GC thresholds only when aggressive GC was requested and usage is
+        # already close to the limit
+        tightened = False
+        if self.aggressive_gc and get_rss_mb_fast() >= max_memory_mb * GC_PRESSURE_RATIO:
+            gc.set_threshold(100, 5, 5)
+            tightened = True
 
         try:
             yield
         finally:
-            current_memory = monitor.get_memory_snapshot().rss_mb
+            if tightened:
+                gc.set_threshold(*self._gc_threshold_original)
+
+            current_memory = get_rss_mb_fast()
             if current_memory > max_memory_mb:
                 # Try aggressive cleanup first
                 gc.collect()
-                final_memory = monitor.get_memory_snapshot().rss_mb
+                final_memory = get_rss_mb_fast()
 
                 if final_memory > max_memory_mb:
                     raise MemoryError(
@@ -355,10 +505,19 @@ class MemoryOptimizer:
         return sorted(large_objects, key=lambda x: x["size_mb"], reverse=True)
 
     def memory_efficient_file_reader(
-        self, file_path: Path, chunk_size: int = 8192
+        self, file_path: Path, chunk_size: int = DEFAULT_READ_CHUNK_SIZE
     ) -> Iterator[str]:
         """Memory-efficient file reader that yields chunks.
 
+        Intended for consumers that process each chunk incrementally. Callers that
+        need the whole text should use ``Path.read_text`` instead, and callers that
+        must reassemble chunks should ``"".join()`` them rather than concatenating
+        with ``+=``, which is quadratic in file size.
+
+        Files smaller than four chunks are read in one call. Larger files are read
+        in binary and decoded incrementally, so multi-byte characters split across
+        chunk boundaries and universal newlines are handled as in text mode.
+
         Args:
             file_path: Path to file to read
             chunk_size: Size of each chunk in bytes
@@ -367,18 +526,32 @@ class MemoryOptimizer:
             File content chunks
         """
         try:
-            with open(file_path, encoding="utf-8") as f:
+            if file_path.stat().st_size < 4 * chunk_size:
+                content = file_path.read_text(encoding="utf-8")
+                if content:
+                    yield content
+                return
+
+            decoder = io.IncrementalNewlineDecoder(
+                codecs.getincrementaldecoder("utf-8")(), translate=True
+            )
+            with open(file_path, "rb", buffering=0) as f:
                 while True:
-                    chunk = f.read(chunk_size)
-                    if not chunk:
+                    data = f.read(chunk_size)
+                    chunk = decoder.decode(data, final=not data)
+                    if chunk:
+                        yield chunk
+                    if not data:
                         break
-                    yield chunk
         except Exception as e:
             logger.error(f"Error reading file {file_path}: {e}")
 
     def clear_caches(self) -> dict[str, int]:
         """Clear various Python caches to free memory.
 
+        Only caches that are unbounded or cheap to rebuild are cleared; callers
+        running batches should check ``clear_caches_between_batches`` first.
+
         Returns:
             Dictionary with cleared cache counts
         """
@@ -389,28 +562,16 @@ class MemoryOptimizer:
             sys._clear_type_cache()
             cleared["type_cache"] = 1
 
-        # Clear regex cache (if available)
-        import re
+        # The regex cache is a bounded LRU; clearing it only forces recompiles.
+        # linecache mostly grows from formatting tracemalloc tracebacks.
+        if tracemalloc.is_tracing():
+            import linecache
 
-        try:
-            # Access internal cache safely
-            cache = getattr(re, "_cache", None)
-            if cache is not None:
-                cache_size = len(cache) if hasattr(cache, "__len__") else 0
-                if hasattr(cache, "clear"):
-                    cache.clear()
-                cleared["regex_cache"] = cache_size
-        except (AttributeError, TypeError):
-            # Cache access failed, skip silently
-            cleared["regex_cache"] = 0
-
-        # Clear linecache
-        import linecache
-
-        linecache.clearcache()
-        cleared["linecache"] = 1
+            linecache.clearcache()
+            cleared["linecache"] = 1
 
         # Force garbage collection
+        cleared["gc_pending_objects"] = gc.get_count()[0]
         collected = gc.collect()
         cleared["gc_collected"] = collected
 
@@ -429,12 +590,15 @@ def memory_efficient_context(
     Args:
         max_memory_mb: Optional memory limit
         aggressive_gc: Enable aggressive garbage collection
-        monitor_operations: Enable operation monitoring
+        monitor_operations: Enable operation monitoring; when disabled the
+            monitor neither profiles nor starts tracemalloc
 
     Yields:
         Tuple of (MemoryMonitor, MemoryOptimizer)
     """
-    monitor = MemoryMonitor(enable_profiling=monitor_operations)
+    monitor = MemoryMonitor(
+        enable_tracemalloc=monitor_operations, enable_profiling=monitor_operations
+    )
     optimizer = MemoryOptimizer(aggressive_gc=aggressive_gc)
 
     try:
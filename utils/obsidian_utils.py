@@ -5,12 +5,46 @@ This module provides utilities for safely working with Obsidian vaults,
 including vault discovery, validation, and safe file operations.
 """
 
+import os
+import re
 import shutil
+from collections.abc import Iterator
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
 from datetime import datetime
+from functools import cached_property
 from pathlib import Path
 
 import yaml
 
+# libyaml's C emitter is much faster; PyYAML may be built without it
+try:
+    from yaml import CSafeDumper as _YamlDumper
+except ImportError:
+    from yaml import SafeDumper as _YamlDumper
+
+# Wikilinks in the form [[link]] or [[link|display]]
+_WIKILINK_RE = re.compile(r"\[\[([^\]|]+)(?:\|[^\]]*)?\]\]")
+
+
+# Flags for writing a whole file through a raw descriptor (binary on Windows)
+_WRITE_FLAGS = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0)
+
+
+def _write_file_bytes(path: str, data: bytes) -> None:
+    """Write bytes to a file through a raw descriptor, without Python's I/O stack.
+
+    Args:
+        path: File to create or truncate
+        data: Bytes to write
+    """
+    fd = os.open(path, _WRITE_FLAGS, 0o666)
+    try:
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view) :]
+    finally:
+        os.close(fd)
+
 
 class ObsidianVaultError(Exception):
     """Base exception for Obsidian vault operations."""
@@ -76,13 +110,16 @@ class ObsidianVaultManager:
         """
         full_path = self.vault_path / folder_path
         full_path.mkdir(parents=True, exist_ok=True)
+        self._invalidate_vault_index()
         return full_path
 
-    def backup_file(self, file_path: Path) -> Path | None:
+    def backup_file(self, file_path: Path, timestamp: str | None = None) -> Path | None:
         """Create a backup of an existing file.
 
         Args:
             file_path: Path to the file to backup
+            timestamp: Preformatted ``%Y%m%d_%H%M%S`` timestamp for the backup
+                name (defaults to the current time)
 
         Returns:
             Path to the backup file, or None if file doesn't exist
@@ -90,14 +127,19 @@ class ObsidianVaultManager:
         if not file_path.exists():
             return None
 
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        if timestamp is None:
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         backup_path = file_path.with_suffix(f".backup_{timestamp}{file_path.suffix}")
 
         shutil.copy2(file_path, backup_path)
         return backup_path
 
     def safe_write_file(
-        self, file_path: Path, content: str, create_backup: bool = True
+        self,
+        file_path: Path,
+        content: str,
+        create_backup: bool = True,
+        create_parents: bool = True,
     ) -> tuple[Path, Path | None]:
         """Safely write content to a file with optional backup.
 
@@ -105,30 +147,48 @@ class ObsidianVaultManager:
             file_path: Path to write to
             content: Content to write
             create_backup: Whether to create backup of existing file
+            create_parents: Whether to create the parent directory; callers that
+                already created all target directories can skip the extra syscall
 
         Returns:
-            Tuple of (file_path, backup_path)
+            Tuple of (file_path, backup_path); nothing is written or backed up
+            when the file already holds exactly this content
         """
         # Ensure parent directory exists
-        file_path.parent.mkdir(parents=True, exist_ok=True)
+        if create_parents:
+            file_path.parent.mkdir(parents=True, exist_ok=True)
+
+        data = content.encode("utf-8")
+        try:
+            existing_size: int | None = os.stat(file_path).st_size
+        except FileNotFoundError:
+            existing_size = None
+
+        # Regenerated docs are often unchanged; only equal sizes need a comparison
+        if existing_size == len(data) and file_path.read_bytes() == data:
+            return file_path, None
+
+        # One timestamp serves both the backup and the temp file names
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
 
         # Create backup if requested and file exists
         backup_path = None
-        if create_backup and file_path.exists():
-            backup_path = self.backup_file(file_path)
+        if create_backup and existing_size is not None:
+            backup_path = self.backup_file(file_path, timestamp)
 
         # Write content atomically
-        temp_path = file_path.with_suffix(f".tmp_{datetime.now().strftime('%Y%m%d_%H%M%S')}")
+        # Keep the full name so files differing only in suffix never share a temp file
+        temp_path = f"{os.fspath(file_path)}.tmp_{timestamp}"
         try:
-            with open(temp_path, "w", encoding="utf-8") as f:
-                f.write(content)
-            temp_path.replace(file_path)
+            _write_file_bytes(temp_path, data)
+            os.replace(temp_path, file_path)
         except Exception:
             # Clean up temp file if write failed
-            if temp_path.exists():
-                temp_path.unlink()
+            if os.path.exists(temp_path):
+                os.unlink(temp_path)
             raise
 
+        self._invalidate_vault_index()
         return file_path, backup_path
 
     def generate_index_file(self, folder_path: Path, title: str, files: list[Path]) -> str:
@@ -151,23 +211,34 @@ class ObsidianVaultManager:
             "",
         ]
 
-        # Group files by type
-        md_files = [f for f in files if f.suffix == ".md"]
-        other_files = [f for f in files if f.suffix != ".md"]
+        # Group files by type in a single pass
+        md_files = []
+        other_files = []
+        for file_path in files:
+            (md_files if file_path.suffix == ".md" else other_files).append(file_path)
+
+        # os.path.relpath on the hoisted root string is far cheaper per file than
+        # Path.relative_to().as_posix()
+        vault_root = os.fspath(self.vault_path)
+        append = content_lines.append
+
+        def relative_posix(file_path: Path) -> str:
+            relative_path = os.path.relpath(file_path, vault_root)
+            if relative_path == os.pardir or relative_path.startswith(os.pardir + os.sep):
+                raise ValueError(f"{os.fspath(file_path)!r} is not inside the vault {vault_root}")
+            return relative_path.replace(os.sep, "/")
 
         # Add markdown files
         if md_files:
             for file_path in sorted(md_files):
-                relative_path = file_path.relative_to(self.vault_path)
                 name = file_path.stem.replace("_", " ").title()
-                content_lines.append(f"- [[{relative_path.as_posix()}|{name}]]")
+                append(f"- [[{relative_posix(file_path)}|{name}]]")
 
         # Add other files
         if other_files:
             content_lines.extend(["", "## Other Files", ""])
             for file_path in sorted(other_files):
-                relative_path = file_path.relative_to(self.vault_path)
-                content_lines.append(f"- [{file_path.name}]({relative_path.as_posix()})")
+                append(f"- [{file_path.name}]({relative_posix(file_path)})")
 
         content_lines.append("")
         return "\n".join(content_lines)
@@ -185,12 +256,38 @@ class ObsidianVaultManager:
         if not full_path.exists():
             return []
 
-        files = []
-        for file_path in full_path.rglob("*"):
-            if file_path.is_file() and not file_path.name.startswith("."):
-                files.append(file_path)
+        return list(self._scandir_recursive(full_path))
+
+    @staticmethod
+    def _scandir_recursive(path: Path, include_dirs: bool = False) -> Iterator[Path]:
+        """Yield non-hidden files (and optionally directories) below a directory.
+
+        Uses the type information cached on each ``os.DirEntry``, so no extra
+        ``stat()`` call is made per entry. Hidden files and directories are
+        skipped, and unreadable directories are ignored.
+
+        Args:
+            path: Directory to walk
+            include_dirs: Also yield the directories walked into
 
-        return files
+        Yields:
+            Paths of the files (and directories) found
+        """
+        pending = [os.fspath(path)]
+        while pending:
+            try:
+                with os.scandir(pending.pop()) as entries:
+                    for entry in entries:
+                        if entry.name[0] == ".":
+                            continue
+                        if entry.is_dir(follow_symlinks=False):
+                            pending.append(entry.path)
+                            if include_dirs:
+                                yield Path(entry.path)
+                        elif entry.is_file():
+                            yield Path(entry.path)
+            except (PermissionError, FileNotFoundError):
+                continue
 
     def validate_wikilinks(self, content: str) -> dict[str, bool]:
         """Validate wikilinks in content.
@@ -201,27 +298,36 @@ class ObsidianVaultManager:
         Returns:
             Dictionary mapping wikilinks to their validity status
         """
-        import re
-
-        # Find all wikilinks in format [[link]] or [[link|display]]
-        wikilink_pattern = r"\[\[([^\]|]+)(?:\|[^\]]*)?\]\]"
-        links = re.findall(wikilink_pattern, content)
+        links = _WIKILINK_RE.findall(content)
+        vault_index = self._vault_index
 
         validation_results = {}
-        for link in links:
+        # Documents repeat targets often; check each one once, in order of appearance
+        for link in dict.fromkeys(links):
             # Try different possible paths for the link
-            possible_paths = [
-                self.vault_path / f"{link}.md",
-                self.vault_path / link,
-                self.vault_path / f"{link}.txt",
-            ]
-
-            # Check if any of the possible paths exist
-            exists = any(path.exists() for path in possible_paths)
-            validation_results[link] = exists
+            validation_results[link] = (
+                f"{link}.md" in vault_index or link in vault_index or f"{link}.txt" in vault_index
+            )
 
         return validation_results
 
+    @cached_property
+    def _vault_index(self) -> frozenset[str]:
+        """Vault-relative POSIX paths of the vault's files and folders.
+
+        Built with a single walk on first use, so wikilink validation does set
+        lookups instead of ``stat()`` calls. Writes through the manager reset it.
+        """
+        vault_root = os.fspath(self.vault_path)
+        return frozenset(
+            os.path.relpath(path, vault_root).replace(os.sep, "/")
+            for path in self._scandir_recursive(self.vault_path, include_dirs=True)
+        )
+
+    def _invalidate_vault_index(self) -> None:
+        """Drop the cached vault index after the vault has changed."""
+        self.__dict__.pop("_vault_index", None)
+
     def create_template_file(self, template_name: str, template_content: str) -> Path:
         """Create a template file in the vault.
 
@@ -239,6 +345,101 @@ class ObsidianVaultManager:
         return template_path
 
 
+class VaultWriteBatch:
+    """Collects vault file writes and performs them together.
+
+    Each distinct parent directory is created once, then the backups and
+    atomic writes run on a small thread pool so their I/O waits overlap
+    instead of being paid one file at a time.
+    """
+
+    def __init__(
+        self,
+        vault_manager: ObsidianVaultManager,
+        create_backup: bool = True,
+        max_workers: int = 4,
+        executor: Executor | None = None,
+    ):
+        """Initialize the write batch.
+
+        Args:
+            vault_manager: Vault manager performing the individual safe writes
+            create_backup: Whether to back up files that already exist
+            max_workers: Maximum number of files written concurrently
+            executor: Long-lived executor to submit writes to, shared with other
+                batches; a short-lived pool is created per flush if omitted
+        """
+        self.vault_manager = vault_manager
+        self.create_backup = create_backup
+        self.max_workers = max_workers
+        self.executor = executor
+        self._pending: dict[Path, str] = {}
+
+    def __len__(self) -> int:
+        """Number of writes waiting to be flushed."""
+        return len(self._pending)
+
+    def add(self, file_path: Path, content: str) -> None:
+        """Queue a file write, replacing any write already queued for the path.
+
+        Args:
+            file_path: Path to write to
+            content: Content to write
+        """
+        self._pending[file_path] = content
+
+    def flush(self) -> list[Path]:
+        """Write all queued files.
+
+        Returns:
+            Paths written, in the order they were added
+
+        Raises:
+            OSError: If any write fails; the remaining writes still complete
+        """
+        if self.executor is not None:
+            return [future.result() for future in self.submit()]
+
+        pending = self._take_pending()
+        if len(pending) <= 1:
+            return [self._write(item) for item in pending]
+
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(pending))) as pool:
+            return list(pool.map(self._write, pending))
+
+    def submit(self) -> list[Future[Path]]:
+        """Hand all queued files to the batch's executor without waiting.
+
+        Parent directories are created before returning, so only the writes
+        themselves are still in flight.
+
+        Returns:
+            One future per file, resolving to its path, in the order added
+
+        Raises:
+            ValueError: If the batch has no executor
+        """
+        if self.executor is None:
+            raise ValueError("VaultWriteBatch.submit() requires an executor")
+
+        return [self.executor.submit(self._write, item) for item in self._take_pending()]
+
+    def _take_pending(self) -> list[tuple[Path, str]]:
+        """Dequeue the pending writes, creating each distinct parent directory once."""
+        pending, self._pending = list(self._pending.items()), {}
+        for parent in {file_path.parent for file_path, _ in pending}:
+            parent.mkdir(parents=True, exist_ok=True)
+        return pending
+
+    def _write(self, item: tuple[Path, str]) -> Path:
+        """Safely write one queued file."""
+        file_path, content = item
+        self.vault_manager.safe_write_file(
+            file_path, content, create_backup=self.create_backup, create_parents=False
+        )
+        return file_path
+
+
 def discover_vault(start_path: Path) -> Path | None:
     """Discover Obsidian vault by searching upward from start path.
 
@@ -248,14 +449,14 @@ def discover_vault(start_path: Path) -> Path | None:
     Returns:
         Path to vault root, or None if not found
     """
-    current_path = Path(start_path).resolve()
+    current_path = os.path.realpath(start_path)
 
-    # Search upward for .obsidian directory
-    while current_path != current_path.parent:
-        obsidian_dir = current_path / ".obsidian"
-        if obsidian_dir.exists() and obsidian_dir.is_dir():
-            return current_path
-        current_path = current_path.parent
+    # Search upward for .obsidian directory, stopping below the filesystem root
+    parent_path = os.path.dirname(current_path)
+    while current_path != parent_path:
+        if os.path.isdir(os.path.join(current_path, ".obsidian")):
+            return Path(current_path)
+        current_path, parent_path = parent_path, os.path.dirname(parent_path)
 
     return None
 
@@ -311,4 +512,4 @@ def create_obsidian_frontmatter(title: str, tags: list[str], source_file: str |
     if source_file:
         frontmatter["source"] = source_file
 
-    return "---\n" + yaml.dump(frontmatter, default_flow_style=False) + "---\n"
+    return "---\n" + yaml.dump(frontmatter, Dumper=_YamlDumper, default_flow_style=False) + "---\n"
@@ -6,16 +6,20 @@ processing multiple modules simultaneously for improved performance.
 
 import asyncio
 import logging
-from collections.abc import Callable
+from collections import defaultdict
+from collections.abc import Callable, Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import partial
+from itertools import chain
 from pathlib import Path
 from typing import Any
 
 from config.project_config import Config
 from docs_generator.analyzer import ModuleInfo, ProjectStructure, PythonProjectAnalyzer
-from docs_generator.obsidian_converter import ObsidianConverter
+from docs_generator.obsidian_converter import ObsidianConverter, convert_sphinx_to_obsidian
 from docs_generator.sphinx_integration import SphinxDocumentationGenerator
 from utils.memory_optimizer import MemoryMonitor, memory_efficient_context
-from utils.obsidian_utils import ObsidianVaultManager
+from utils.obsidian_utils import ObsidianVaultManager, VaultWriteBatch
 from utils.parallel_processor import ModuleDependencyAnalyzer, ParallelProcessor
 
 logger = logging.getLogger(__name__)
@@ -62,9 +66,19 @@ class ParallelDocumentationGenerator:
             max_workers=max_workers,
             use_threads=use_threads,
             timeout_per_task=600.0,  # 10 minutes per task
+            # Module dependencies only order the work, so a failed package must not
+            # stop documentation for the packages importing it
+            cancel_dependents=False,
         )
         self.dependency_analyzer = ModuleDependencyAnalyzer()
 
+        # Project analysis and the blocking process_all coordinator run here rather
+        # than in the loop's default executor shared with other asyncio work
+        self._coordinator = ThreadPoolExecutor(max_workers=1, thread_name_prefix="parallel-docs")
+
+        # Vault writes from all worker threads share this pool while a run is active
+        self._write_pool: ThreadPoolExecutor | None = None
+
         # Initialize vault manager if configured
         if config.obsidian.vault_path:
             try:
@@ -78,6 +92,27 @@ class ParallelDocumentationGenerator:
             f"threads: {use_threads}, memory_opt: {enable_memory_optimization})"
         )
 
+    async def aclose(self) -> None:
+        """Shut down the coordinator pool; the generator cannot be used afterwards."""
+        await asyncio.get_running_loop().run_in_executor(None, self._coordinator.shutdown)
+
+    async def __aenter__(self) -> "ParallelDocumentationGenerator":
+        """Async context manager entry."""
+        return self
+
+    async def __aexit__(self, exc_type: Any, exc_val: Any, exc_tb: Any) -> None:
+        """Async context manager exit, shutting down the coordinator pool."""
+        # Unused parameters are required by context manager protocol
+        _ = exc_type, exc_val, exc_tb
+        await self.aclose()
+
+    def __getstate__(self) -> dict[str, Any]:
+        """Drop the local thread pools when workers pickle the generator."""
+        state = self.__dict__.copy()
+        state["_coordinator"] = None
+        state["_write_pool"] = None
+        return state
+
     async def generate_documentation(
         self, progress_callback: Callable[[str], None] | None = None
     ) -> dict[str, Any]:
@@ -158,9 +193,20 @@ class ParallelDocumentationGenerator:
             if progress_callback:
                 progress_callback(f"Parallel processing: {message} ({progress:.0%})")
 
-        processing_results = await asyncio.get_event_loop().run_in_executor(
-            None, self.parallel_processor.process_all, parallel_progress
-        )
+        def process_and_finish_writes() -> dict[str, Any]:
+            processing_results = self.parallel_processor.process_all(parallel_progress)
+            self._finish_vault_writes(processing_results)
+            return processing_results
+
+        # Process pools pickle the generator, so only thread workers share a write pool
+        with ThreadPoolExecutor(thread_name_prefix="vault-write") as write_pool:
+            self._write_pool = write_pool if self.use_threads else None
+            try:
+                processing_results = await asyncio.get_running_loop().run_in_executor(
+                    self._coordinator, process_and_finish_writes
+                )
+            finally:
+                self._write_pool = None
 
         results["steps_completed"].append("parallel_processing")
         results["parallel_stats"] = self.parallel_processor.get_processing_statistics()
@@ -169,20 +215,20 @@ class ParallelDocumentationGenerator:
         if progress_callback:
             progress_callback("Collecting and organizing results...")
 
-        generated_files = await self._collect_parallel_results(processing_results)
-        results["files_generated"].extend(generated_files)
+        results["files_generated"].extend(self._collect_parallel_results(processing_results))
         results["steps_completed"].append("result_collection")
 
         # Step 6: Generate summary and statistics
-        successful_modules = len([r for r in processing_results.values() if r.success])
-        results["statistics"]["modules_processed"] = len(processing_results)
+        total_modules = len(processing_results)
+        successful_modules = sum(1 for r in processing_results.values() if r.success)
+        results["statistics"]["modules_processed"] = total_modules
         results["statistics"]["successful_modules"] = successful_modules
-        results["statistics"]["failed_modules"] = len(processing_results) - successful_modules
+        results["statistics"]["failed_modules"] = total_modules - successful_modules
         results["statistics"]["total_files_generated"] = len(results["files_generated"])
 
         # Memory profile if enabled
         if monitor and self.enable_memory_optimization:
-            final_snapshot = monitor.get_memory_snapshot()
+            final_snapshot = monitor.get_memory_snapshot(include_object_count=True)
             results["memory_profile"] = {
                 "peak_memory_mb": final_snapshot.rss_mb,
                 "python_objects": final_snapshot.python_objects,
@@ -197,70 +243,147 @@ class ParallelDocumentationGenerator:
     def _setup_parallel_tasks(
         self, modules: list[ModuleInfo], dependencies: dict[str, set]
     ) -> None:
-        """Set up parallel processing tasks for modules."""
-        for module in modules:
+        """Set up one parallel processing task per package of modules.
+
+        Sibling modules are documented together so each Sphinx run covers a whole
+        package (keeping its cross-references) instead of a single module.
+        """
+        groups = self._group_modules_by_package(modules)
+        group_of = {module.name: group for group, members in groups.items() for module in members}
+        group_dependencies = self._group_dependencies(groups, group_of, dependencies)
+
+        for group_name, group_modules in groups.items():
             # Estimate processing complexity for prioritization
-            complexity = self.dependency_analyzer.estimate_processing_complexity(module)
+            complexity = sum(
+                self.dependency_analyzer.estimate_processing_complexity(module)
+                for module in group_modules
+            )
 
             # Higher complexity gets lower priority number (processed later)
             # This helps balance the workload
             priority = max(0, 100 - int(complexity * 10))
 
-            # Task will process this module through the entire pipeline
+            # Task will process this package through the entire pipeline
             self.parallel_processor.add_task(
-                task_id=module.name,
-                input_data=module,
-                processor_func=self._process_single_module,
-                dependencies=dependencies.get(module.name, set()),
+                task_id=group_name,
+                input_data=group_modules,
+                processor_func=partial(self._process_module_group, group_name),
+                dependencies=group_dependencies[group_name],
                 priority=priority,
                 estimated_duration=complexity,
             )
 
+    @staticmethod
+    def _group_modules_by_package(modules: list[ModuleInfo]) -> dict[str, list[ModuleInfo]]:
+        """Group modules by their parent package.
+
+        Top-level modules form their own group, which a package's own module
+        (its ``__init__``) shares with the package's direct children.
+        """
+        packages = {module.name.rpartition(".")[0] for module in modules}
+        groups: dict[str, list[ModuleInfo]] = defaultdict(list)
+        for module in modules:
+            if module.name in packages:
+                groups[module.name].append(module)
+            else:
+                groups[module.name.rpartition(".")[0] or module.name].append(module)
+        return dict(groups)
+
+    @staticmethod
+    def _group_dependencies(
+        groups: dict[str, list[ModuleInfo]],
+        group_of: dict[str, str],
+        dependencies: dict[str, set],
+    ) -> dict[str, set[str]]:
+        """Lift module dependencies to their groups, dropping edges that form cycles.
+
+        Merging modules can make two packages depend on each other even when
+        their modules do not; such edges only affect ordering, so one is dropped.
+        """
+        lifted: dict[str, set[str]] = {group: set() for group in groups}
+        for module_name, module_deps in dependencies.items():
+            group = group_of.get(module_name)
+            if group is None:
+                continue
+            lifted[group].update(
+                group_of[dep] for dep in module_deps if dep in group_of and group_of[dep] != group
+            )
+
+        # Depth-first search keeping only edges that point away from the current path
+        acyclic: dict[str, set[str]] = {group: set() for group in groups}
+        state: dict[str, int] = {}  # 1 = on the current path, 2 = finished
+
+        def visit(group: str) -> None:
+            state[group] = 1
+            for dep in sorted(lifted[group]):
+                if state.get(dep) == 1:
+                    continue
+                acyclic[group].add(dep)
+                if dep not in state:
+                    visit(dep)
+            state[group] = 2
+
+        for group in groups:
+            if group not in state:
+                visit(group)
+        return acyclic
+
     def _process_single_module(self, module: ModuleInfo) -> dict[str, Any]:
-        """Process a single module through the documentation pipeline.
+        """Process a single module through the documentation pipeline."""
+        return self._process_module_group(module.name, [module])
 
-        This function will be executed in parallel for each module.
+    def _process_module_group(self, group_name: str, modules: list[ModuleInfo]) -> dict[str, Any]:
+        """Process a group of modules through the documentation pipeline.
+
+        This function will be executed in parallel for each group.
         """
-        logger.debug(f"Processing module: {module.name}")
+        logger.debug(f"Processing module group: {group_name} ({len(modules)} modules)")
 
         try:
-            # Create a minimal project structure for this module
-            module_structure = ProjectStructure(
+            # Create one project structure covering the whole group
+            group_structure = ProjectStructure(
                 project_name=self.project_path.name,
                 root_path=self.project_path,
-                modules=[module],
+                modules=modules,
             )
 
-            # Add dependencies for this module
-            module_structure.dependencies.update(module.imports)
+            # Add dependencies for these modules
+            for module in modules:
+                group_structure.dependencies.update(module.imports)
 
-            # Step 1: Generate Sphinx documentation for this module
-            sphinx_output = self.sphinx_generator.generate_documentation(module_structure)
+            # Step 1: Generate Sphinx documentation for the group
+            sphinx_output = self.sphinx_generator.generate_documentation(group_structure)
 
             # Step 2: Convert to Obsidian format
             obsidian_docs = self._convert_module_to_obsidian(sphinx_output)
 
             # Step 3: Save to vault if configured
-            vault_files = []
-            if self.vault_manager:
-                vault_files = self._save_module_to_vault(obsidian_docs, module.name)
-
-            return {
-                "module_name": module.name,
+            vault_files: list[str] = []
+            pending_writes: list[Future[Path]] = []
+            if self.vault_manager and self._write_pool is not None:
+                # Hand the writes to the I/O pool so this worker can start its next build
+                pending_writes = self._submit_module_to_vault(obsidian_docs, group_name)
+            elif self.vault_manager:
+                vault_files = self._save_module_to_vault(obsidian_docs, group_name)
+
+            result = {
+                "module_name": group_name,
+                "modules": [module.name for module in modules],
                 "sphinx_files": len(sphinx_output.get("files", [])),
                 "obsidian_files": len(obsidian_docs.get("files", {})),
                 "vault_files": vault_files,
                 "status": "success",
             }
+            if pending_writes:
+                result["pending_vault_writes"] = pending_writes
+            return result
 
         except Exception as e:
-            logger.error(f"Failed to process module {module.name}: {e}")
-            return {"module_name": module.name, "status": "failed", "error": str(e)}
+            logger.error(f"Failed to process module group {group_name}: {e}")
+            return {"module_name": group_name, "status": "failed", "error": str(e)}
 
     def _convert_module_to_obsidian(self, sphinx_output: dict[str, Any]) -> dict[str, Any]:
         """Convert Sphinx output to Obsidian format for a single module."""
-        from docs_generator.obsidian_converter import convert_sphinx_to_obsidian
-
         sphinx_html_dir = sphinx_output.get("build_dir", Path("."))
         output_dir = Path(f"./obsidian_output_{sphinx_output.get('project_name', 'module')}")
 
@@ -274,42 +397,63 @@ class ParallelDocumentationGenerator:
         saved_files = []
 
         try:
-            docs_folder_path = self.vault_manager.ensure_folder_exists(
-                self.config.obsidian.docs_folder
-            )
-
-            # Create module-specific subdirectory
-            module_folder = docs_folder_path / module_name.replace(".", "/")
-            module_folder.mkdir(parents=True, exist_ok=True)
-
-            for file_path, content in obsidian_docs.get("files", {}).items():
-                output_path = module_folder / file_path
-                output_path.parent.mkdir(parents=True, exist_ok=True)
-
-                self.vault_manager.safe_write_file(output_path, content, create_backup=True)
-                saved_files.append(str(output_path))
+            batch = self._module_write_batch(obsidian_docs, module_name)
+            saved_files = [str(output_path) for output_path in batch.flush()]
 
         except Exception as e:
             logger.error(f"Failed to save module {module_name} to vault: {e}")
 
         return saved_files
 
-    async def _collect_parallel_results(self, processing_results: dict[str, Any]) -> list[str]:
-        """Collect and organize results from parallel processing."""
-        all_generated_files = []
-
-        for _task_id, result in processing_results.items():
-            if result.success and result.result:
-                module_result = result.result
-                if isinstance(module_result, dict) and "vault_files" in module_result:
-                    all_generated_files.extend(module_result["vault_files"])
+    def _submit_module_to_vault(
+        self, obsidian_docs: dict[str, Any], module_name: str
+    ) -> list[Future[Path]]:
+        """Start saving module documentation on the write pool without waiting."""
+        try:
+            return self._module_write_batch(obsidian_docs, module_name).submit()
+        except Exception as e:
+            logger.error(f"Failed to save module {module_name} to vault: {e}")
+            return []
 
-        return all_generated_files
+    def _module_write_batch(
+        self, obsidian_docs: dict[str, Any], module_name: str
+    ) -> VaultWriteBatch:
+        """Queue a module's documentation files for writing into its vault folder."""
+        docs_folder_path = self.vault_manager.ensure_folder_exists(self.config.obsidian.docs_folder)
+
+        # Create module-specific subdirectory
+        module_folder = docs_folder_path / module_name.replace(".", "/")
+
+        batch = VaultWriteBatch(self.vault_manager, create_backup=True, executor=self._write_pool)
+        for file_path, content in obsidian_docs.get("files", {}).items():
+            batch.add(module_folder / file_path, content)
+        return batch
+
+    def _finish_vault_writes(self, processing_results: dict[str, Any]) -> None:
+        """Wait for writes handed to the write pool and record the files saved."""
+        for result in processing_results.values():
+            module_result = result.result
+            if not (result.success and isinstance(module_result, dict)):
+                continue
+
+            for future in module_result.pop("pending_vault_writes", ()):
+                try:
+                    module_result["vault_files"].append(str(future.result()))
+                except Exception as e:
+                    logger.error(f"Failed to save {module_result['module_name']} to vault: {e}")
+
+    def _collect_parallel_results(self, processing_results: dict[str, Any]) -> Iterator[str]:
+        """Yield the vault files generated by successful parallel tasks."""
+        return chain.from_iterable(
+            result.result["vault_files"]
+            for result in processing_results.values()
+            if result.success and isinstance(result.result, dict) and "vault_files" in result.result
+        )
 
     async def _analyze_project(self):
         """Analyze the complete Python project structure."""
-        return await asyncio.get_event_loop().run_in_executor(
-            None, self.analyzer.analyze_project, self.config.project.exclude_patterns
+        return await asyncio.get_running_loop().run_in_executor(
+            self._coordinator, self.analyzer.analyze_project, self.config.project.exclude_patterns
         )
 
     def _create_generation_summary(self, results: dict[str, Any]) -> str:
@@ -363,11 +507,11 @@ class ParallelDocumentationGenerator:
             "estimated_parallel_time_seconds": parallel_time,
             "estimated_speedup_factor": speedup_factor,
             "max_workers": self.parallel_processor.max_workers,
-            "parallelism_potential": "high"
-            if independent_modules / total_modules > 0.7
-            else "moderate"
-            if independent_modules / total_modules > 0.4
-            else "low",
+            "parallelism_potential": (
+                "high"
+                if independent_modules / total_modules > 0.7
+                else "moderate" if independent_modules / total_modules > 0.4 else "low"
+            ),
             "recommendations": self._get_performance_recommendations(
                 total_modules, independent_modules, speedup_factor
             ),
@@ -4,13 +4,19 @@ This module provides functionality to process multiple modules in parallel,
 improving performance for large projects with many independent modules.
 """
 
+import asyncio
 import concurrent.futures
+import heapq
+import inspect
 import logging
 import multiprocessing
+import queue
 import threading
 import time
+from collections import defaultdict, deque
 from collections.abc import Callable
 from dataclasses import dataclass, field
+from itertools import chain, count
 from typing import Any, Generic, TypeVar
 
 logger = logging.getLogger(__name__)
@@ -31,21 +37,27 @@ class ProcessingTask(Generic[T, R]):
     estimated_duration: float = 1.0  # Estimated processing time in seconds
 
 
-@dataclass
+@dataclass(slots=True)
 class ProcessingResult(Generic[R]):
     """Represents the result of a processing task."""
 
     task_id: str
     result: R | None = None
     error: Exception | None = None
-    start_time: float = 0.0
-    end_time: float = 0.0
+    start_time: int = 0  # time.perf_counter_ns() readings
+    end_time: int = 0
     worker_id: str | None = None
+    submit_time: int = 0  # When the task was handed to a worker, if it was queued
 
     @property
     def duration(self) -> float:
-        """Get the processing duration."""
-        return self.end_time - self.start_time if self.end_time > self.start_time else 0.0
+        """Get the processing duration in seconds."""
+        return (self.end_time - self.start_time) * 1e-9
+
+    @property
+    def queue_wait(self) -> float:
+        """Get the time in seconds between submission and a worker starting the task."""
+        return (self.start_time - self.submit_time) * 1e-9 if self.submit_time else 0.0
 
     @property
     def success(self) -> bool:
@@ -53,63 +65,159 @@ class ProcessingResult(Generic[R]):
         return self.error is None
 
 
+# Per-thread cache of the worker thread's name
+_thread_local = threading.local()
+
+
+def _worker_name() -> str:
+    """Get the current thread's name, looking it up once per thread."""
+    try:
+        return _thread_local.name
+    except AttributeError:
+        _thread_local.name = threading.current_thread().name
+        return _thread_local.name
+
+
+# Read-only state shipped once to each worker process by ``_init_worker``
+_WORKER_STATE: dict[Any, Any] = {}
+
+
+def _init_worker(shared_state: dict[Any, Any]) -> None:
+    """Store the processor's shared state in a newly started worker process."""
+    _WORKER_STATE.clear()
+    _WORKER_STATE.update(shared_state)
+
+
+def _run_task(
+    task_id: str,
+    processor_func: Callable[[Any], Any],
+    input_data: Any,
+    worker_id: str | None = None,
+) -> ProcessingResult:
+    """Run one task's processor function and record its timing and outcome."""
+    result = ProcessingResult(
+        task_id=task_id, start_time=time.perf_counter_ns(), worker_id=worker_id
+    )
+
+    try:
+        logger.debug(f"Starting task {task_id}")
+        result.result = processor_func(input_data)
+        logger.debug(f"Completed task {task_id}")
+
+    except Exception as e:
+        result.error = e
+        logger.error(f"Task {task_id} failed with error: {e}")
+
+    finally:
+        result.end_time = time.perf_counter_ns()
+
+    return result
+
+
+def _run_in_worker_process(
+    batch: list[tuple[str, Callable[[Any], Any], Any]], use_shared_state: bool
+) -> list[ProcessingResult]:
+    """Run tasks in a worker process, resolving input keys against the shared state."""
+    return [
+        _run_task(
+            task_id,
+            processor_func,
+            _WORKER_STATE[input_data] if use_shared_state else input_data,
+        )
+        for task_id, processor_func, input_data in batch
+    ]
+
+
 class DependencyResolver:
     """Resolves task dependencies and determines execution order."""
 
     def __init__(self):
         self.tasks: dict[str, ProcessingTask] = {}
         self.resolved_order: list[str] = []
+        # Estimated duration of each task plus its longest chain of dependents
+        self.critical_paths: dict[str, float] = {}
+        # Result of the last resolve_dependencies call, cleared when tasks change
+        self._resolved: list[list[str]] | None = None
 
     def add_task(self, task: ProcessingTask) -> None:
         """Add a task to the dependency graph."""
         self.tasks[task.task_id] = task
+        self._resolved = None
         logger.debug(f"Added task {task.task_id} with dependencies: {task.dependencies}")
 
     def resolve_dependencies(self) -> list[list[str]]:
         """Resolve dependencies and return tasks grouped by execution level.
 
+        Also computes ``critical_paths``. Within a level, tasks with the longest
+        critical path come first, then higher ``priority``. The result is cached
+        until another task is added, so callers must not modify it.
+
         Returns:
             List of lists, where each inner list contains task IDs that can
             be executed in parallel (no dependencies between them).
         """
-        # Build dependency graph
-        remaining_tasks = set(self.tasks.keys())
-        completed_tasks: set[str] = set()
+        if self._resolved is not None:
+            return self._resolved
+
+        # Kahn's algorithm: count unmet dependencies and invert the edges once
+        indegree = {task_id: len(task.dependencies) for task_id, task in self.tasks.items()}
+        children: dict[str, list[str]] = defaultdict(list)
+        for task_id, task in self.tasks.items():
+            for dependency in task.dependencies:
+                children[dependency].append(task_id)
+
+        ready = deque(task_id for task_id, degree in indegree.items() if degree == 0)
         execution_levels: list[list[str]] = []
+        processed = 0
+
+        while ready:
+            # Everything currently ready forms one level
+            level = list(ready)
+            ready.clear()
+            execution_levels.append(level)
+            processed += len(level)
+
+            for task_id in level:
+                for child in children.get(task_id, ()):
+                    indegree[child] -= 1
+                    if indegree[child] == 0:
+                        ready.append(child)
+
+        if processed != len(self.tasks):
+            # Circular dependency or missing dependency
+            completed_tasks = {task_id for level in execution_levels for task_id in level}
+            remaining_deps = [
+                f"{task_id} -> {task.dependencies - completed_tasks}"
+                for task_id, task in self.tasks.items()
+                if task_id not in completed_tasks
+            ]
+            raise ValueError(f"Circular dependency or missing tasks detected: {remaining_deps}")
+
+        # Walk the levels backwards so every dependent is costed before its dependencies
+        critical_paths: dict[str, float] = {}
+        for level in reversed(execution_levels):
+            for task_id in level:
+                critical_paths[task_id] = self.tasks[task_id].estimated_duration + max(
+                    (critical_paths[child] for child in children.get(task_id, ())), default=0.0
+                )
+        self.critical_paths = critical_paths
 
-        while remaining_tasks:
-            # Find tasks that can be executed (all dependencies met)
-            ready_tasks = []
-            for task_id in remaining_tasks:
-                task = self.tasks[task_id]
-                if task.dependencies.issubset(completed_tasks):
-                    ready_tasks.append(task_id)
-
-            if not ready_tasks:
-                # Circular dependency or missing dependency
-                remaining_deps = []
-                for task_id in remaining_tasks:
-                    task = self.tasks[task_id]
-                    missing = task.dependencies - completed_tasks
-                    if missing:
-                        remaining_deps.append(f"{task_id} -> {missing}")
-
-                raise ValueError(f"Circular dependency or missing tasks detected: {remaining_deps}")
-
-            # Sort by priority (higher priority first)
-            ready_tasks.sort(key=lambda tid: self.tasks[tid].priority, reverse=True)
-            execution_levels.append(ready_tasks)
-
-            # Mark ready tasks as completed for next iteration
-            for task_id in ready_tasks:
-                remaining_tasks.remove(task_id)
-                completed_tasks.add(task_id)
+        for level in execution_levels:
+            level.sort(key=self.scheduling_key, reverse=True)
+        self._resolved = execution_levels
 
         logger.info(
             f"Resolved {len(self.tasks)} tasks into {len(execution_levels)} execution levels"
         )
         return execution_levels
 
+    def scheduling_key(self, task_id: str) -> tuple[float, int]:
+        """Get the ordering key for a task, larger keys being scheduled first.
+
+        Only valid after ``resolve_dependencies`` has been called.
+        """
+        return self.critical_paths[task_id], self.tasks[task_id].priority
+
 
 class ParallelProcessor:
     """Manages parallel processing of tasks with dependency resolution."""
@@ -119,6 +227,10 @@ class ParallelProcessor:
         max_workers: int | None = None,
         use_threads: bool = True,
         timeout_per_task: float = 300.0,  # 5 minutes default
+        batch_size: int = 1,
+        shared_state: dict[Any, Any] | None = None,
+        cancel_dependents: bool = True,
+        fail_fast: bool = False,
     ):
         """Initialize the parallel processor.
 
@@ -126,10 +238,23 @@ class ParallelProcessor:
             max_workers: Maximum number of worker processes/threads
             use_threads: Use threads instead of processes
             timeout_per_task: Timeout per task in seconds
+            batch_size: Maximum number of ready tasks run by one submission when
+                        there are more ready tasks than free workers (threads only)
+            shared_state: Read-only data shared by all tasks. When given, each
+                          task's input_data is a key into it. Worker processes
+                          receive it once at startup instead of with every task.
+            cancel_dependents: Skip tasks whose dependencies failed or were skipped,
+                               recording them as cancelled instead of running them
+            fail_fast: Stop starting new tasks once any task fails
         """
         self.max_workers = max_workers or min(32, (multiprocessing.cpu_count() or 1) + 4)
         self.use_threads = use_threads
         self.timeout_per_task = timeout_per_task
+        # Batches would have to be pickled as a whole for worker processes
+        self.batch_size = max(1, batch_size) if use_threads else 1
+        self.shared_state = shared_state
+        self.cancel_dependents = cancel_dependents
+        self.fail_fast = fail_fast
         self.dependency_resolver = DependencyResolver()
         self.results: dict[str, ProcessingResult] = {}
 
@@ -173,6 +298,10 @@ class ParallelProcessor:
     ) -> dict[str, ProcessingResult]:
         """Process all tasks in parallel, respecting dependencies.
 
+        Each task is submitted as soon as all of its dependencies have finished,
+        rather than waiting for a whole dependency level, so the run is bounded
+        by the dependency graph's critical path.
+
         Args:
             progress_callback: Optional callback for progress updates
                                (message, progress)
@@ -180,38 +309,29 @@ class ParallelProcessor:
         Returns:
             Dictionary of task results
         """
-        if not self.dependency_resolver.tasks:
+        tasks = self.dependency_resolver.tasks
+        if not tasks:
             logger.warning("No tasks to process")
             return {}
 
+        # Validates the graph, raising on circular or missing dependencies
         execution_levels = self.dependency_resolver.resolve_dependencies()
-        total_tasks = len(self.dependency_resolver.tasks)
-        completed_tasks = 0
-
-        logger.info(f"Starting parallel processing of {total_tasks} tasks")
-
-        for level_idx, task_ids in enumerate(execution_levels):
-            logger.info(
-                f"Processing level {level_idx + 1}/{len(execution_levels)}: {len(task_ids)} tasks"
-            )
+        total_tasks = len(tasks)
 
-            if progress_callback:
-                progress_callback(
-                    f"Processing level {level_idx + 1}/{len(execution_levels)}",
-                    completed_tasks / total_tasks,
-                )
-
-            # Process tasks in this level in parallel
-            level_results = self._process_task_level(task_ids)
-            self.results.update(level_results)
+        logger.info(
+            f"Starting parallel processing of {total_tasks} tasks "
+            f"({len(execution_levels)} dependency levels)"
+        )
 
-            # Check for failures
-            failed_tasks = [tid for tid, result in level_results.items() if not result.success]
-            if failed_tasks:
-                logger.error(f"Failed tasks in level {level_idx + 1}: {failed_tasks}")
-                # Optionally continue or stop based on failure handling strategy
+        if self.use_threads and (total_tasks == 1 or self.max_workers == 1):
+            # Nothing could overlap, so skip the executor and run in schedule order
+            self._process_sequentially(execution_levels, progress_callback)
+        else:
+            self._process_with_executor(progress_callback)
 
-            completed_tasks += len(task_ids)
+        failed_tasks = [tid for tid, result in self.results.items() if not result.success]
+        if failed_tasks:
+            logger.error(f"Failed tasks: {failed_tasks}")
 
         if progress_callback:
             progress_callback("Processing complete", 1.0)
@@ -227,97 +347,280 @@ class ParallelProcessor:
 
         return self.results
 
-    def _process_task_level(self, task_ids: list[str]) -> dict[str, ProcessingResult]:
-        """Process a level of independent tasks in parallel."""
-        if not task_ids:
-            return {}
-
-        tasks = [self.dependency_resolver.tasks[tid] for tid in task_ids]
-        level_results = {}
-
-        # Choose executor type based on configuration
-        executor_class = (
-            concurrent.futures.ThreadPoolExecutor
-            if self.use_threads
-            else concurrent.futures.ProcessPoolExecutor
-        )
+    def _process_sequentially(
+        self,
+        execution_levels: list[list[str]],
+        progress_callback: Callable[[str, float], None] | None,
+    ) -> None:
+        """Run every task in the calling thread, in schedule order."""
+        tasks = self.dependency_resolver.tasks
+        total_tasks = len(tasks)
+
+        failure: str | None = None
+
+        for completed_tasks, task_id in enumerate(chain.from_iterable(execution_levels), 1):
+            task = tasks[task_id]
+            reason = self._cancel_reason(task, failure)
+            if reason:
+                result = self._cancelled_result(task_id, reason)
+            else:
+                result = self._execute_task(task)
+                if not result.success:
+                    failure = failure or task_id
+            self._log_result(result)
+            self.results[task_id] = result
 
-        with executor_class(max_workers=min(self.max_workers, len(tasks))) as executor:
-            # Submit all tasks
-            future_to_task = {executor.submit(self._execute_task, task): task for task in tasks}
+            if progress_callback:
+                progress_callback(
+                    f"Completed {completed_tasks}/{total_tasks} tasks",
+                    completed_tasks / total_tasks,
+                )
 
-            # Collect results as they complete
-            for future in concurrent.futures.as_completed(future_to_task, timeout=None):
-                task = future_to_task[future]
+    def _process_with_executor(
+        self, progress_callback: Callable[[str, float], None] | None
+    ) -> None:
+        """Run tasks on an executor, submitting each once its dependencies finish."""
+        tasks = self.dependency_resolver.tasks
+        total_tasks = len(tasks)
+        completed_tasks = 0
 
-                try:
-                    result = future.result(timeout=self.timeout_per_task)
-                    level_results[task.task_id] = result
+        # Unfinished dependencies per task, and the tasks waiting on each task
+        pending_deps = {task_id: len(task.dependencies) for task_id, task in tasks.items()}
+        dependents: dict[str, list[str]] = defaultdict(list)
+        for task_id, task in tasks.items():
+            for dependency in task.dependencies:
+                dependents[dependency].append(task_id)
+
+        # Runnable tasks, longest critical path first, then highest priority, then
+        # in the order they were added
+        ready: list[tuple[float, int, int, str]] = []
+        order = count()
+
+        def mark_ready(task_id: str) -> None:
+            critical_path, priority = self.dependency_resolver.scheduling_key(task_id)
+            heapq.heappush(ready, (-critical_path, -priority, next(order), task_id))
+
+        for task_id, remaining in pending_deps.items():
+            if remaining == 0:
+                mark_ready(task_id)
+
+        # First task that failed, once fail_fast stops scheduling
+        failure: str | None = None
+
+        def record(result: ProcessingResult) -> int:
+            """Store a result and release its dependents, returning tasks finished."""
+            finished_count = 0
+            stack = [result]
+            while stack:
+                result = stack.pop()
+                self.results[result.task_id] = result
+                finished_count += 1
+
+                for dependent in dependents.get(result.task_id, ()):
+                    pending_deps[dependent] -= 1
+                    if pending_deps[dependent] == 0:
+                        reason = self._cancel_reason(tasks[dependent], failure)
+                        if reason:
+                            # Never submitted; its own dependents are skipped in turn
+                            stack.append(self._cancelled_result(dependent, reason))
+                        else:
+                            mark_ready(dependent)
+            return finished_count
 
-                    if result.success:
-                        logger.debug(f"Task {task.task_id} completed in {result.duration:.2f}s")
-                    else:
-                        logger.error(f"Task {task.task_id} failed: {result.error}")
+        # Choose executor type based on configuration
+        max_workers = min(self.max_workers, total_tasks)
+        if self.use_threads:
+            executor = concurrent.futures.ThreadPoolExecutor(max_workers=max_workers)
+        else:
+            executor = concurrent.futures.ProcessPoolExecutor(
+                max_workers=max_workers,
+                initializer=_init_worker,
+                initargs=(self.shared_state or {},),
+            )
 
-                except concurrent.futures.TimeoutError:
-                    logger.error(f"Task {task.task_id} timed out after {self.timeout_per_task}s")
-                    level_results[task.task_id] = ProcessingResult(
-                        task_id=task.task_id,
-                        error=TimeoutError(f"Task timed out after {self.timeout_per_task}s"),
+        with executor:
+            running: dict[concurrent.futures.Future, tuple[list[ProcessingTask], int]] = {}
+            # Futures report completion here themselves, so the loop blocks on a single
+            # queue rather than re-registering a waiter on every running future
+            finished: queue.SimpleQueue[concurrent.futures.Future] = queue.SimpleQueue()
+
+            while ready or running:
+                # Only hand the executor as many submissions as it has workers, so a
+                # task that becomes ready later can still overtake lower priorities.
+                # When tasks outnumber free workers, each submission runs a batch.
+                while ready and len(running) < max_workers:
+                    free_workers = max_workers - len(running)
+                    size = min(self.batch_size, -(-len(ready) // free_workers))
+                    batch = [tasks[heapq.heappop(ready)[-1]] for _ in range(size)]
+                    submit_time = time.perf_counter_ns()
+                    future = self._submit_batch(executor, batch)
+                    running[future] = batch, submit_time
+                    future.add_done_callback(finished.put)
+
+                future = finished.get()
+                batch, submit_time = running.pop(future)
+                if future.cancelled():
+                    # Only the fail_fast shutdown cancels submitted work that had not started
+                    reason = f"Processing stopped after task {failure} failed"
+                    results = [self._cancelled_result(task.task_id, reason) for task in batch]
+                else:
+                    results = self._collect_results(batch, future)
+
+                for result in results:
+                    if result.start_time:
+                        result.submit_time = submit_time
+
+                    if not result.success and self.fail_fast and failure is None:
+                        failure = result.task_id
+                        executor.shutdown(wait=False, cancel_futures=True)
+                        stopped = [entry[-1] for entry in ready]
+                        ready.clear()
+                        for task_id in stopped:
+                            completed_tasks += record(
+                                self._cancelled_result(
+                                    task_id, f"Processing stopped after task {failure} failed"
+                                )
+                            )
+
+                    completed_tasks += record(result)
+
+                if progress_callback:
+                    progress_callback(
+                        f"Completed {completed_tasks}/{total_tasks} tasks",
+                        completed_tasks / total_tasks,
                     )
 
-                except Exception as e:
-                    logger.error(f"Unexpected error processing task {task.task_id}: {e}")
-                    level_results[task.task_id] = ProcessingResult(task_id=task.task_id, error=e)
+    def _collect_results(
+        self, batch: list[ProcessingTask], future: concurrent.futures.Future
+    ) -> list[ProcessingResult]:
+        """Get the results of a finished batch future."""
+        try:
+            results = future.result(timeout=self.timeout_per_task)
+
+        except concurrent.futures.TimeoutError:
+            for task in batch:
+                logger.error(f"Task {task.task_id} timed out after {self.timeout_per_task}s")
+            return [
+                ProcessingResult(
+                    task_id=task.task_id,
+                    error=TimeoutError(f"Task timed out after {self.timeout_per_task}s"),
+                )
+                for task in batch
+            ]
 
-        return level_results
+        except Exception as e:
+            for task in batch:
+                logger.error(f"Unexpected error processing task {task.task_id}: {e}")
+            return [ProcessingResult(task_id=task.task_id, error=e) for task in batch]
 
-    def _execute_task(self, task: ProcessingTask) -> ProcessingResult:
-        """Execute a single task and return the result."""
-        result = ProcessingResult(
-            task_id=task.task_id,
-            start_time=time.time(),
-            worker_id=threading.current_thread().name if self.use_threads else None,
-        )
+        for result in results:
+            self._log_result(result)
+        return results
 
-        try:
-            logger.debug(f"Starting task {task.task_id}")
-            result.result = task.processor_func(task.input_data)
-            logger.debug(f"Completed task {task.task_id}")
+    @staticmethod
+    def _log_result(result: ProcessingResult) -> None:
+        """Log the outcome of a finished task."""
+        if result.success:
+            logger.debug(f"Task {result.task_id} completed in {result.duration:.2f}s")
+        else:
+            logger.error(f"Task {result.task_id} failed: {result.error}")
 
-        except Exception as e:
-            result.error = e
-            logger.error(f"Task {task.task_id} failed with error: {e}")
+    def _cancel_reason(self, task: ProcessingTask, failure: str | None) -> str | None:
+        """Get why a task whose dependencies are done should not run, if it should not.
 
-        finally:
-            result.end_time = time.time()
+        Args:
+            task: Task about to be started
+            failure: First failed task, if fail_fast has stopped processing
+        """
+        if failure is not None and self.fail_fast:
+            return f"Processing stopped after task {failure} failed"
+        if self.cancel_dependents:
+            for dependency in task.dependencies:
+                if not self.results[dependency].success:
+                    return f"Dependency {dependency} failed"
+        return None
+
+    @staticmethod
+    def _cancelled_result(task_id: str, reason: str) -> ProcessingResult:
+        """Create the result recorded for a task that was never started."""
+        return ProcessingResult(task_id=task_id, error=concurrent.futures.CancelledError(reason))
+
+    def _submit_batch(
+        self, executor: concurrent.futures.Executor, batch: list[ProcessingTask]
+    ) -> concurrent.futures.Future:
+        """Submit a batch of independent tasks to run one after another on one worker."""
+        if self.use_threads:
+            return executor.submit(self._execute_batch, batch)
+
+        # Only ship what the task needs, not the processor and its whole task graph
+        payload = [(task.task_id, task.processor_func, task.input_data) for task in batch]
+        return executor.submit(_run_in_worker_process, payload, self.shared_state is not None)
+
+    def _execute_batch(self, batch: list[ProcessingTask]) -> list[ProcessingResult]:
+        """Execute a batch of tasks on the current worker thread."""
+        return [self._execute_task(task) for task in batch]
 
-        return result
+    def _execute_task(self, task: ProcessingTask) -> ProcessingResult:
+        """Execute a single task and return the result."""
+        input_data = task.input_data
+        if self.shared_state is not None:
+            input_data = self.shared_state[input_data]
+        return _run_task(task.task_id, task.processor_func, input_data, _worker_name())
 
     def get_processing_statistics(self) -> dict[str, Any]:
         """Get detailed processing statistics."""
         if not self.results:
             return {"message": "No processing results available"}
 
-        successful_results = [r for r in self.results.values() if r.success]
-        failed_results = [r for r in self.results.values() if not r.success]
-
-        total_time = sum(r.duration for r in self.results.values())
-        successful_time = sum(r.duration for r in successful_results)
+        # Gather everything in a single pass over the results
+        successful = 0
+        total_time = 0.0
+        successful_time = 0.0
+        max_time = 0.0
+        min_time = float("inf")
+        failed_task_ids = []
+        queued = 0
+        total_wait = 0.0
+        max_wait = 0.0
+        min_wait = float("inf")
+
+        for r in self.results.values():
+            duration = r.duration
+            total_time += duration
+            if r.submit_time:
+                wait = r.queue_wait
+                queued += 1
+                total_wait += wait
+                max_wait = max(max_wait, wait)
+                min_wait = min(min_wait, wait)
+            if r.success:
+                successful += 1
+                successful_time += duration
+                max_time = max(max_time, duration)
+                min_time = min(min_time, duration)
+            else:
+                failed_task_ids.append(r.task_id)
 
         return {
             "total_tasks": len(self.results),
-            "successful_tasks": len(successful_results),
-            "failed_tasks": len(failed_results),
-            "success_rate": len(successful_results) / len(self.results) if self.results else 0,
+            "successful_tasks": successful,
+            "failed_tasks": len(failed_task_ids),
+            "success_rate": successful / len(self.results),
             "total_processing_time": total_time,
             "successful_processing_time": successful_time,
-            "average_task_time": successful_time / len(successful_results)
-            if successful_results
-            else 0,
-            "max_task_time": max((r.duration for r in successful_results), default=0),
-            "min_task_time": min((r.duration for r in successful_results), default=0),
-            "failed_task_ids": [r.task_id for r in failed_results],
+            "average_task_time": successful_time / successful if successful else 0,
+            "max_task_time": max_time if successful else 0,
+            "min_task_time": min_time if successful else 0,
+            "failed_task_ids": failed_task_ids,
+            "queue_wait_time": {
+                "average": total_wait / queued if queued else 0,
+                "max": max_wait if queued else 0,
+                "min": min_wait if queued else 0,
+            },
+            "critical_path_length": max(
+                self.dependency_resolver.critical_paths.values(), default=0.0
+            ),
+            "critical_paths": dict(self.dependency_resolver.critical_paths),
             "worker_configuration": {
                 "max_workers": self.max_workers,
                 "use_threads": self.use_threads,
@@ -326,6 +629,117 @@ class ParallelProcessor:
         }
 
 
+class AsyncParallelProcessor(ParallelProcessor):
+    """Parallel processor that schedules tasks on the running asyncio event loop.
+
+    Suited to I/O-bound tasks: coroutine functions are awaited directly, while
+    plain functions run in the loop's default executor. At most ``max_workers``
+    tasks run at once, and each task starts as soon as its dependencies finish.
+    Use ``aprocess_all``; the inherited ``process_all`` still runs the tasks on
+    the worker pool.
+    """
+
+    async def aprocess_all(
+        self, progress_callback: Callable[[str, float], None] | None = None
+    ) -> dict[str, ProcessingResult]:
+        """Process all tasks concurrently on the event loop, respecting dependencies.
+
+        Args:
+            progress_callback: Optional callback for progress updates
+                               (message, progress)
+
+        Returns:
+            Dictionary of task results
+        """
+        tasks = self.dependency_resolver.tasks
+        if not tasks:
+            logger.warning("No tasks to process")
+            return {}
+
+        # Validates the graph, raising on circular or missing dependencies
+        execution_levels = self.dependency_resolver.resolve_dependencies()
+        total_tasks = len(tasks)
+        completed_tasks = 0
+
+        logger.info(
+            f"Starting async processing of {total_tasks} tasks "
+            f"({len(execution_levels)} dependency levels)"
+        )
+
+        semaphore = asyncio.Semaphore(self.max_workers)
+        finished = {task_id: asyncio.Event() for task_id in tasks}
+        failure: str | None = None
+
+        async def run(task: ProcessingTask) -> None:
+            nonlocal completed_tasks, failure
+            for dependency in task.dependencies:
+                await finished[dependency].wait()
+
+            ready_time = time.perf_counter_ns()
+            async with semaphore:
+                reason = self._cancel_reason(task, failure)
+                if reason:
+                    result = self._cancelled_result(task.task_id, reason)
+                else:
+                    result = await self._execute_task_async(task)
+                    result.submit_time = ready_time
+                    if not result.success:
+                        failure = failure or task.task_id
+
+            self._log_result(result)
+            self.results[task.task_id] = result
+            finished[task.task_id].set()
+            completed_tasks += 1
+
+            if progress_callback:
+                progress_callback(
+                    f"Completed {completed_tasks}/{total_tasks} tasks",
+                    completed_tasks / total_tasks,
+                )
+
+        # Start tasks in schedule order so the semaphore admits critical paths first
+        await asyncio.gather(
+            *(run(tasks[task_id]) for level in execution_levels for task_id in level)
+        )
+
+        if progress_callback:
+            progress_callback("Processing complete", 1.0)
+
+        successful = sum(1 for result in self.results.values() if result.success)
+        logger.info(f"Async processing complete: {successful}/{total_tasks} successful")
+
+        return self.results
+
+    async def _execute_task_async(self, task: ProcessingTask) -> ProcessingResult:
+        """Execute a single task on the event loop and return the result."""
+        input_data = task.input_data
+        if self.shared_state is not None:
+            input_data = self.shared_state[input_data]
+
+        result = ProcessingResult(task_id=task.task_id, start_time=time.perf_counter_ns())
+
+        try:
+            async with asyncio.timeout(self.timeout_per_task):
+                if inspect.iscoroutinefunction(task.processor_func):
+                    result.result = await task.processor_func(input_data)
+                else:
+                    loop = asyncio.get_running_loop()
+                    result.result = await loop.run_in_executor(
+                        None, task.processor_func, input_data
+                    )
+
+        except TimeoutError:
+            result.error = TimeoutError(f"Task timed out after {self.timeout_per_task}s")
+
+        except Exception as e:
+            result.error = e
+
+        finally:
+            result.end_time = time.perf_counter_ns()
+
+        return result
+
+
 class ModuleDependencyAnalyzer:
     """Analyzes module dependencies to optimize parallel processing order."""
 
@@ -342,20 +756,21 @@ class ModuleDependencyAnalyzer:
         Returns:
             Dictionary mapping module names to their dependencies
         """
+        module_names = {module.name for module in modules}
+
         # Build import graph
         for module in modules:
             module_name = module.name
             self.import_graph[module_name] = set()
 
-            # Add internal imports as dependencies
+            # Add internal imports as dependencies, resolving each import to the
+            # longest dotted prefix that names another module in our set
             for import_name in module.imports:
-                # Check if this import refers to another module in our set
-                for other_module in modules:
-                    if import_name == other_module.name or import_name.startswith(
-                        other_module.name + "."
-                    ):
-                        self.import_graph[module_name].add(other_module.name)
-                        break
+                candidate = import_name
+                while candidate not in module_names and "." in candidate:
+                    candidate = candidate.rpartition(".")[0]
+                if candidate in module_names:
+                    self.import_graph[module_name].add(candidate)
 
         # Remove self-references
         for module_name in self.import_graph:
@@ -368,19 +783,45 @@ class ModuleDependencyAnalyzer:
         return dict(self.import_graph)
 
     def _reduce_transitive_dependencies(self) -> None:
-        """Remove transitive dependencies to minimize the dependency graph."""
-        # For each module, remove dependencies that are implied by other dependencies
-        for module_name in self.import_graph:
-            deps = self.import_graph[module_name].copy()
+        """Remove transitive dependencies to minimize the dependency graph.
 
-            for dep in list(deps):
-                # If any other dependency already depends on this one, remove it
-                for other_dep in deps:
-                    if other_dep != dep and dep in self.import_graph.get(other_dep, set()):
-                        deps.discard(dep)
-                        break
-
-            self.import_graph[module_name] = deps
+        A dependency ``u -> v`` is dropped when another dependency ``w`` of ``u``
+        already reaches ``v`` through any number of hops. Reachability sets are
+        stored as integer bitmasks indexed by module position. Edges inside an
+        import cycle are kept, so the reduced graph reaches the same modules.
+        """
+        names = list(self.import_graph)
+        index = {name: i for i, name in enumerate(names)}
+        successors = [
+            [index[dep] for dep in self.import_graph[name] if dep in index] for name in names
+        ]
+
+        # reachable[i] has bit j set when module j can be reached from module i
+        reachable = []
+        for start in range(len(names)):
+            seen = 0
+            stack = [start]
+            while stack:
+                for succ in successors[stack.pop()]:
+                    if not (seen >> succ) & 1:
+                        seen |= 1 << succ
+                        stack.append(succ)
+            reachable.append(seen)
+
+        for u, direct in enumerate(successors):
+            # Only dependencies that cannot lead back to this module may stand in for
+            # an edge, otherwise the path that replaces the edge could run through it
+            others = [w for w in direct if not (reachable[w] >> u) & 1]
+            redundant = {
+                names[v]
+                for v in direct
+                if any(
+                    w != v and (reachable[w] >> v) & 1 and not (reachable[v] >> w) & 1
+                    for w in others
+                )
+            }
+            if redundant:
+                self.import_graph[names[u]] -= redundant
 
     def get_independent_modules(self) -> list[str]:
         """Get modules that have no dependencies and can be processed first."""
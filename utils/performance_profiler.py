@@ -4,8 +4,11 @@ This module provides tools for profiling and optimizing critical performance pat
 in the documentation generation process.
 """
 
+import atexit
 import cProfile
+import json
 import logging
+import os
 import pstats
 import threading
 import time
@@ -15,32 +18,50 @@ from contextlib import contextmanager
 from dataclasses import dataclass, field
 from functools import wraps
 from pathlib import Path
-from typing import Any
+from typing import Any, Literal
 
 import psutil
 
+try:
+    import orjson
+
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
+# Allocations made by the import machinery or tracemalloc itself are noise in memory traces
+_MEMORY_TRACE_FILTERS = (
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    tracemalloc.Filter(False, tracemalloc.__file__),
+)
+_MB = 1024 * 1024
+
 
-@dataclass
+@dataclass(slots=True)
 class PerformanceMetrics:
     """Performance metrics for a code execution."""
 
     name: str
     duration: float
-    memory_peak: int = 0
+    memory_peak: int = 0  # Highest memory reached during the section, above its start
     memory_current: int = 0
     cpu_percent: float = 0.0
     calls_count: int = 0
     cumulative_time: float = 0.0
     profile_stats: pstats.Stats | None = None
     memory_trace: tracemalloc.Snapshot | None = None
+    duration_ns: int = 0  # Exact duration when measured by the profiler
 
     def to_dict(self) -> dict[str, Any]:
         """Convert metrics to dictionary."""
         return {
             "name": self.name,
             "duration": self.duration,
+            "duration_ns": self.duration_ns,
             "memory_peak": self.memory_peak,
             "memory_current": self.memory_current,
             "cpu_percent": self.cpu_percent,
@@ -51,7 +72,7 @@ class PerformanceMetrics:
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class PerformanceReport:
     """Comprehensive performance analysis report."""
 
@@ -73,18 +94,66 @@ class PerformanceReport:
         # Find operations that take more than threshold% of total time
         threshold_time = self.total_duration * threshold_ratio
 
-        bottlenecks = []
-        for metric in self.metrics:
-            if metric.duration > threshold_time:
-                bottlenecks.append(
-                    f"{metric.name}: {metric.duration:.3f}s "
-                    f"({metric.duration / self.total_duration * 100:.1f}% of total)"
-                )
+        slow_metrics = [metric for metric in self.metrics if metric.duration > threshold_time]
+        if not slow_metrics:
+            self.bottlenecks = []
+            return
 
-        self.bottlenecks = bottlenecks
+        # Only the offending operations are formatted
+        percent_scale = 100 / self.total_duration
+        self.bottlenecks = [
+            f"{metric.name}: {metric.duration:.3f}s "
+            f"({metric.duration * percent_scale:.1f}% of total)"
+            for metric in slow_metrics
+        ]
 
     def generate_recommendations(self) -> None:
         """Generate performance optimization recommendations."""
+        cpu_intensive_ops = []
+        high_call_ops = []
+        for metric in self.metrics:
+            if metric.cpu_percent > 80:
+                cpu_intensive_ops.append(metric.name)
+            if metric.calls_count > 10000:
+                high_call_ops.append(metric.name)
+
+        self._build_recommendations(cpu_intensive_ops, high_call_ops)
+
+    def finalize(self, threshold_ratio: float = 0.2) -> None:
+        """Compute totals, bottlenecks and recommendations from the metrics.
+
+        Totals and the per-metric recommendation checks come from a single pass
+        over the metrics; only the bottleneck check needs a second one, since its
+        threshold depends on the total duration.
+
+        Args:
+            threshold_ratio: Share of the total duration that makes a bottleneck
+        """
+        cpu_intensive_ops = []
+        high_call_ops = []
+
+        if self.metrics:
+            total_duration = 0.0
+            peak_memory = self.metrics[0].memory_peak
+            for metric in self.metrics:
+                total_duration += metric.duration
+                if metric.memory_peak > peak_memory:
+                    peak_memory = metric.memory_peak
+                if metric.cpu_percent > 80:
+                    cpu_intensive_ops.append(metric.name)
+                if metric.calls_count > 10000:
+                    high_call_ops.append(metric.name)
+
+            self.total_duration = total_duration
+            self.peak_memory = peak_memory
+
+        self.identify_bottlenecks(threshold_ratio)
+        self._build_recommendations(cpu_intensive_ops, high_call_ops)
+
+    def _build_recommendations(
+        self, cpu_intensive_ops: list[str], high_call_ops: list[str]
+    ) -> None:
+        """Set the recommendations from the report totals and flagged operations."""
         recommendations = []
 
         # High memory usage recommendations
@@ -102,19 +171,17 @@ class PerformanceReport:
             )
 
         # High CPU usage recommendations
-        cpu_intensive_ops = [m for m in self.metrics if m.cpu_percent > 80]
         if cpu_intensive_ops:
             recommendations.append(
                 f"CPU-intensive operations detected: "
-                f"{', '.join(m.name for m in cpu_intensive_ops)}. "
+                f"{', '.join(cpu_intensive_ops)}. "
                 "Consider optimizing algorithms or implementing parallel processing."
             )
 
         # Many function calls recommendations
-        high_call_ops = [m for m in self.metrics if m.calls_count > 10000]
         if high_call_ops:
             recommendations.append(
-                f"High function call counts detected: {', '.join(m.name for m in high_call_ops)}. "
+                f"High function call counts detected: {', '.join(high_call_ops)}. "
                 "Consider caching results or optimizing algorithms."
             )
 
@@ -131,27 +198,190 @@ class PerformanceReport:
         }
 
 
+@dataclass(slots=True)
+class _SectionSamples:
+    """Resource samples collected while a profiling section is active.
+
+    CPU readings are kept as a running total and count, so a long section holds
+    constant state however many ticks it spans.
+    """
+
+    cpu_total: float = 0.0
+    cpu_count: int = 0
+    track_rss: bool = False
+    peak_rss: int = 0
+
+    @property
+    def cpu_average(self) -> float:
+        """Get the average CPU usage over the recorded samples."""
+        return self.cpu_total / self.cpu_count if self.cpu_count else 0.0
+
+
+class _ResourceSampler:
+    """Daemon thread that samples process resources for every active profiling section.
+
+    One sampler is shared by all profilers, so starting a section only registers its
+    samples instead of spawning a monitoring thread.
+    """
+
+    def __init__(self, interval: float = 0.1):
+        self.interval = interval
+        self._active: dict[int, _SectionSamples] = {}
+        self._lock = threading.Lock()
+        # Signalled when a section registers or the sampler stops, so an idle sampler
+        # sleeps instead of sampling
+        self._wakeup = threading.Condition(self._lock)
+        self._thread: threading.Thread | None = None
+        # Plain flag rather than an Event, so a tick costs no lock round trip
+        self._stopping = False
+        self._process: psutil.Process | None = None
+
+    @property
+    def process(self) -> psutil.Process:
+        """Get the shared handle for the current process."""
+        if self._process is None:
+            self._process = psutil.Process()
+        return self._process
+
+    def add(self, samples: _SectionSamples) -> None:
+        """Start recording samples for a section."""
+        with self._lock:
+            self._active[id(samples)] = samples
+            self._stopping = False
+            self._wakeup.notify()
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._run, name="resource-sampler", daemon=True
+                )
+                self._thread.start()
+
+    def discard(self, samples: _SectionSamples) -> None:
+        """Stop recording samples for a section."""
+        with self._lock:
+            self._active.pop(id(samples), None)
+
+    def stop(self) -> None:
+        """Stop the sampler thread."""
+        with self._lock:
+            self._stopping = True
+            self._wakeup.notify()
+        if self._thread and self._thread.is_alive():
+            self._thread.join(timeout=1.0)
+
+    def _run(self) -> None:
+        process = self.process
+        next_tick = None
+        while True:
+            if next_tick is None:
+                # Idle until a section registers, rather than sampling for nobody
+                with self._lock:
+                    while not self._active and not self._stopping:
+                        self._wakeup.wait()
+                if self._stopping:
+                    break
+
+                # cpu_percent() reports usage since the previous call, so prime it to
+                # make the first sample cover one interval. Ticks are scheduled from a
+                # fixed start, so time spent sampling does not make the interval drift.
+                process.cpu_percent(interval=None)
+                next_tick = time.monotonic()
+
+            next_tick += self.interval  # Sample every 100ms
+            time.sleep(max(0.0, next_tick - time.monotonic()))
+            if self._stopping:
+                break
+
+            cpu_percent = process.cpu_percent(interval=None)
+            with self._lock:
+                active = list(self._active.values())
+            if not active:
+                next_tick = None
+                continue
+
+            rss = process.memory_info().rss if any(s.track_rss for s in active) else 0
+            for samples in active:
+                samples.cpu_total += cpu_percent
+                samples.cpu_count += 1
+                if samples.peak_rss < rss:
+                    samples.peak_rss = rss
+
+
+_sampler = _ResourceSampler()
+atexit.register(_sampler.stop)
+
+
+@dataclass(slots=True)
+class _ThreadSections:
+    """Sections a single thread has open on a profiler."""
+
+    stack: list[str] = field(default_factory=list)
+    start_times: dict[str, int] = field(default_factory=dict)  # time.perf_counter_ns()
+    memory_start: dict[str, int] = field(default_factory=dict)
+    samples: dict[str, _SectionSamples] = field(default_factory=dict)
+
+
 class PerformanceProfiler:
     """Performance profiler for analyzing critical code paths."""
 
-    def __init__(self, enable_memory_tracing: bool = True):
+    def __init__(
+        self,
+        enable_memory_tracing: bool | None = None,
+        memory_mode: Literal["rss", "tracemalloc", "off"] = "rss",
+    ):
         """Initialize the performance profiler.
 
         Args:
-            enable_memory_tracing: Whether to enable memory tracing
+            enable_memory_tracing: Shorthand overriding memory_mode: True selects
+                                   ``"tracemalloc"`` and False selects ``"off"``
+            memory_mode: How section memory is measured. ``"rss"`` samples the
+                         process resident set size, ``"tracemalloc"`` traces every
+                         Python allocation (much slower), ``"off"`` skips memory
         """
-        self.enable_memory_tracing = enable_memory_tracing
+        if enable_memory_tracing is not None:
+            memory_mode = "tracemalloc" if enable_memory_tracing else "off"
+
+        self.memory_mode = memory_mode
+        self.enable_memory_tracing = memory_mode == "tracemalloc"
         self.metrics: list[PerformanceMetrics] = []
-        self._profiler_stack: list[str] = []
-        self._start_times: dict[str, float] = {}
-        self._memory_start: dict[str, int] = {}
-        self._cpu_monitor: threading.Thread | None = None
-        self._cpu_usage: dict[str, list[float]] = {}
-        self._should_stop_monitoring = threading.Event()
-
-        if self.enable_memory_tracing and not tracemalloc.is_tracing():
-            tracemalloc.start()
-            logger.debug("Memory tracing started")
+        # Open sections are tracked per thread, so a shared profiler needs no lock to
+        # start or stop them; the lock guards the metrics and the process-wide tracing
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+        # tracemalloc slows every allocation, so it only runs while sections are active
+        self._traced_sections = 0
+        self._owns_tracing = False
+        # Highest traced memory seen by each section before an inner section reset it
+        self._traced_peaks: dict[str, int] = {}
+
+    @property
+    def _sections(self) -> _ThreadSections:
+        """Get the open sections of the calling thread."""
+        try:
+            return self._local.sections
+        except AttributeError:
+            sections = self._local.sections = _ThreadSections()
+            return sections
+
+    @property
+    def _profiler_stack(self) -> list[str]:
+        """Get the calling thread's stack of open section names."""
+        return self._sections.stack
+
+    @property
+    def _start_times(self) -> dict[str, int]:
+        """Get the start times of the calling thread's open sections."""
+        return self._sections.start_times
+
+    @property
+    def _memory_start(self) -> dict[str, int]:
+        """Get the starting memory of the calling thread's open sections."""
+        return self._sections.memory_start
+
+    @property
+    def _samples(self) -> dict[str, _SectionSamples]:
+        """Get the resource samples of the calling thread's open sections."""
+        return self._sections.samples
 
     def start_profiling(self, name: str) -> None:
         """Start profiling a code section.
@@ -159,17 +389,29 @@ class PerformanceProfiler:
         Args:
             name: Name of the code section being profiled
         """
-        self._profiler_stack.append(name)
-        self._start_times[name] = time.time()
+        sections = self._sections
+        sections.stack.append(name)
+        sections.start_times[name] = time.perf_counter_ns()
 
         if self.enable_memory_tracing:
-            current, peak = tracemalloc.get_traced_memory()
-            self._memory_start[name] = current
+            with self._lock:
+                self._start_memory_tracing()
+                current, peak = tracemalloc.get_traced_memory()
+                # Resetting the peak lets this section see its own high-water mark, so
+                # keep the peak reached so far for the sections it is nested in
+                for outer, outer_peak in self._traced_peaks.items():
+                    if peak > outer_peak:
+                        self._traced_peaks[outer] = peak
+                tracemalloc.reset_peak()
+                self._traced_peaks[name] = current
+            sections.memory_start[name] = current
+        elif self.memory_mode == "rss":
+            sections.memory_start[name] = _sampler.process.memory_info().rss
 
         # Start CPU monitoring
         self._start_cpu_monitoring(name)
 
-        logger.debug(f"Started profiling: {name}")
+        logger.debug("Started profiling: %s", name)
 
     def stop_profiling(self, name: str) -> PerformanceMetrics:
         """Stop profiling a code section and return metrics.
@@ -180,11 +422,16 @@ class PerformanceProfiler:
         Returns:
             Performance metrics for the profiled section
         """
-        if name not in self._start_times:
-            logger.warning(f"No profiling started for: {name}")
+        sections = self._sections
+        start_time = sections.start_times.pop(name, None)
+        if start_time is None:
+            logger.warning("No profiling started for: %s", name)
             return PerformanceMetrics(name=name, duration=0.0)
 
-        duration = time.time() - self._start_times[name]
+        duration_ns = time.perf_counter_ns() - start_time
+        duration = duration_ns / 1e9
+        samples = sections.samples.get(name)
+        memory_start = sections.memory_start.pop(name, None)
 
         # Stop CPU monitoring
         cpu_percent = self._stop_cpu_monitoring(name)
@@ -193,63 +440,77 @@ class PerformanceProfiler:
         memory_current = 0
         memory_peak = 0
         if self.enable_memory_tracing:
-            current, _ = tracemalloc.get_traced_memory()
+            with self._lock:
+                current, peak = tracemalloc.get_traced_memory()
+                section_peak = max(peak, self._traced_peaks.pop(name, 0))
+                self._stop_memory_tracing()
             memory_current = current
-            memory_peak = current - self._memory_start.get(name, 0)
+            memory_peak = section_peak - (memory_start or 0)
+        elif self.memory_mode == "rss":
+            memory_current = _sampler.process.memory_info().rss
+            start_rss = memory_current if memory_start is None else memory_start
+            sampled_peak = samples.peak_rss if samples else 0
+            memory_peak = max(sampled_peak, memory_current, start_rss) - start_rss
 
         # Create metrics
         metrics = PerformanceMetrics(
             name=name,
             duration=duration,
+            duration_ns=duration_ns,
             memory_peak=memory_peak,
             memory_current=memory_current,
             cpu_percent=cpu_percent,
         )
 
-        # Clean up
-        self._start_times.pop(name, None)
-        self._memory_start.pop(name, None)
-
-        if name in self._profiler_stack:
-            self._profiler_stack.remove(name)
+        # Sections normally stop in reverse order of starting, so this is a pop
+        stack = sections.stack
+        if stack and stack[-1] == name:
+            stack.pop()
+        elif name in stack:
+            stack.remove(name)
 
-        self.metrics.append(metrics)
-        logger.debug(f"Stopped profiling: {name} (duration: {duration:.3f}s)")
+        with self._lock:
+            self.metrics.append(metrics)
+        logger.debug("Stopped profiling: %s (duration: %.3fs)", name, duration)
 
         return metrics
 
-    def _start_cpu_monitoring(self, name: str) -> None:
-        """Start CPU monitoring for a profiling session."""
-        self._cpu_usage[name] = []
-        self._should_stop_monitoring.clear()
+    def _start_memory_tracing(self) -> None:
+        """Start tracemalloc for the outermost section unless something else runs it.
 
-        def monitor_cpu():
-            process = psutil.Process()
-            while not self._should_stop_monitoring.wait(0.1):  # Sample every 100ms
-                try:
-                    cpu_percent = process.cpu_percent()
-                    if name in self._cpu_usage:
-                        self._cpu_usage[name].append(cpu_percent)
-                except (psutil.NoSuchProcess, psutil.AccessDenied):
-                    break
-
-        self._cpu_monitor = threading.Thread(target=monitor_cpu, daemon=True)
-        self._cpu_monitor.start()
+        Must be called with the profiler lock held.
+        """
+        if self._traced_sections == 0 and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._owns_tracing = True
+            logger.debug("Memory tracing started")
+        self._traced_sections += 1
 
-    def _stop_cpu_monitoring(self, name: str) -> float:
-        """Stop CPU monitoring and return average CPU usage."""
-        self._should_stop_monitoring.set()
+    def _stop_memory_tracing(self) -> None:
+        """Stop tracemalloc once the outermost section that started it ends.
 
-        if self._cpu_monitor and self._cpu_monitor.is_alive():
-            self._cpu_monitor.join(timeout=1.0)
+        Must be called with the profiler lock held.
+        """
+        self._traced_sections = max(0, self._traced_sections - 1)
+        if self._traced_sections == 0 and self._owns_tracing:
+            tracemalloc.stop()
+            self._owns_tracing = False
+            logger.debug("Memory tracing stopped")
 
-        cpu_readings = self._cpu_usage.get(name, [])
-        avg_cpu = sum(cpu_readings) / len(cpu_readings) if cpu_readings else 0.0
+    def _start_cpu_monitoring(self, name: str) -> None:
+        """Start CPU (and RSS) sampling for a profiling session."""
+        samples = _SectionSamples(track_rss=self.memory_mode == "rss")
+        self._samples[name] = samples
+        _sampler.add(samples)
 
-        # Clean up
-        self._cpu_usage.pop(name, None)
+    def _stop_cpu_monitoring(self, name: str) -> float:
+        """Stop CPU monitoring and return average CPU usage."""
+        samples = self._samples.pop(name, None)
+        if samples is None:
+            return 0.0
+        _sampler.discard(samples)
 
-        return avg_cpu
+        return samples.cpu_average
 
     @contextmanager
     def profile_section(self, name: str) -> Generator[None, None, None]:
@@ -267,27 +528,38 @@ class PerformanceProfiler:
         finally:
             self.stop_profiling(name)
 
-    def profile_function_calls(self, name: str) -> None:
-        """Profile detailed function calls using cProfile.
+    def profile_function_calls(
+        self, name: str, func: Callable[..., Any], *args: Any, **kwargs: Any
+    ) -> pstats.Stats:
+        """Profile detailed function calls of a callable using cProfile.
+
+        The call runs inside a profiled section, and the section's metrics get
+        the cProfile statistics, total call count and cumulative time.
 
         Args:
             name: Name for the profiling session
+            func: Callable to profile
+            *args: Positional arguments for the callable
+            **kwargs: Keyword arguments for the callable
+
+        Returns:
+            Call statistics sorted by cumulative time
         """
-        if not self.metrics:
-            logger.warning("No metrics available for function call profiling")
-            return
+        profile = cProfile.Profile()
 
-        # Find the most recent metric
-        recent_metric = self.metrics[-1]
-        if recent_metric.name != name:
-            logger.warning(f"Metric name mismatch: expected {name}, got {recent_metric.name}")
-            return
+        self.start_profiling(name)
+        try:
+            profile.runcall(func, *args, **kwargs)
+        finally:
+            metric = self.stop_profiling(name)
 
-        # Create profiler and run
-        _ = cProfile.Profile()
+        stats = pstats.Stats(profile).sort_stats(pstats.SortKey.CUMULATIVE)
+        metric.profile_stats = stats
+        metric.calls_count = stats.total_calls
+        metric.cumulative_time = stats.total_tt
 
-        # This is a simplified approach - in real usage, you'd profile the actual function
-        logger.info(f"Function call profiling completed for: {name}")
+        logger.info("Function call profiling completed for: %s", name)
+        return stats
 
     def get_memory_trace(self, limit: int = 10) -> list[str] | None:
         """Get current memory trace information.
@@ -296,25 +568,33 @@ class PerformanceProfiler:
             limit: Maximum number of trace lines to return
 
         Returns:
-            List of formatted trace lines or None if tracing disabled
+            List of formatted trace lines, or None if tracing is disabled or no
+            traced section is active
         """
-        if not self.enable_memory_tracing or not tracemalloc.is_tracing():
+        # The profiler's own section count says whether tracing is running, which
+        # spares the tracemalloc lock behind is_tracing(). Stopping tracemalloc
+        # externally while a traced section is open is not detected.
+        if not self._traced_sections:
             return None
 
-        snapshot = tracemalloc.take_snapshot()
+        snapshot = tracemalloc.take_snapshot().filter_traces(_MEMORY_TRACE_FILTERS)
         top_stats = snapshot.statistics("lineno")
 
-        trace_lines = []
-        for stat in top_stats[:limit]:
-            trace_lines.append(
-                f"{stat.traceback.format()[-1].strip()}: {stat.size / 1024 / 1024:.1f} MB"
-            )
-
-        return trace_lines
+        return [
+            f"{stat.traceback.format()[-1].strip()}: {stat.size / _MB:.1f} MB"
+            for stat in top_stats[:limit]
+        ]
 
-    def generate_report(self) -> PerformanceReport:
+    def generate_report(self, keep: bool = False) -> PerformanceReport:
         """Generate a comprehensive performance report.
 
+        The collected metrics are moved into the report and the profiler starts
+        a fresh list, so generating a report also clears the recorded metrics.
+
+        Args:
+            keep: Copy the metrics into the report instead of moving them,
+                leaving them recorded on the profiler
+
         Returns:
             Performance report with metrics and recommendations
         """
@@ -322,27 +602,35 @@ class PerformanceProfiler:
             logger.warning("No metrics available for report generation")
             return PerformanceReport(total_duration=0.0, peak_memory=0)
 
-        total_duration = sum(m.duration for m in self.metrics)
-        peak_memory = max(m.memory_peak for m in self.metrics)
+        with self._lock:
+            if keep:
+                metrics = self.metrics.copy()
+            else:
+                metrics = self.metrics
+                self.metrics = []
 
-        report = PerformanceReport(
-            total_duration=total_duration,
-            peak_memory=peak_memory,
-            metrics=self.metrics.copy(),
-        )
-
-        report.identify_bottlenecks()
-        report.generate_recommendations()
+        report = PerformanceReport(total_duration=0.0, peak_memory=0, metrics=metrics)
+        report.finalize()
 
         return report
 
     def clear_metrics(self) -> None:
-        """Clear all collected metrics."""
-        self.metrics.clear()
-        self._profiler_stack.clear()
-        self._start_times.clear()
-        self._memory_start.clear()
-        self._cpu_usage.clear()
+        """Clear all collected metrics and the calling thread's open sections.
+
+        Sections other threads have open keep running, along with their tracing.
+        """
+        sections = self._sections
+        for samples in sections.samples.values():
+            _sampler.discard(samples)
+        self._local.sections = _ThreadSections()
+
+        with self._lock:
+            self.metrics.clear()
+            if self.enable_memory_tracing:
+                # Each open traced section holds one tracing reference
+                for name in sections.memory_start:
+                    self._traced_peaks.pop(name, None)
+                    self._stop_memory_tracing()
         logger.debug("Performance metrics cleared")
 
     def save_report(self, report: PerformanceReport, file_path: Path) -> None:
@@ -352,19 +640,21 @@ class PerformanceProfiler:
             report: Performance report to save
             file_path: Path to save the report
         """
-        import json
-
         report_data = report.to_dict()
         report_data["timestamp"] = time.time()
         report_data["profiler_config"] = {
             "memory_tracing_enabled": self.enable_memory_tracing,
-            "metrics_count": len(self.metrics),
+            "memory_mode": self.memory_mode,
+            "metrics_count": len(report.metrics),
         }
 
-        with open(file_path, "w") as f:
-            json.dump(report_data, f, indent=2)
+        # orjson serializes in C straight to bytes; fall back to the stdlib encoder
+        if HAS_ORJSON:
+            file_path.write_bytes(orjson.dumps(report_data, option=orjson.OPT_INDENT_2))
+        else:
+            file_path.write_text(json.dumps(report_data, indent=2), encoding="utf-8")
 
-        logger.info(f"Performance report saved to: {file_path}")
+        logger.info("Performance report saved to: %s", file_path)
 
 
 def profile_performance(name: str, profiler: PerformanceProfiler | None = None):
@@ -372,23 +662,42 @@ def profile_performance(name: str, profiler: PerformanceProfiler | None = None):
 
     Args:
         name: Name for the profiling session
-        profiler: Optional profiler instance to use
+        profiler: Optional profiler instance to use, defaults to the global profiler
 
     Returns:
         Decorated function
     """
 
     def decorator(func: Callable) -> Callable:
-        @wraps(func)
-        def wrapper(*args, **kwargs):
-            p = profiler or PerformanceProfiler()
+        section = f"{name}:{func.__name__}"
 
-            with p.profile_section(f"{name}:{func.__name__}"):
-                result = func(*args, **kwargs)
+        if profiler is None:
 
-            return result
+            @wraps(func)
+            def wrapper(*args, **kwargs):
+                # Resolved per call, so the global profiler can be replaced after decoration
+                p = get_global_profiler()
+                p.start_profiling(section)
+                try:
+                    return func(*args, **kwargs)
+                finally:
+                    p.stop_profiling(section)
+
+            return wrapper
+
+        # The profiler is fixed, so bind its methods once instead of on every call
+        start = profiler.start_profiling
+        stop = profiler.stop_profiling
+
+        @wraps(func)
+        def bound_wrapper(*args, **kwargs):
+            start(section)
+            try:
+                return func(*args, **kwargs)
+            finally:
+                stop(section)
 
-        return wrapper
+        return bound_wrapper
 
     return decorator
 
@@ -426,6 +735,35 @@ def profile_context(name: str) -> Generator[PerformanceProfiler, None, None]:
         yield profiler
 
 
+def _iter_python_file_sizes(root: str) -> Generator[int, None, None]:
+    """Yield the size of every Python file below a directory.
+
+    Uses an explicit ``os.scandir`` stack so each directory is listed once and
+    each file is stat-ed once, without building a ``Path`` per entry.
+
+    Args:
+        root: Directory to walk
+
+    Yields:
+        Size in bytes of each ``.py`` file found
+    """
+    stack = [root]
+    while stack:
+        try:
+            entries = os.scandir(stack.pop())
+        except OSError:
+            continue
+        with entries:
+            for entry in entries:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    elif entry.name.endswith(".py"):
+                        yield entry.stat().st_size
+                except OSError:
+                    continue
+
+
 def analyze_project_performance(project_path: Path) -> PerformanceReport:
     """Analyze overall project performance characteristics.
 
@@ -438,14 +776,10 @@ def analyze_project_performance(project_path: Path) -> PerformanceReport:
     profiler = PerformanceProfiler()
 
     with profiler.profile_section("project_analysis"):
-        # Simulate project analysis
-        time.sleep(0.01)  # Placeholder for actual analysis
-
         # Analyze project size
-        python_files = list(project_path.rglob("*.py"))
-        total_size = sum(f.stat().st_size for f in python_files if f.exists())
+        sizes = list(_iter_python_file_sizes(str(project_path)))
 
-        logger.info(f"Analyzed project: {len(python_files)} Python files, {total_size} bytes")
+        logger.info("Analyzed project: %d Python files, %d bytes", len(sizes), sum(sizes))
 
     report = profiler.generate_report()
     return report
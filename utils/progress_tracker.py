@@ -4,14 +4,19 @@ This module provides progress tracking capabilities with support for nested oper
 time estimation, and real-time updates for documentation generation tasks.
 """
 
+import inspect
 import logging
+import queue
+import sys
 import threading
 import time
-from collections.abc import Callable
+from collections.abc import Callable, Generator, Mapping
 from contextlib import contextmanager
 from dataclasses import dataclass, field
 from enum import Enum
+from functools import lru_cache, wraps
 from typing import Any
+from weakref import WeakMethod
 
 logger = logging.getLogger(__name__)
 
@@ -26,7 +31,14 @@ class ProgressStatus(Enum):
     CANCELLED = "cancelled"
 
 
-@dataclass
+# Statuses an operation can finish with
+_COMPLETE_STATUSES = frozenset(
+    {ProgressStatus.COMPLETED, ProgressStatus.FAILED, ProgressStatus.CANCELLED}
+)
+_STATUS_VALUES = {status: status.value for status in ProgressStatus}
+
+
+@dataclass(slots=True)
 class ProgressInfo:
     """Information about progress of an operation."""
 
@@ -42,6 +54,15 @@ class ProgressInfo:
     parent: str | None = None
     children: list[str] = field(default_factory=list)
     metadata: dict[str, Any] = field(default_factory=dict)
+    # Guards current and the timing fields, so increments need not hold the tracker lock
+    _lock: threading.Lock = field(
+        default_factory=threading.Lock, init=False, repr=False, compare=False
+    )
+    # time.monotonic() reading at start; durations use it so wall-clock jumps cannot
+    # make elapsed time go backwards, while start_time/end_time stay wall-clock stamps
+    _started_at: float | None = field(default=None, init=False, repr=False, compare=False)
+    # Ident of the only thread allowed to update a single-writer operation
+    _owner: int | None = field(default=None, init=False, repr=False, compare=False)
 
     @property
     def progress_percentage(self) -> float:
@@ -53,22 +74,18 @@ class ProgressInfo:
     @property
     def is_complete(self) -> bool:
         """Check if operation is complete."""
-        return self.status in {
-            ProgressStatus.COMPLETED,
-            ProgressStatus.FAILED,
-            ProgressStatus.CANCELLED,
-        }
+        return self.status in _COMPLETE_STATUSES
 
     @property
     def is_running(self) -> bool:
         """Check if operation is currently running."""
-        return self.status == ProgressStatus.RUNNING
+        return self.status is ProgressStatus.RUNNING
 
     def to_dict(self) -> dict[str, Any]:
         """Convert to dictionary representation."""
         return {
             "name": self.name,
-            "status": self.status.value,
+            "status": _STATUS_VALUES[self.status],
             "current": self.current,
             "total": self.total,
             "progress_percentage": self.progress_percentage,
@@ -85,14 +102,122 @@ class ProgressInfo:
         }
 
 
+class _ReadWriteLock:
+    """Reader-writer lock letting concurrent readers proceed without blocking each other.
+
+    Waiting writers take priority over new readers so a stream of pollers cannot
+    starve updates. Both sides are reentrant, and the thread holding the write lock
+    may also read, so callbacks notified under the write lock can query the tracker.
+    """
+
+    def __init__(self):
+        self._cond = threading.Condition(threading.Lock())
+        self._readers = 0
+        self._writers_waiting = 0
+        self._writer: int | None = None
+        self._write_depth = 0
+        self._local = threading.local()
+
+    @contextmanager
+    def read(self) -> Generator[None, None, None]:
+        """Hold the lock for reading."""
+        local = self._local
+        depth = getattr(local, "read_depth", 0)
+        if depth or self._writer == threading.get_ident():
+            local.read_depth = depth + 1
+            try:
+                yield
+            finally:
+                local.read_depth = depth
+            return
+
+        with self._cond:
+            while self._writer is not None or self._writers_waiting:
+                self._cond.wait()
+            self._readers += 1
+
+        local.read_depth = 1
+        try:
+            yield
+        finally:
+            local.read_depth = 0
+            with self._cond:
+                self._readers -= 1
+                if not self._readers:
+                    self._cond.notify_all()
+
+    @contextmanager
+    def write(self) -> Generator[None, None, None]:
+        """Hold the lock for writing.
+
+        Raises:
+            RuntimeError: If the calling thread holds the lock only for reading
+        """
+        me = threading.get_ident()
+        if self._writer == me:
+            self._write_depth += 1
+            try:
+                yield
+            finally:
+                self._write_depth -= 1
+            return
+
+        if getattr(self._local, "read_depth", 0):
+            raise RuntimeError("Cannot upgrade a read lock to a write lock")
+
+        with self._cond:
+            self._writers_waiting += 1
+            try:
+                while self._writer is not None or self._readers:
+                    self._cond.wait()
+            finally:
+                self._writers_waiting -= 1
+            self._writer = me
+            self._write_depth = 1
+
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._write_depth = 0
+                self._writer = None
+                self._cond.notify_all()
+
+
 class ProgressTracker:
     """Tracks progress of multiple concurrent operations."""
 
-    def __init__(self):
-        """Initialize the progress tracker."""
+    def __init__(self, background_callbacks: bool = False):
+        """Initialize the progress tracker.
+
+        Args:
+            background_callbacks: Run update callbacks on a dedicated thread instead of
+                                  the updating thread, so slow observers never delay
+                                  progress updates. Notifications for an operation that
+                                  is already waiting are merged, so callbacks see each
+                                  operation's latest state rather than every step.
+        """
         self._operations: dict[str, ProgressInfo] = {}
-        self._update_callbacks: list[Callable[[str, ProgressInfo], None]] = []
-        self._lock = threading.RLock()
+        # Replaced rather than mutated, so notifying can iterate it without the lock.
+        # Entries are callables or WeakMethods for weakly held bound methods.
+        self._update_callbacks: tuple[Callable[[str, ProgressInfo], None] | WeakMethod, ...] = ()
+        self._lock = _ReadWriteLock()
+
+        # Background mode: names of operations waiting for the callback thread, mapped
+        # to the ProgressInfo to deliver. The queue holds each pending name once.
+        self._pending: dict[str, ProgressInfo] = {}
+        self._pending_lock = threading.Lock()
+        self._callback_queue: queue.SimpleQueue[str | None] | None = None
+        self._callback_thread: threading.Thread | None = None
+        if background_callbacks:
+            self._callback_queue = queue.SimpleQueue()
+            self._callback_thread = threading.Thread(
+                target=self._dispatch_callbacks,
+                args=(self._callback_queue,),
+                name="progress-callbacks",
+                daemon=True,
+            )
+            self._callback_thread.start()
 
     def start_operation(
         self,
@@ -101,6 +226,7 @@ class ProgressTracker:
         message: str = "",
         parent: str | None = None,
         metadata: dict[str, Any] | None = None,
+        single_writer: bool = False,
     ) -> ProgressInfo:
         """Start tracking a new operation.
 
@@ -110,6 +236,8 @@ class ProgressTracker:
             message: Initial status message
             parent: Name of parent operation for nested tracking
             metadata: Additional metadata for the operation
+            single_writer: Promise that only the calling thread updates the operation,
+                letting its increment and message updates skip locking entirely
 
         Returns:
             ProgressInfo object for the started operation
@@ -117,7 +245,13 @@ class ProgressTracker:
         Raises:
             ValueError: If operation name already exists
         """
-        with self._lock:
+        # Interned keys let later lookups with the same literal names hit the
+        # identity fast path of dict key comparison
+        name = sys.intern(name)
+        if parent is not None:
+            parent = sys.intern(parent)
+
+        with self._lock.write():
             if name in self._operations:
                 raise ValueError(f"Operation '{name}' already exists")
 
@@ -131,16 +265,20 @@ class ProgressTracker:
                 metadata=metadata or {},
             )
 
+            progress._started_at = time.monotonic()
+            if single_writer:
+                progress._owner = threading.get_ident()
             self._operations[name] = progress
 
             # Add to parent's children if specified
-            if parent and parent in self._operations:
-                self._operations[parent].children.append(name)
+            parent_progress = self._operations.get(parent) if parent else None
+            if parent_progress is not None:
+                parent_progress.children.append(name)
 
-            logger.debug(f"Started operation: {name} (total: {total})")
-            self._notify_callbacks(name, progress)
+            logger.debug("Started operation: %s (total: %d)", name, total)
 
-            return progress
+        self._notify_callbacks(name, progress)
+        return progress
 
     def update_progress(
         self,
@@ -165,16 +303,54 @@ class ProgressTracker:
         Raises:
             KeyError: If operation doesn't exist
         """
-        with self._lock:
-            if name not in self._operations:
+        if current is None and not metadata:
+            # Plain increments only touch the operation's own counter, so they skip the
+            # tracker lock and do not contend with updates to other operations
+            progress = self._operations.get(name)
+            if progress is None:
                 raise KeyError(f"Operation '{name}' not found")
 
-            progress = self._operations[name]
+            if progress._owner == threading.get_ident():
+                # The owning thread of a single-writer operation is its only writer
+                if increment is not None:
+                    progress.current += increment
+                self._update_timing(progress)
+                if message is not None:
+                    progress.message = message
+            elif message is None:
+                with progress._lock:
+                    if increment is not None:
+                        progress.current += increment
+                    self._update_timing(progress)
+            else:
+                return self._update_locked(name, current, increment, message, metadata)
+
+            logger.debug("Updated operation: %s (%d/%d)", name, progress.current, progress.total)
+            self._notify_callbacks(name, progress)
+            return progress
+
+        return self._update_locked(name, current, increment, message, metadata)
+
+    def _update_locked(
+        self,
+        name: str,
+        current: int | None,
+        increment: int | None,
+        message: str | None,
+        metadata: dict[str, Any] | None,
+    ) -> ProgressInfo:
+        """Apply an update_progress call under the tracker's write lock."""
+        with self._lock.write():
+            progress = self._operations.get(name)
+            if progress is None:
+                raise KeyError(f"Operation '{name}' not found")
 
-            if current is not None:
-                progress.current = current
-            elif increment is not None:
-                progress.current += increment
+            with progress._lock:
+                if current is not None:
+                    progress.current = current
+                elif increment is not None:
+                    progress.current += increment
+                self._update_timing(progress)
 
             if message is not None:
                 progress.message = message
@@ -182,20 +358,67 @@ class ProgressTracker:
             if metadata:
                 progress.metadata.update(metadata)
 
-            # Update elapsed time
-            if progress.start_time:
-                progress.elapsed_time = time.time() - progress.start_time
+            logger.debug("Updated operation: %s (%d/%d)", name, progress.current, progress.total)
+
+        self._notify_callbacks(name, progress)
+        return progress
+
+    def update_batch(
+        self, increments: Mapping[str, int], message: str | None = None
+    ) -> dict[str, ProgressInfo]:
+        """Increment several operations under a single lock acquisition.
 
-            # Estimate remaining time based on current progress
-            if progress.total > 0 and progress.current > 0 and progress.elapsed_time > 0:
-                rate = progress.current / progress.elapsed_time
-                remaining_items = progress.total - progress.current
-                progress.estimated_remaining = remaining_items / rate if rate > 0 else None
+        Each operation's callbacks fire once for the whole batch.
 
-            logger.debug(f"Updated operation: {name} ({progress.current}/{progress.total})")
+        Args:
+            increments: Operation name to the amount to add to its progress
+            message: Status message to set on every updated operation
+
+        Returns:
+            Dictionary of operation name to updated ProgressInfo
+
+        Raises:
+            KeyError: If any operation doesn't exist; no operation is updated then
+        """
+        with self._lock.write():
+            batch = []
+            for name, increment in increments.items():
+                progress = self._operations.get(name)
+                if progress is None:
+                    raise KeyError(f"Operation '{name}' not found")
+                batch.append((progress, increment))
+
+            updated = {}
+            for progress, increment in batch:
+                with progress._lock:
+                    progress.current += increment
+                    self._update_timing(progress)
+                if message is not None:
+                    progress.message = message
+                updated[progress.name] = progress
+
+            logger.debug("Updated %d operations in a batch", len(updated))
+
+        for name, progress in updated.items():
             self._notify_callbacks(name, progress)
+        return updated
 
-            return progress
+    @staticmethod
+    def _update_timing(progress: ProgressInfo) -> None:
+        """Refresh elapsed time and the remaining time estimate of an operation.
+
+        Must be called with the operation's lock held, or from the owning thread of a
+        single-writer operation.
+        """
+        # Update elapsed time
+        if progress._started_at is not None:
+            progress.elapsed_time = time.monotonic() - progress._started_at
+
+        # Estimate remaining time based on current progress
+        if progress.total > 0 and progress.current > 0 and progress.elapsed_time > 0:
+            rate = progress.current / progress.elapsed_time
+            remaining_items = progress.total - progress.current
+            progress.estimated_remaining = remaining_items / rate if rate > 0 else None
 
     def complete_operation(
         self,
@@ -217,36 +440,44 @@ class ProgressTracker:
             KeyError: If operation doesn't exist
             ValueError: If status is not a completion status
         """
-        if status not in {
-            ProgressStatus.COMPLETED,
-            ProgressStatus.FAILED,
-            ProgressStatus.CANCELLED,
-        }:
+        if status not in _COMPLETE_STATUSES:
             raise ValueError(f"Invalid completion status: {status}")
 
-        with self._lock:
-            if name not in self._operations:
+        with self._lock.write():
+            progress = self._operations.get(name)
+            if progress is None:
                 raise KeyError(f"Operation '{name}' not found")
 
-            progress = self._operations[name]
-            progress.status = status
-            progress.end_time = time.time()
+            self._complete(progress, status, message)
 
-            if progress.start_time:
-                progress.elapsed_time = progress.end_time - progress.start_time
+        self._notify_callbacks(name, progress)
+        return progress
 
-            if message is not None:
-                progress.message = message
+    def _complete(
+        self, progress: ProgressInfo, status: ProgressStatus, message: str | None
+    ) -> ProgressInfo:
+        """Move an operation to a completion status.
+
+        Must be called with the tracker write lock held.
+        """
+        progress.status = status
+
+        with progress._lock:
+            progress.end_time = time.time()
+            if progress._started_at is not None:
+                progress.elapsed_time = time.monotonic() - progress._started_at
 
-            # If completing successfully and total was 0, set current to 1 for visual completion
+            # If completing successfully and total was 0, set current to 1 for visual
+            # completion
             if status == ProgressStatus.COMPLETED and progress.total == 0:
                 progress.current = 1
                 progress.total = 1
 
-            logger.debug(f"Completed operation: {name} ({status.value})")
-            self._notify_callbacks(name, progress)
+        if message is not None:
+            progress.message = message
 
-            return progress
+        logger.debug("Completed operation: %s (%s)", progress.name, status.value)
+        return progress
 
     def get_operation(self, name: str) -> ProgressInfo | None:
         """Get progress information for an operation.
@@ -257,7 +488,7 @@ class ProgressTracker:
         Returns:
             ProgressInfo object or None if not found
         """
-        with self._lock:
+        with self._lock.read():
             return self._operations.get(name)
 
     def get_all_operations(self) -> dict[str, ProgressInfo]:
@@ -266,16 +497,32 @@ class ProgressTracker:
         Returns:
             Dictionary of operation name to ProgressInfo
         """
-        with self._lock:
+        with self._lock.read():
             return self._operations.copy()
 
+    def get_all_percentages(self) -> dict[str, float]:
+        """Get the progress percentage of every tracked operation in one pass.
+
+        Returns:
+            Dictionary of operation name to progress percentage
+        """
+        with self._lock.read():
+            return {
+                name: (
+                    min(100.0, (progress.current / progress.total) * 100.0)
+                    if progress.total > 0
+                    else 0.0
+                )
+                for name, progress in self._operations.items()
+            }
+
     def get_active_operations(self) -> dict[str, ProgressInfo]:
         """Get only running operations.
 
         Returns:
             Dictionary of active operation name to ProgressInfo
         """
-        with self._lock:
+        with self._lock.read():
             return {
                 name: progress for name, progress in self._operations.items() if progress.is_running
             }
@@ -289,43 +536,70 @@ class ProgressTracker:
         Returns:
             Tree structure with operations and their children
         """
-        with self._lock:
+        with self._lock.read():
             if root:
                 if root not in self._operations:
                     return {}
-                return self._build_tree_node(root)
+                return self._build_tree_nodes([root])[root]
             else:
                 # Get all top-level operations (no parent)
                 top_level = [
                     name for name, progress in self._operations.items() if not progress.parent
                 ]
-                return {"children": {name: self._build_tree_node(name) for name in top_level}}
+                nodes = self._build_tree_nodes(top_level)
+                return {"children": {name: nodes[name] for name in top_level}}
+
+    def _build_tree_nodes(self, roots: list[str]) -> dict[str, dict[str, Any]]:
+        """Build tree nodes for operations and all their descendants.
 
-    def _build_tree_node(self, name: str) -> dict[str, Any]:
-        """Build a tree node for an operation and its children."""
-        progress = self._operations[name]
-        node = progress.to_dict()
+        Walks the tree iteratively, so deep nesting cannot hit the recursion limit.
 
-        # Add children recursively
-        if progress.children:
+        Args:
+            roots: Names of the operations to start from
+
+        Returns:
+            Dictionary of operation name to tree node, for every reachable operation
+        """
+        operations = self._operations
+
+        # Depth-first pre-order; reversed, every child comes before its parent
+        order = []
+        seen = set(roots)
+        stack = list(roots)
+        while stack:
+            name = stack.pop()
+            order.append(name)
+            for child_name in operations[name].children:
+                if child_name in operations and child_name not in seen:
+                    seen.add(child_name)
+                    stack.append(child_name)
+
+        nodes: dict[str, dict[str, Any]] = {}
+        for name in reversed(order):
+            progress = operations[name]
+            node = progress.to_dict()
             node["children"] = {
-                child_name: self._build_tree_node(child_name)
+                child_name: nodes[child_name]
                 for child_name in progress.children
-                if child_name in self._operations
+                if child_name in nodes
             }
-        else:
-            node["children"] = {}
+            nodes[name] = node
 
-        return node
+        return nodes
 
-    def add_update_callback(self, callback: Callable[[str, ProgressInfo], None]) -> None:
+    def add_update_callback(
+        self, callback: Callable[[str, ProgressInfo], None], weak: bool = False
+    ) -> None:
         """Add a callback to be notified of progress updates.
 
         Args:
             callback: Function that takes (operation_name, progress_info)
+            weak: Hold a bound method callback by weak reference, so registering it
+                  does not keep its object alive; it is dropped once the object is gone
         """
-        with self._lock:
-            self._update_callbacks.append(callback)
+        entry = WeakMethod(callback) if weak and inspect.ismethod(callback) else callback
+        with self._lock.write():
+            self._update_callbacks = self._live_callbacks() + (entry,)
 
     def remove_update_callback(self, callback: Callable[[str, ProgressInfo], None]) -> None:
         """Remove an update callback.
@@ -333,17 +607,79 @@ class ProgressTracker:
         Args:
             callback: Function to remove
         """
-        with self._lock:
-            if callback in self._update_callbacks:
-                self._update_callbacks.remove(callback)
+        with self._lock.write():
+            callbacks = list(self._live_callbacks())
+            for index, entry in enumerate(callbacks):
+                if entry == callback or (isinstance(entry, WeakMethod) and entry() == callback):
+                    del callbacks[index]
+                    self._update_callbacks = tuple(callbacks)
+                    return
+
+    def _live_callbacks(self) -> tuple[Callable[[str, ProgressInfo], None] | WeakMethod, ...]:
+        """Get the callbacks without weak references whose object is gone."""
+        return tuple(
+            entry
+            for entry in self._update_callbacks
+            if not isinstance(entry, WeakMethod) or entry() is not None
+        )
 
     def _notify_callbacks(self, name: str, progress: ProgressInfo) -> None:
-        """Notify all registered callbacks of a progress update."""
+        """Notify all registered callbacks of a progress update.
+
+        Called after the tracker lock is released, so a slow callback does not hold
+        up other tracker calls. In background mode the operation is marked pending for
+        the callback thread instead; this never blocks.
+        """
+        with self._pending_lock:
+            callback_queue = self._callback_queue
+            if callback_queue is not None:
+                # An operation already pending is delivered once, with its latest state
+                if name not in self._pending:
+                    callback_queue.put(name)
+                self._pending[name] = progress
+                return
+
+        self._run_callbacks(name, progress)
+
+    def _run_callbacks(self, name: str, progress: ProgressInfo) -> None:
+        """Call every registered callback with a progress update."""
         for callback in self._update_callbacks:
+            if isinstance(callback, WeakMethod):
+                callback = callback()
+                if callback is None:
+                    continue
             try:
                 callback(name, progress)
             except Exception as e:
-                logger.error(f"Error in progress callback: {e}")
+                logger.error("Error in progress callback: %s", e)
+
+    def _dispatch_callbacks(self, callback_queue: queue.SimpleQueue[str | None]) -> None:
+        """Run pending notifications on the callback thread until closed."""
+        while True:
+            name = callback_queue.get()
+            if name is None:
+                break
+            with self._pending_lock:
+                progress = self._pending.pop(name)
+            self._run_callbacks(name, progress)
+
+    def close(self) -> None:
+        """Deliver pending notifications and stop the background callback thread.
+
+        Updates notified after close run their callbacks on the updating thread.
+        """
+        with self._pending_lock:
+            callback_thread = self._callback_thread
+            if callback_thread is None:
+                return
+            # Under the pending lock, so a concurrent notification either lands ahead
+            # of the stop marker or sees background mode switched off
+            self._callback_queue.put(None)
+            self._callback_queue = None
+            self._callback_thread = None
+
+        if callback_thread is not threading.current_thread():
+            callback_thread.join()
 
     def clear_completed(self) -> int:
         """Remove completed operations from tracking.
@@ -351,22 +687,26 @@ class ProgressTracker:
         Returns:
             Number of operations removed
         """
-        with self._lock:
-            to_remove = [
-                name for name, progress in self._operations.items() if progress.is_complete
+        with self._lock.write():
+            removed = [
+                (name, progress)
+                for name, progress in self._operations.items()
+                if progress.is_complete
             ]
+            to_remove = {name for name, _ in removed}
 
-            for name in to_remove:
-                # Remove from parent's children list
-                progress = self._operations[name]
-                if progress.parent and progress.parent in self._operations:
-                    parent = self._operations[progress.parent]
-                    if name in parent.children:
-                        parent.children.remove(name)
+            # Filter each remaining parent's children once, rather than removing
+            # completed siblings one by one
+            parents = {progress.parent for _, progress in removed}
+            for parent_name in parents - to_remove:
+                parent = self._operations.get(parent_name) if parent_name else None
+                if parent is not None:
+                    parent.children = [child for child in parent.children if child not in to_remove]
 
+            for name in to_remove:
                 del self._operations[name]
 
-            logger.debug(f"Cleared {len(to_remove)} completed operations")
+            logger.debug("Cleared %d completed operations", len(to_remove))
             return len(to_remove)
 
     def cancel_operation(self, name: str, message: str = "Operation cancelled") -> bool:
@@ -379,16 +719,15 @@ class ProgressTracker:
         Returns:
             True if operation was cancelled, False if not found or already complete
         """
-        with self._lock:
-            if name not in self._operations:
+        with self._lock.write():
+            progress = self._operations.get(name)
+            if progress is None or progress.is_complete:
                 return False
 
-            progress = self._operations[name]
-            if progress.is_complete:
-                return False
+            self._complete(progress, ProgressStatus.CANCELLED, message)
 
-            self.complete_operation(name, ProgressStatus.CANCELLED, message)
-            return True
+        self._notify_callbacks(name, progress)
+        return True
 
     def get_summary(self) -> dict[str, Any]:
         """Get summary statistics of all operations.
@@ -396,30 +735,25 @@ class ProgressTracker:
         Returns:
             Dictionary with summary statistics
         """
-        with self._lock:
-            total_ops = len(self._operations)
-            running_ops = len(self.get_active_operations())
-            completed_ops = len(
-                [p for p in self._operations.values() if p.status == ProgressStatus.COMPLETED]
-            )
-            failed_ops = len(
-                [p for p in self._operations.values() if p.status == ProgressStatus.FAILED]
-            )
-            cancelled_ops = len(
-                [p for p in self._operations.values() if p.status == ProgressStatus.CANCELLED]
-            )
+        with self._lock.read():
+            # Count statuses and sum determinate progress in a single pass
+            status_counts = dict.fromkeys(ProgressStatus, 0)
+            total_items = 0
+            completed_items = 0
+            for progress in self._operations.values():
+                status_counts[progress.status] += 1
+                if progress.total > 0:
+                    total_items += progress.total
+                    completed_items += progress.current
 
-            # Calculate overall progress for determinate operations
-            total_items = sum(p.total for p in self._operations.values() if p.total > 0)
-            completed_items = sum(p.current for p in self._operations.values() if p.total > 0)
             overall_progress = (completed_items / total_items * 100) if total_items > 0 else 0.0
 
             return {
-                "total_operations": total_ops,
-                "running_operations": running_ops,
-                "completed_operations": completed_ops,
-                "failed_operations": failed_ops,
-                "cancelled_operations": cancelled_ops,
+                "total_operations": len(self._operations),
+                "running_operations": status_counts[ProgressStatus.RUNNING],
+                "completed_operations": status_counts[ProgressStatus.COMPLETED],
+                "failed_operations": status_counts[ProgressStatus.FAILED],
+                "cancelled_operations": status_counts[ProgressStatus.CANCELLED],
                 "overall_progress_percentage": overall_progress,
                 "total_items": total_items,
                 "completed_items": completed_items,
@@ -458,6 +792,40 @@ def track_progress(
         raise
 
 
+@contextmanager
+def batched_increments(
+    tracker: ProgressTracker, name: str, flush_every: int = 100
+) -> Generator[Callable[[int], None], None, None]:
+    """Context manager coalescing many small increments of one operation.
+
+    Increments are summed locally and applied to the tracker every ``flush_every``
+    units and on exit, so per-item loops do not update the tracker and notify
+    callbacks once per item.
+
+    Args:
+        tracker: ProgressTracker instance
+        name: Name of the operation to advance
+        flush_every: Number of buffered units that triggers an update
+
+    Yields:
+        Function advancing the operation by the given amount (default 1)
+    """
+    pending = 0
+
+    def advance(amount: int = 1) -> None:
+        nonlocal pending
+        pending += amount
+        if pending >= flush_every:
+            tracker.update_progress(name, increment=pending)
+            pending = 0
+
+    try:
+        yield advance
+    finally:
+        if pending:
+            tracker.update_progress(name, increment=pending)
+
+
 # Global progress tracker instance
 _global_tracker: ProgressTracker | None = None
 
@@ -493,8 +861,20 @@ def track_operation(
     """
 
     def decorator(func):
+        if inspect.iscoroutinefunction(func):
+
+            @wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                t = tracker if tracker is not None else get_global_tracker()
+
+                with track_progress(t, name, total, message, parent, metadata):
+                    return await func(*args, **kwargs)
+
+            return async_wrapper
+
+        @wraps(func)
         def wrapper(*args, **kwargs):
-            t = tracker or get_global_tracker()
+            t = tracker if tracker is not None else get_global_tracker()
 
             with track_progress(t, name, total, message, parent, metadata):
                 result = func(*args, **kwargs)
@@ -506,6 +886,12 @@ def track_operation(
     return decorator
 
 
+@lru_cache(maxsize=256)
+def _render_bar(filled_width: int, width: int, fill_char: str, empty_char: str) -> str:
+    """Render the body of a progress bar, memoized per fill level and style."""
+    return fill_char * filled_width + empty_char * (width - filled_width)
+
+
 class ProgressFormatter:
     """Formats progress information for display."""
 
@@ -533,7 +919,7 @@ class ProgressFormatter:
 
         percentage = progress.progress_percentage
         filled_width = int(width * percentage / 100)
-        bar = fill_char * filled_width + empty_char * (width - filled_width)
+        bar = _render_bar(filled_width, width, fill_char, empty_char)
 
         return f"[{bar}] {percentage:5.1f}%"
 